@@ -3,6 +3,8 @@
 Ethio Bingo - Main Entry Point
 Runs both the Telegram Bot and FastAPI server
 """
+import os
+import signal
 import sys
 import asyncio
 import uvicorn
@@ -26,16 +28,44 @@ def run_bot():
     bot.run()
 
 
-def run_api():
-    """Run FastAPI Server"""
+def run_notifier():
+    """Run outbound notification worker"""
+    from src.services.notifications import notification_worker
+    asyncio.run(notification_worker.run())
+
+
+def run_api(shard_id: int = 0):
+    """Run FastAPI Server; shard N listens on PORT + N"""
+    # A room's state lives in one process, so each shard is a single worker
+    os.environ["SHARD_ID"] = str(shard_id)
+    settings.shard_id = shard_id
     uvicorn.run(
         "src.api.main:app",
         host=settings.host,
-        port=settings.port,
-        reload=settings.debug
+        port=settings.port + shard_id,
+        reload=settings.debug and settings.shard_count == 1
     )
 
 
+def serve_api():
+    """Run the API, one process per shard when sharded"""
+    if settings.shard_count == 1:
+        run_api()
+        return
+    
+    # Turn SIGTERM into SystemExit so the shards are stopped with us
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    shards = [Process(target=run_api, args=(shard_id,)) for shard_id in range(settings.shard_count)]
+    for shard in shards:
+        shard.start()
+    try:
+        for shard in shards:
+            shard.join()
+    finally:
+        for shard in shards:
+            shard.terminate()
+
+
 def main():
     """Main entry point"""
     try:
@@ -49,29 +79,51 @@ def main():
         if len(sys.argv) > 1:
             mode = sys.argv[1]
             if mode == "bot":
+                if settings.bot_mode == "webhook":
+                    logger.error("BOT_MODE=webhook: the bot is served by the API workers")
+                    sys.exit(1)
                 logger.info("Starting in Bot-only mode...")
                 run_bot()
             elif mode == "api":
                 logger.info("Starting in API-only mode...")
-                run_api()
+                serve_api()
+            elif mode == "shard":
+                shard_id = int(sys.argv[2])
+                logger.info(f"Starting API shard {shard_id}...")
+                run_api(shard_id)
+            elif mode == "notifier":
+                logger.info("Starting notification worker...")
+                run_notifier()
             else:
                 logger.error(f"Unknown mode: {mode}")
-                print("Usage: python main.py [bot|api]")
+                print("Usage: python main.py [bot|api|shard <id>|notifier]")
                 sys.exit(1)
         else:
-            # Run both
-            logger.info("Starting in full mode (Bot + API)...")
+            # Run everything
+            logger.info("Starting in full mode (Bot + API + notifier)...")
             
-            # Start API server in separate process
-            api_process = Process(target=run_api)
-            api_process.start()
+            # Notification worker always runs in its own process
+            notifier_process = Process(target=run_notifier)
+            notifier_process.start()
             
-            # Run bot in main process
             try:
-                run_bot()
+                if settings.bot_mode == "webhook":
+                    # The API workers receive bot updates through the webhook route
+                    serve_api()
+                else:
+                    # Start API server in separate process
+                    api_process = Process(target=serve_api)
+                    api_process.start()
+                    
+                    # Run bot in main process
+                    try:
+                        run_bot()
+                    finally:
+                        api_process.terminate()
+                        api_process.join()
             finally:
-                api_process.terminate()
-                api_process.join()
+                notifier_process.terminate()
+                notifier_process.join()
     
     except KeyboardInterrupt:
         logger.info("Shutting down...")
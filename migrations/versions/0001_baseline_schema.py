@@ -0,0 +1,88 @@
+"""Baseline schema, as created by init_db before migrations existed
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "players",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("telegram_id", sa.String(), nullable=False),
+        sa.Column("display_name", sa.String(), nullable=False),
+        sa.Column("avatar_url", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_players_telegram_id", "players", ["telegram_id"], unique=True)
+
+    op.create_table(
+        "game_rooms",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("host_id", sa.String(), sa.ForeignKey("players.id"), nullable=False),
+        sa.Column("variant", sa.String(), nullable=False),
+        sa.Column("number_range_min", sa.Integer(), nullable=False),
+        sa.Column("number_range_max", sa.Integer(), nullable=False),
+        sa.Column("cards_per_player", sa.Integer(), nullable=False),
+        sa.Column("pattern", sa.JSON(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("called_numbers", sa.JSON(), nullable=False),
+        sa.Column("draw_pool", sa.JSON(), nullable=False),
+        sa.Column("winners", sa.JSON(), nullable=False),
+        sa.Column("draw_interval", sa.Integer(), nullable=False),
+        sa.Column("auto_draw", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "cards",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("room_id", sa.String(), sa.ForeignKey("game_rooms.id"), nullable=False),
+        sa.Column("owner_id", sa.String(), sa.ForeignKey("players.id"), nullable=False),
+        sa.Column("variant", sa.String(), nullable=False),
+        sa.Column("grid", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "draw_logs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("room_id", sa.String(), sa.ForeignKey("game_rooms.id"), nullable=False),
+        sa.Column("sequence", sa.JSON(), nullable=False),
+        sa.Column("seed", sa.String(), nullable=False),
+        sa.Column("final_hash", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "claims",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("room_id", sa.String(), sa.ForeignKey("game_rooms.id"), nullable=False),
+        sa.Column("player_id", sa.String(), sa.ForeignKey("players.id"), nullable=False),
+        sa.Column("card_id", sa.String(), sa.ForeignKey("cards.id"), nullable=False),
+        sa.Column("claimed_pattern", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("verification_message", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("verified_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("claims")
+    op.drop_table("draw_logs")
+    op.drop_table("cards")
+    op.drop_table("game_rooms")
+    op.drop_index("ix_players_telegram_id", table_name="players")
+    op.drop_table("players")
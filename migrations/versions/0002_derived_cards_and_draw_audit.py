@@ -0,0 +1,47 @@
+"""Derived cards, draw audit chain and commit-reveal columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("game_rooms", sa.Column("draw_seed", sa.String(), nullable=True))
+    op.add_column("game_rooms", sa.Column("seed_commitment", sa.String(), nullable=True))
+    op.add_column("game_rooms", sa.Column("client_seed", sa.String(), nullable=True))
+    op.add_column("game_rooms", sa.Column("card_seed", sa.String(), nullable=True))
+    op.add_column(
+        "game_rooms",
+        sa.Column("cards_issued", sa.Integer(), nullable=False, server_default="0")
+    )
+
+    # Batch mode keeps the nullability change portable to SQLite
+    with op.batch_alter_table("cards") as batch:
+        batch.add_column(sa.Column("serial", sa.Integer(), nullable=True))
+        batch.alter_column("grid", existing_type=sa.JSON(), nullable=True)
+
+    op.add_column(
+        "draw_logs",
+        sa.Column("start_sequence", sa.Integer(), nullable=False, server_default="1")
+    )
+
+
+def downgrade():
+    op.drop_column("draw_logs", "start_sequence")
+    with op.batch_alter_table("cards") as batch:
+        batch.alter_column("grid", existing_type=sa.JSON(), nullable=False)
+        batch.drop_column("serial")
+    op.drop_column("game_rooms", "cards_issued")
+    op.drop_column("game_rooms", "card_seed")
+    op.drop_column("game_rooms", "client_seed")
+    op.drop_column("game_rooms", "seed_commitment")
+    op.drop_column("game_rooms", "draw_seed")
@@ -0,0 +1,29 @@
+"""Indexes for the room, card, claim and draw log access patterns
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_game_rooms_state_updated_at", "game_rooms", ["state", "updated_at"])
+    op.create_index("ix_cards_room_id_owner_id", "cards", ["room_id", "owner_id"])
+    op.create_index("ix_cards_owner_id", "cards", ["owner_id"])
+    op.create_index("ix_claims_room_id_card_id", "claims", ["room_id", "card_id"])
+    op.create_index("ix_draw_logs_room_id_start_sequence", "draw_logs", ["room_id", "start_sequence"])
+
+
+def downgrade():
+    op.drop_index("ix_draw_logs_room_id_start_sequence", table_name="draw_logs")
+    op.drop_index("ix_claims_room_id_card_id", table_name="claims")
+    op.drop_index("ix_cards_owner_id", table_name="cards")
+    op.drop_index("ix_cards_room_id_owner_id", table_name="cards")
+    op.drop_index("ix_game_rooms_state_updated_at", table_name="game_rooms")
@@ -0,0 +1,138 @@
+"""Optional monthly range partitioning of cards and claims (PostgreSQL)
+
+Only applied when PARTITION_TABLES is enabled and the database is
+PostgreSQL; otherwise this revision is a no-op. Partitions are keyed on
+created_at, which for cards and claims tracks the creation time of their room.
+
+Partitioned tables need the partition key in every unique constraint, so
+the primary keys become (id, created_at) and the claims.card_id foreign key
+is dropped (card ids are still UUIDs and are checked by the API). Rows older
+than the current month land in the DEFAULT partition. Run
+
+    SELECT bingo_ensure_month_partitions('cards', 3);
+    SELECT bingo_ensure_month_partitions('claims', 3);
+
+monthly (e.g. from pg_cron) so new rows never fall into the DEFAULT partition.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+
+from src.core.config import settings
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION bingo_ensure_month_partitions(parent text, months_ahead int)
+RETURNS void AS $$
+DECLARE
+    month_start date;
+    partition_name text;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', now()) + make_interval(months => i))::date;
+        partition_name := format('%s_%s', parent, to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + interval '1 month')::date
+            );
+        END IF;
+    END LOOP;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# (table, foreign keys to restore on the partitioned table)
+PARTITIONED_TABLES = [
+    ("cards", [
+        ("cards_room_id_fkey", "room_id", "game_rooms"),
+        ("cards_owner_id_fkey", "owner_id", "players"),
+    ]),
+    ("claims", [
+        ("claims_room_id_fkey", "room_id", "game_rooms"),
+        ("claims_player_id_fkey", "player_id", "players"),
+    ]),
+]
+
+# Indexes from revision 0003 to recreate on the partitioned parents
+PARTITIONED_INDEXES = {
+    "cards": [
+        ("ix_cards_room_id_owner_id", "room_id, owner_id"),
+        ("ix_cards_owner_id", "owner_id"),
+    ],
+    "claims": [
+        ("ix_claims_room_id_card_id", "room_id, card_id"),
+    ],
+}
+
+
+def _enabled() -> bool:
+    return settings.partition_tables and op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if not _enabled():
+        return
+
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    op.execute("ALTER TABLE claims DROP CONSTRAINT IF EXISTS claims_card_id_fkey")
+
+    for table, foreign_keys in PARTITIONED_TABLES:
+        op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey")
+        for index_name, _ in PARTITIONED_INDEXES[table]:
+            op.execute(f"DROP INDEX IF EXISTS {index_name}")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(f"SELECT bingo_ensure_month_partitions('{table}', 3)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned")
+        op.execute(f"DROP TABLE {table}_unpartitioned")
+        for constraint, column, referenced in foreign_keys:
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {constraint} "
+                f"FOREIGN KEY ({column}) REFERENCES {referenced} (id)"
+            )
+        for index_name, columns in PARTITIONED_INDEXES[table]:
+            op.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+
+
+def downgrade():
+    if not _enabled():
+        return
+
+    for table, foreign_keys in reversed(PARTITIONED_TABLES):
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey")
+        for index_name, _ in PARTITIONED_INDEXES[table]:
+            op.execute(f"DROP INDEX IF EXISTS {index_name}")
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+        op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+        for constraint, column, referenced in foreign_keys:
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {constraint} "
+                f"FOREIGN KEY ({column}) REFERENCES {referenced} (id)"
+            )
+        for index_name, columns in PARTITIONED_INDEXES[table]:
+            op.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+
+    op.execute(
+        "ALTER TABLE claims ADD CONSTRAINT claims_card_id_fkey "
+        "FOREIGN KEY (card_id) REFERENCES cards (id)"
+    )
+    op.execute("DROP FUNCTION IF EXISTS bingo_ensure_month_partitions(text, int)")
@@ -0,0 +1,104 @@
+"""Append-only draws table replacing called_numbers and draw_logs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-01-01 00:00:00
+"""
+import hashlib
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+rooms = sa.table(
+    "game_rooms",
+    sa.column("id", sa.String()),
+    sa.column("called_numbers", sa.JSON()),
+    sa.column("draw_pool", sa.JSON()),
+    sa.column("draw_seed", sa.String()),
+    sa.column("updated_at", sa.DateTime()),
+)
+
+
+def sha256(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def upgrade():
+    draws = op.create_table(
+        "draws",
+        sa.Column("room_id", sa.String(), sa.ForeignKey("game_rooms.id"), primary_key=True),
+        sa.Column("seq", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("drawn_at", sa.DateTime(), nullable=False),
+        sa.Column("chain_hash", sa.String(), nullable=False),
+    )
+
+    # Backfill the history and turn draw_pool (the numbers still to draw)
+    # into the full draw order
+    bind = op.get_bind()
+    for room in bind.execute(sa.select(rooms)).fetchall():
+        called = room.called_numbers or []
+        head = sha256(room.draw_seed or "")
+        rows = []
+        for seq, number in enumerate(called, start=1):
+            head = sha256(f"{head}:{seq}:{number}")
+            rows.append({
+                "room_id": room.id,
+                "seq": seq,
+                "number": number,
+                "drawn_at": room.updated_at or datetime.utcnow(),
+                "chain_hash": head,
+            })
+        if rows:
+            op.bulk_insert(draws, rows)
+            bind.execute(
+                rooms.update().where(rooms.c.id == room.id).values(draw_pool=called + (room.draw_pool or []))
+            )
+
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.drop_column("called_numbers")
+
+    op.drop_index("ix_draw_logs_room_id_start_sequence", table_name="draw_logs")
+    op.drop_table("draw_logs")
+
+
+def downgrade():
+    op.create_table(
+        "draw_logs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("room_id", sa.String(), sa.ForeignKey("game_rooms.id"), nullable=False),
+        sa.Column("sequence", sa.JSON(), nullable=False),
+        sa.Column("seed", sa.String(), nullable=False),
+        sa.Column("final_hash", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("start_sequence", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.create_index("ix_draw_logs_room_id_start_sequence", "draw_logs", ["room_id", "start_sequence"])
+
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.add_column(sa.Column("called_numbers", sa.JSON(), nullable=False, server_default="[]"))
+
+    # Draw logs are not rebuilt; called_numbers and the remaining pool are
+    bind = op.get_bind()
+    draws = sa.table("draws", sa.column("room_id", sa.String()), sa.column("seq"), sa.column("number"))
+    called = {}
+    for row in bind.execute(sa.select(draws).order_by(draws.c.room_id, draws.c.seq)).fetchall():
+        called.setdefault(row.room_id, []).append(row.number)
+    for room in bind.execute(sa.select(rooms.c.id, rooms.c.draw_pool)).fetchall():
+        numbers = called.get(room.id, [])
+        bind.execute(
+            rooms.update().where(rooms.c.id == room.id).values(
+                called_numbers=numbers,
+                draw_pool=(room.draw_pool or [])[len(numbers):]
+            )
+        )
+
+    op.drop_table("draws")
@@ -0,0 +1,24 @@
+"""Version column for optimistic concurrency on game rooms
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.drop_column("version")
@@ -0,0 +1,26 @@
+"""Public lobbies with a target size for quick play
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.add_column(sa.Column("public", sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch.add_column(sa.Column("target_players", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.drop_column("target_players")
+        batch.drop_column("public")
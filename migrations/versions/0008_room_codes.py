@@ -0,0 +1,40 @@
+"""Unique indexed short codes for game rooms
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+rooms = sa.table("game_rooms", sa.column("id", sa.String()), sa.column("code", sa.String()))
+
+
+def upgrade():
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.add_column(sa.Column("code", sa.String(), nullable=True))
+
+    # Existing rooms keep the code they were announced with, id[:8].upper()
+    bind = op.get_bind()
+    seen = set()
+    for room in bind.execute(sa.select(rooms.c.id)).fetchall():
+        code = room.id[:8].upper()
+        if code in seen:
+            code = room.id.replace("-", "")[8:16].upper()
+        seen.add(code)
+        bind.execute(rooms.update().where(rooms.c.id == room.id).values(code=code))
+
+    op.create_index("ix_game_rooms_code", "game_rooms", ["code"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_game_rooms_code", table_name="game_rooms")
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.drop_column("code")
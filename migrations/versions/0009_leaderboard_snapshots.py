@@ -0,0 +1,30 @@
+"""Leaderboard snapshots
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leaderboard_snapshots",
+        sa.Column("board", sa.String(), primary_key=True),
+        sa.Column("period", sa.String(), primary_key=True),
+        sa.Column("rank", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("player_id", sa.String(), sa.ForeignKey("players.id"), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("leaderboard_snapshots")
@@ -0,0 +1,50 @@
+"""Tournaments of rooms started together
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tournaments",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("host_id", sa.String(), sa.ForeignKey("players.id"), nullable=False),
+        sa.Column("variant", sa.String(), nullable=False),
+        sa.Column("pattern", sa.String(), nullable=False),
+        sa.Column("cards_per_player", sa.Integer(), nullable=False),
+        sa.Column("players_per_room", sa.Integer(), nullable=False),
+        sa.Column("draw_interval", sa.Integer(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("round", sa.Integer(), nullable=False),
+        sa.Column("starts_at", sa.DateTime(), nullable=False),
+        sa.Column("champions", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.add_column(sa.Column("tournament_id", sa.String(), nullable=True))
+        batch.add_column(sa.Column("tournament_round", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_game_rooms_tournament_id", "tournaments", ["tournament_id"], ["id"])
+        batch.create_index("ix_game_rooms_tournament_id_round", ["tournament_id", "tournament_round"])
+
+
+def downgrade():
+    with op.batch_alter_table("game_rooms") as batch:
+        batch.drop_index("ix_game_rooms_tournament_id_round")
+        batch.drop_constraint("fk_game_rooms_tournament_id", type_="foreignkey")
+        batch.drop_column("tournament_round")
+        batch.drop_column("tournament_id")
+
+    op.drop_table("tournaments")
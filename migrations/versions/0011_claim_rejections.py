@@ -0,0 +1,34 @@
+"""Aggregated rejected claims
+
+card_id has no foreign key: with PARTITION_TABLES (0004) cards.id is not
+unique on its own, so the claim guard checks cards before writing.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "claim_rejections",
+        sa.Column("room_id", sa.String(), sa.ForeignKey("game_rooms.id"), primary_key=True),
+        sa.Column("player_id", sa.String(), sa.ForeignKey("players.id"), primary_key=True),
+        sa.Column("card_id", sa.String(), primary_key=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_message", sa.String(), nullable=True),
+        sa.Column("first_at", sa.DateTime(), nullable=False),
+        sa.Column("last_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("claim_rejections")
@@ -0,0 +1,27 @@
+"""Tournament registrations, one per player
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2024-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tournament_entries",
+        sa.Column("tournament_id", sa.String(), sa.ForeignKey("tournaments.id"), primary_key=True),
+        sa.Column("player_id", sa.String(), sa.ForeignKey("players.id"), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("tournament_entries")
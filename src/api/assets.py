@@ -0,0 +1,97 @@
+"""
+Static asset pipeline for the Mini App
+Fingerprints and precompresses assets once per process and serves them with
+long-lived caching, so repeat visits cost a 304 or nothing at all
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only without it
+    brotli = None
+
+# Fingerprinted assets never change, so clients may cache them forever
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Pages reference the current fingerprints and must be revalidated
+REVALIDATE = "no-cache"
+
+
+class CompressedBody:
+    """A response body with its precompressed variants and validator"""
+    
+    def __init__(self, content: bytes, media_type: str):
+        self.media_type = media_type
+        self.etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+        self.variants: Dict[Optional[str], bytes] = {None: content}
+        gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(gzipped) < len(content):
+            self.variants["gzip"] = gzipped
+        if brotli is not None:
+            compressed = brotli.compress(content, quality=11)
+            if len(compressed) < len(content):
+                self.variants["br"] = compressed
+    
+    def _encoding(self, accept_encoding: str) -> Optional[str]:
+        """Best precompressed variant the client accepts"""
+        accepted = set()
+        for part in accept_encoding.split(","):
+            token, _, params = part.strip().partition(";")
+            if params.replace(" ", "") not in ("q=0", "q=0.0"):
+                accepted.add(token.strip().lower())
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and (encoding in accepted or "*" in accepted):
+                return encoding
+        return None
+    
+    def response(self, request: Request, cache_control: str) -> Response:
+        """Serve the best variant, or 304 if the client copy is current"""
+        headers = {"Cache-Control": cache_control, "ETag": self.etag, "Vary": "Accept-Encoding"}
+        if self.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        
+        encoding = self._encoding(request.headers.get("accept-encoding", ""))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.variants[encoding], media_type=self.media_type, headers=headers)
+
+
+class AssetPipeline:
+    """Fingerprinted, precompressed copies of the files under a static directory"""
+    
+    # Assets referenced by the templates
+    ASSETS = ["css/style.css", "js/cards.js", "js/verifier.js", "js/patterns.js", "js/renderer.js", "js/app.js"]
+    
+    def __init__(self, static_dir: str, url_prefix: str = "/assets"):
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix
+        self._urls: Dict[str, str] = {}
+        self._bodies: Dict[str, CompressedBody] = {}
+    
+    def build(self):
+        """Hash and compress every asset"""
+        for path in self.ASSETS:
+            with open(os.path.join(self.static_dir, path), "rb") as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()[:10]
+            stem, ext = os.path.splitext(os.path.basename(path))
+            name = f"{stem}.{digest}{ext}"
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type.endswith("javascript"):
+                media_type += "; charset=utf-8"
+            self._bodies[name] = CompressedBody(content, media_type)
+            self._urls[path] = f"{self.url_prefix}/{name}"
+    
+    def url(self, path: str) -> str:
+        """Fingerprinted URL of an asset, for templates"""
+        return self._urls[path]
+    
+    def get(self, name: str) -> Optional[CompressedBody]:
+        """Body of a fingerprinted asset name"""
+        return self._bodies.get(name)
@@ -4,23 +4,48 @@ Handles REST API, WebSocket connections, and serves Telegram Mini App
 """
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Dict, List, Set
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from collections import deque
+import hashlib
 import json
+import math
+import re
+from urllib.parse import urlencode
 import asyncio
-from datetime import datetime
-import hashlib
+import time
+from functools import lru_cache
+from datetime import datetime, timezone
 
 from src.core.config import settings
-from src.core.database import get_db_session, init_db
+from src.core.database import get_db, get_db_session, init_db
 from src.core.redis import redis_client
-from src.models import GameRoom, Player, Card, Claim
+from src.models import GameRoom, Player, Card, Claim, Tournament, TournamentEntry
 from src.services import CardGenerator, DrawEngine, PatternVerifier
+from src.services.draws import DrawConflict, DrawStore
+from src.services.rooms import RoomConflict, RoomStore
+from src.services.simulator import GameSimulator
+from src.services.lobbies import LobbyIndex, lobby_index
+from src.services.room_codes import room_codes
+from src.services.leaderboards import leaderboards
+from src.services.claims import claim_guard
+from src.services.tournaments import TournamentFull, TournamentScheduler, tournament_scheduler
+from src.services.short_codes import ShortCodes
+from src.services.archiver import room_archiver
+from src.services.notifications import publish_event
+from src.services.sharding import shard_router
+from src.services.jobs import JobPool, JobQueueFull, JobTimeout
+from src.bot.telegram_bot import bot
+from src.api.assets import AssetPipeline, CompressedBody, IMMUTABLE, REVALIDATE
+from src.api.responses import FastJSONResponse
+from src.api.spectators import SpectatorHub
+from src.services.serialization import dumps, dumps_text
 
-app = FastAPI(title="Ethio Bingo API", version="1.0.0")
+app = FastAPI(title="Ethio Bingo API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # Enable CORS
 app.add_middleware(
@@ -31,41 +56,254 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# CPU-heavy work runs here, off the event loop
+job_pool = JobPool(
+    workers=settings.job_workers,
+    max_pending=settings.job_queue_size,
+    timeout=settings.job_timeout
+)
+
+
+@app.exception_handler(JobQueueFull)
+async def job_queue_full_handler(request: Request, exc: JobQueueFull):
+    return JSONResponse(status_code=503, content={"detail": "Server busy, try again"}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(JobTimeout)
+async def job_timeout_handler(request: Request, exc: JobTimeout):
+    return JSONResponse(status_code=504, content={"detail": "Operation timed out"})
+
+
+@app.exception_handler(RoomConflict)
+async def room_conflict_handler(request: Request, exc: RoomConflict):
+    return JSONResponse(status_code=409, content={"detail": "Room is busy, try again"})
+
+
+# Room-scoped paths; with several shards these must reach the room's owner
+ROOM_PATH = re.compile(r"^/api/rooms/([^/]+)/?")
+
+
+@app.middleware("http")
+async def route_to_room_shard(request: Request, call_next):
+    """Redirect room requests that reached the wrong shard to its owner"""
+    match = ROOM_PATH.match(request.url.path)
+    if match and not shard_router.is_local(match.group(1)):
+        owner = shard_router.owner(match.group(1))
+        url = request.url.include_query_params(shard=owner)
+        return RedirectResponse(str(url), status_code=307, headers={"X-Bingo-Shard": owner})
+    
+    response = await call_next(request)
+    if match and shard_router.enabled:
+        response.headers["X-Bingo-Shard"] = shard_router.shard_id
+    return response
+
+
 # Mount static files and templates
 app.mount("/static", StaticFiles(directory="src/static"), name="static")
 templates = Jinja2Templates(directory="src/templates")
 
+# Fingerprinted, precompressed assets and the pre-rendered Mini App page
+assets = AssetPipeline("src/static")
+
+
+def render_mini_app() -> CompressedBody:
+    """Rebuild assets and render the Mini App page once"""
+    assets.build()
+    templates.env.globals["asset_url"] = assets.url
+    html = templates.get_template("index.html").render()
+    return CompressedBody(html.encode(), "text/html; charset=utf-8")
+
+
+mini_app_page = render_mini_app()
+
 # WebSocket connection manager
 class ConnectionManager:
-    def __init__(self):
+    """
+    Room WebSocket fan-out
+    Every broadcast event gets a per-room sequence number and is kept in a
+    bounded ring buffer, so a client reconnecting with the last sequence it
+    saw is sent only the events it missed. A reaper pings quiet sockets and
+    closes those that stay silent, so half-open connections do not linger.
+    """
+    
+    # Close code telling clients to retry later
+    TRY_AGAIN_LATER = 1013
+    # Close code telling clients to reconnect to another shard
+    MOVED = 4001
+    
+    def __init__(
+        self,
+        replay_size: int = 256,
+        heartbeat_interval: int = 20,
+        idle_timeout: int = 60,
+        max_per_room: int = 100,
+        max_connections: int = 10000,
+        spectators: Optional[SpectatorHub] = None
+    ):
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self.replay_size = replay_size
+        self.sequences: Dict[str, int] = {}
+        # (seq, encoded event) per room
+        self.buffers: Dict[str, Deque[Tuple[int, str]]] = {}
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.max_per_room = max_per_room
+        self.max_connections = max_connections
+        self.last_seen: Dict[WebSocket, float] = {}
+        self.spectators = spectators
     
-    async def connect(self, websocket: WebSocket, room_id: str):
+    @property
+    def connection_count(self) -> int:
+        return len(self.last_seen)
+    
+    def touch(self, websocket: WebSocket):
+        """Record that a client is alive"""
+        if websocket in self.last_seen:
+            self.last_seen[websocket] = time.monotonic()
+    
+    def missed_events(self, room_id: str, last_seq: int) -> Optional[List[Tuple[int, str]]]:
+        """Buffered (seq, encoded event) after last_seq, or None if some were already evicted"""
+        current = self.sequences.get(room_id, 0)
+        buffer = self.buffers.get(room_id, ())
+        oldest = buffer[0][0] if buffer else current + 1
+        if last_seq > current or last_seq + 1 < oldest:
+            return None
+        return [event for event in buffer if event[0] > last_seq]
+    
+    async def connect(self, websocket: WebSocket, room_id: str, last_seq: Optional[int] = None) -> bool:
+        """Accept and register a socket; returns False if a cap refused it"""
         await websocket.accept()
+        room_count = len(self.active_connections.get(room_id, ()))
+        if room_count >= self.max_per_room or self.connection_count >= self.max_connections:
+            await websocket.close(code=self.TRY_AGAIN_LATER)
+            return False
+        
+        if last_seq is None:
+            last_seq = self.sequences.get(room_id, 0)
+            await websocket.send_text(dumps_text({"type": "welcome", "seq": last_seq}))
+        
+        # Replay until caught up, including events broadcast while the welcome
+        # was sent; registering right after the final empty check (no await in
+        # between) means no live event can slip past
+        while True:
+            missed = self.missed_events(room_id, last_seq)
+            if missed is None:
+                await websocket.send_text(dumps_text({"type": "resync", "seq": self.sequences.get(room_id, 0)}))
+                break
+            if not missed:
+                break
+            for _, text in missed:
+                await websocket.send_text(text)
+            last_seq = missed[-1][0]
+        
         if room_id not in self.active_connections:
             self.active_connections[room_id] = set()
         self.active_connections[room_id].add(websocket)
+        self.last_seen[websocket] = time.monotonic()
+        return True
     
     def disconnect(self, websocket: WebSocket, room_id: str):
+        self.last_seen.pop(websocket, None)
         if room_id in self.active_connections:
             self.active_connections[room_id].discard(websocket)
             if not self.active_connections[room_id]:
                 del self.active_connections[room_id]
     
     async def broadcast(self, room_id: str, message: dict):
+        seq = self.sequences.get(room_id, 0) + 1
+        self.sequences[room_id] = seq
+        # Encoded once for every socket, the replay buffer and spectators
+        data = dumps({**message, "seq": seq})
+        text = data.decode()
+        if room_id not in self.buffers:
+            self.buffers[room_id] = deque(maxlen=self.replay_size)
+        self.buffers[room_id].append((seq, text))
+        if self.spectators:
+            self.spectators.publish(room_id, seq, data)
+        
         if room_id in self.active_connections:
             dead_connections = set()
-            for connection in self.active_connections[room_id]:
+            for connection in list(self.active_connections[room_id]):
                 try:
-                    await connection.send_json(message)
+                    await connection.send_text(text)
                 except:
                     dead_connections.add(connection)
             
             # Clean up dead connections
             for connection in dead_connections:
                 self.disconnect(connection, room_id)
+    
+    async def close_room(self, room_id: str):
+        """Close and forget every connection and buffered event of a room"""
+        self.sequences.pop(room_id, None)
+        self.buffers.pop(room_id, None)
+        for connection in self.active_connections.pop(room_id, set()):
+            self.last_seen.pop(connection, None)
+            try:
+                await connection.close()
+            except:
+                pass
+    
+    async def move_room(self, room_id: str, shard: str):
+        """Point a room's clients at the shard that now owns it"""
+        self.sequences.pop(room_id, None)
+        self.buffers.pop(room_id, None)
+        if self.spectators:
+            self.spectators.close(room_id, {"type": "moved", "shard": shard})
+        for connection in self.active_connections.pop(room_id, set()):
+            self.last_seen.pop(connection, None)
+            try:
+                await connection.send_json({"type": "moved", "shard": shard})
+                await connection.close(code=self.MOVED)
+            except:
+                pass
+    
+    async def _heartbeat(self, room_id: str, websocket: WebSocket, idle: float):
+        """Ping a quiet socket, or close it if it has been silent too long"""
+        try:
+            if idle >= self.idle_timeout:
+                await asyncio.wait_for(websocket.close(), timeout=5)
+            else:
+                await asyncio.wait_for(websocket.send_json({"type": "ping"}), timeout=5)
+                return
+        except Exception:
+            pass
+        self.disconnect(websocket, room_id)
+    
+    async def reap(self):
+        """One heartbeat pass over every connection"""
+        now = time.monotonic()
+        checks = []
+        for room_id, connections in list(self.active_connections.items()):
+            for websocket in list(connections):
+                idle = now - self.last_seen.get(websocket, now)
+                if idle >= self.heartbeat_interval:
+                    checks.append(self._heartbeat(room_id, websocket, idle))
+        await asyncio.gather(*checks)
+    
+    async def run_reaper(self):
+        """Background heartbeat loop"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval / 2)
+            try:
+                await self.reap()
+            except Exception as e:
+                print(f"WebSocket reaper error: {e}")
 
-manager = ConnectionManager()
+spectators = SpectatorHub(
+    buffer_size=settings.ws_replay_buffer_size,
+    max_streams=settings.spectator_max_streams,
+    heartbeat_interval=settings.ws_heartbeat_interval
+)
+
+manager = ConnectionManager(
+    replay_size=settings.ws_replay_buffer_size,
+    heartbeat_interval=settings.ws_heartbeat_interval,
+    idle_timeout=settings.ws_idle_timeout,
+    max_per_room=settings.max_players_per_room,
+    max_connections=settings.ws_max_connections,
+    spectators=spectators
+)
 
 
 @app.on_event("startup")
@@ -73,11 +311,39 @@ async def startup_event():
     """Initialize on startup"""
     init_db()
     await redis_client.connect()
+    asyncio.create_task(manager.run_reaper())
+    
+    # Rooms follow the shard ring; adopt running games this shard owns
+    shard_router.add_change_hook(handoff_rooms)
+    await shard_router.refresh()
+    asyncio.create_task(shard_router.run())
+    await resume_auto_draws()
+    with get_db() as db:
+        await lobby_index.rebuild(db)
+    
+    # Archived rooms release their sockets, replay buffers, spectator feeds and codes
+    room_archiver.add_purge_hook(manager.close_room)
+    room_archiver.add_purge_hook(spectators.close_room)
+    room_archiver.add_purge_hook(claim_guard.close_room)
+    room_archiver.add_purge_hook(room_codes.forget)
+    asyncio.create_task(room_archiver.run())
+    asyncio.create_task(leaderboards.run())
+    asyncio.create_task(claim_guard.run())
+    tournament_scheduler.add_start_hook(drive_tournament_round)
+    asyncio.create_task(tournament_scheduler.run())
+    
+    if settings.bot_mode == "webhook":
+        bot.setup(webhook=True)
+        await bot.start_webhook()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    if settings.bot_mode == "webhook":
+        await bot.stop_webhook()
+    job_pool.shutdown()
+    await claim_guard.flush()
     await redis_client.close()
 
 
@@ -93,10 +359,37 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
+@app.post(bot.WEBHOOK_PATH)
+async def telegram_webhook(request: Request):
+    """Receive Telegram updates in webhook mode"""
+    if settings.bot_mode != "webhook":
+        raise HTTPException(status_code=404, detail="Webhook mode is disabled")
+    
+    if request.headers.get("X-Telegram-Bot-Api-Secret-Token") != bot.webhook_secret:
+        raise HTTPException(status_code=403, detail="Invalid webhook secret")
+    
+    # Acknowledge immediately; the update is handled off the request path
+    await bot.process_webhook_update(await request.json())
+    return {"ok": True}
+
+
 @app.get("/app", response_class=HTMLResponse)
 async def mini_app(request: Request):
     """Serve Telegram Mini App"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    global mini_app_page
+    if settings.debug:
+        # Pick up edited assets without a restart
+        mini_app_page = render_mini_app()
+    return mini_app_page.response(request, REVALIDATE)
+
+
+@app.get("/assets/{name}")
+async def static_asset(name: str, request: Request):
+    """Serve a fingerprinted asset with immutable caching"""
+    body = assets.get(name)
+    if not body:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return body.response(request, IMMUTABLE)
 
 
 # Room Management Endpoints
@@ -108,10 +401,17 @@ async def create_room(
     pattern: str = "horizontal_line",
     auto_draw: bool = True,
     draw_interval: int = 5,
+    derived_cards: bool = False,
+    provably_fair: bool = False,
+    public: bool = False,
+    target_players: int = None,
     player_id: str = None,
     db: Session = Depends(get_db_session)
 ):
     """Create a new game room"""
+    if target_players is not None and not 2 <= target_players <= settings.max_players_per_room:
+        raise HTTPException(status_code=400, detail=f"target_players must be 2-{settings.max_players_per_room}")
+    
     try:
         # Set number range based on variant
         if variant == "90":
@@ -119,8 +419,15 @@ async def create_room(
         else:
             min_num, max_num = 1, 75
         
-        # Initialize draw pool
-        draw_pool, seed = DrawEngine.initialize_draw_pool(min_num, max_num)
+        # Initialize draw pool; commit-reveal rooms only commit to a seed here
+        # and derive the pool at start, once the client seed is fixed
+        seed_commitment = None
+        if provably_fair:
+            seed = DrawEngine.new_server_seed()
+            seed_commitment = DrawEngine.commit_seed(seed)
+            draw_pool = []
+        else:
+            draw_pool, seed = DrawEngine.initialize_draw_pool(min_num, max_num)
         
         # Create pattern configuration
         pattern_config = {
@@ -128,6 +435,11 @@ async def create_room(
             "variant": variant
         }
         
+        # Derived cards are regenerated from (seed, serial) instead of stored
+        card_seed = None
+        if derived_cards:
+            card_seed = settings.card_series_seed or CardGenerator.new_series_seed()
+        
         # Create room
         room = GameRoom(
             host_id=player_id,
@@ -137,33 +449,86 @@ async def create_room(
             cards_per_player=cards_per_player,
             pattern=pattern_config,
             state="lobby",
-            called_numbers=[],
             draw_pool=draw_pool,
             winners=[],
             draw_interval=draw_interval,
-            auto_draw=auto_draw
+            auto_draw=auto_draw,
+            public=public,
+            target_players=target_players,
+            draw_seed=seed,
+            seed_commitment=seed_commitment,
+            card_seed=card_seed
         )
         
-        db.add(room)
-        db.commit()
+        # Short join code; the unique index rejects the rare clash
+        for attempt in range(3):
+            room.code = await room_codes.allocate(fresh=attempt > 0)
+            db.add(room)
+            try:
+                db.commit()
+                break
+            except IntegrityError:
+                db.rollback()
+        else:
+            raise HTTPException(status_code=503, detail="Could not allocate a room code")
         db.refresh(room)
+        await room_codes.remember(room.code, room.id)
         
-        # Generate room code (short version of UUID)
-        room_code = room.id[:8].upper()
+        if public:
+            await lobby_index.add(room)
         
         return {
             "room_id": room.id,
-            "room_code": room_code,
+            "room_code": room.code,
             "variant": variant,
             "state": room.state,
             "pattern": pattern,
+            "public": room.public,
+            "target_players": room.target_players,
+            "card_seed": room.card_seed,
+            "seed_commitment": room.seed_commitment,
+            "shard": shard_router.owner(room.id) if shard_router.enabled else None,
             "created_at": room.created_at.isoformat()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/codes/{code}")
+async def resolve_room_code(code: str, db: Session = Depends(get_db_session)):
+    """Room a join code belongs to"""
+    room_id = await room_codes.resolve(db, code)
+    if not room_id:
+        raise HTTPException(status_code=404, detail="Unknown room code")
+    
+    return {
+        "room_id": room_id,
+        "room_code": ShortCodes.normalize(code),
+        "shard": shard_router.owner(room_id) if shard_router.enabled else None
+    }
+
+
+def fairness_info(room: GameRoom):
+    """Commit-reveal data of a room; the server seed is revealed once finished"""
+    if not room.seed_commitment:
+        return None
+    return {
+        "commitment": room.seed_commitment,
+        "client_seed": room.client_seed,
+        "server_seed": room.draw_seed if room.state == "finished" else None,
+        "number_range": [room.number_range_min, room.number_range_max]
+    }
+
+
+def players_seed(db: Session, room_id: str) -> str:
+    """Default client seed: sha256 of the room's sorted, comma-joined player ids"""
+    owners = sorted(row.owner_id for row in db.query(Card.owner_id).filter(Card.room_id == room_id).distinct())
+    return hashlib.sha256(",".join(owners).encode()).hexdigest()
+
+
 @app.get("/api/rooms/{room_id}")
 async def get_room(room_id: str, db: Session = Depends(get_db_session)):
     """Get room details"""
@@ -171,23 +536,52 @@ async def get_room(room_id: str, db: Session = Depends(get_db_session)):
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     
-    # Get players in room
-    cards = db.query(Card).filter(Card.room_id == room_id).all()
-    player_ids = list(set([card.owner_id for card in cards]))
-    players = db.query(Player).filter(Player.id.in_(player_ids)).all() if player_ids else []
+    # Players holding cards, read off the (room_id, owner_id) index
+    # without loading any card grids
+    owners = db.query(Card.owner_id).filter(Card.room_id == room_id).distinct()
+    players = db.query(Player.id, Player.display_name).filter(Player.id.in_(owners)).all()
     
-    return {
+    return FastJSONResponse({
         "id": room.id,
+        "code": room.code,
         "host_id": room.host_id,
         "variant": room.variant,
         "state": room.state,
         "pattern": room.pattern,
-        "called_numbers": room.called_numbers,
+        "called_numbers": DrawStore.called_numbers(db, room_id),
         "winners": room.winners,
         "players": [{"id": p.id, "name": p.display_name} for p in players],
         "auto_draw": room.auto_draw,
-        "draw_interval": room.draw_interval
-    }
+        "draw_interval": room.draw_interval,
+        "card_seed": room.card_seed,
+        "fairness": fairness_info(room)
+    })
+
+
+@app.get("/api/rooms/{room_id}/cards/{serial}")
+async def get_derived_card(room_id: str, serial: int, db: Session = Depends(get_db_session)):
+    """Regenerate a derived card from the room's card seed"""
+    room = db.query(GameRoom).filter(GameRoom.id == room_id).first()
+    if not room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    
+    if not room.card_seed:
+        raise HTTPException(status_code=404, detail="Room does not use derived cards")
+    
+    if serial < 1 or serial > room.cards_issued:
+        raise HTTPException(status_code=404, detail="Card not found")
+    
+    return Response(content=derived_card_body(room.card_seed, serial, room.variant), media_type="application/json")
+
+
+@lru_cache(maxsize=settings.card_payload_cache_size)
+def derived_card_body(card_seed: str, serial: int, variant: str) -> bytes:
+    """Encoded derived card; a (seed, serial) card never changes, so it is built and encoded once"""
+    return dumps({
+        "serial": serial,
+        "variant": variant,
+        "grid": CardGenerator.derive_card(card_seed, serial, variant)
+    })
 
 
 @app.post("/api/rooms/{room_id}/join")
@@ -204,24 +598,27 @@ async def join_room(
     if room.state != "lobby":
         raise HTTPException(status_code=400, detail="Room is not in lobby state")
     
+    if room.tournament_id:
+        raise HTTPException(status_code=400, detail="Tournament rooms are joined by registering")
+    
     player = db.query(Player).filter(Player.id == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    # Generate cards for player
-    cards_data = []
-    for _ in range(room.cards_per_player):
-        card_grid = CardGenerator.generate_card(room.variant)
-        card = Card(
-            room_id=room_id,
-            owner_id=player_id,
-            variant=room.variant,
-            grid=card_grid
-        )
-        db.add(card)
-        cards_data.append(card)
+    # Public lobbies hand out seats atomically in the lobby index
+    if room.public:
+        seat = await lobby_index.seat(room, player_id)
+        if seat == LobbyIndex.FULL:
+            raise HTTPException(status_code=409, detail="Room is full")
+        if seat == LobbyIndex.ALREADY_SEATED:
+            raise HTTPException(status_code=409, detail="Already joined this room")
     
-    db.commit()
+    try:
+        cards_data = await issue_cards(db, room, player_id)
+    except Exception:
+        if room.public:
+            await lobby_index.unseat(room, player_id)
+        raise
     
     # Broadcast player joined
     await manager.broadcast(room_id, {
@@ -232,36 +629,194 @@ async def join_room(
         }
     })
     
-    return {
+    # Lobbies with a target size start themselves once it is reached
+    if room.target_players and LobbyIndex.seated_count(db, room_id) >= room.target_players:
+        try:
+            await begin_game(db, room)
+        except HTTPException:
+            pass  # A concurrent join started it first
+    
+    if room.card_seed:
+        # Clients derive the grids locally from the seed and serials
+        return FastJSONResponse({
+            "message": "Joined room successfully",
+            "room_id": room_id,
+            "state": room.state,
+            "variant": room.variant,
+            "pattern": room.pattern.get("id"),
+            "card_seed": room.card_seed,
+            "cards": [{"id": c.id, "serial": c.serial, "variant": c.variant} for c in cards_data]
+        })
+    
+    return FastJSONResponse({
         "message": "Joined room successfully",
+        "room_id": room_id,
+        "state": room.state,
+        "variant": room.variant,
+        "pattern": room.pattern.get("id"),
         "cards": [{"id": c.id, "grid": c.grid} for c in cards_data]
-    }
+    })
+
+
+async def issue_cards(db: Session, room: GameRoom, player_id: str) -> List[Card]:
+    """Generate and commit a player's cards for a room"""
+    cards_data = []
+    if room.card_seed:
+        # Reserve a block of serials atomically; the row lock serializes joins
+        db.query(GameRoom).filter(GameRoom.id == room.id).update(
+            {GameRoom.cards_issued: GameRoom.cards_issued + room.cards_per_player},
+            synchronize_session=False
+        )
+        db.refresh(room)
+        first_serial = room.cards_issued - room.cards_per_player + 1
+        for serial in range(first_serial, room.cards_issued + 1):
+            card = Card(
+                room_id=room.id,
+                owner_id=player_id,
+                variant=room.variant,
+                serial=serial
+            )
+            db.add(card)
+            cards_data.append(card)
+    else:
+        if room.cards_per_player >= settings.job_min_cards:
+            grids = await job_pool.run(CardGenerator.generate_cards, room.variant, room.cards_per_player)
+        else:
+            grids = CardGenerator.generate_cards(room.variant, room.cards_per_player)
+        for card_grid in grids:
+            card = Card(
+                room_id=room.id,
+                owner_id=player_id,
+                variant=room.variant,
+                grid=card_grid
+            )
+            db.add(card)
+            cards_data.append(card)
+    
+    db.commit()
+    return cards_data
+
+
+@app.post("/api/lobbies/quick-play")
+async def quick_play(
+    player_id: str,
+    variant: str = "75",
+    pattern: str = "horizontal_line",
+    db: Session = Depends(get_db_session)
+):
+    """Seat a player in the fullest open public lobby, opening one if none has room"""
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    
+    for _ in range(settings.quick_play_attempts):
+        room_id = await lobby_index.pick(variant, pattern, player_id)
+        if room_id is None:
+            break
+        if not shard_router.is_local(room_id):
+            return join_redirect(room_id, player_id)
+        try:
+            return await join_room(room_id, player_id, db)
+        except HTTPException as e:
+            if e.status_code not in (400, 404, 409):
+                raise
+            # Filled, started or archived since it was listed
+            if e.status_code != 409:
+                await lobby_index.discard(room_id, variant, pattern)
+    
+    room = await create_room(
+        variant=variant,
+        pattern=pattern,
+        draw_interval=settings.default_draw_interval,
+        # Derived cards are marked from the calls when claimed; stored grids are not
+        derived_cards=True,
+        public=True,
+        target_players=settings.lobby_target_players,
+        player_id=player_id,
+        db=db
+    )
+    if not shard_router.is_local(room["room_id"]):
+        return join_redirect(room["room_id"], player_id)
+    return await join_room(room["room_id"], player_id, db)
+
+
+def join_redirect(room_id: str, player_id: str) -> RedirectResponse:
+    """Send a quick-play request on to the join endpoint of the room's shard"""
+    query = urlencode({"player_id": player_id, "shard": shard_router.owner(room_id)})
+    return RedirectResponse(url=f"/api/rooms/{room_id}/join?{query}", status_code=307)
 
 
 @app.post("/api/rooms/{room_id}/start")
-async def start_game(room_id: str, db: Session = Depends(get_db_session)):
+async def start_game(room_id: str, client_seed: str = None, db: Session = Depends(get_db_session)):
     """Start the game"""
     room = db.query(GameRoom).filter(GameRoom.id == room_id).first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     
-    if room.state != "lobby":
-        raise HTTPException(status_code=400, detail="Game already started")
+    await begin_game(db, room, client_seed)
+    return {"message": "Game started", "state": "running"}
+
+
+async def begin_game(db: Session, room: GameRoom, client_seed: str = None) -> GameRoom:
+    """Move a lobby to running, announce it and start its draws"""
+    room_id = room.id
     
-    room.state = "running"
-    db.commit()
+    def begin(room: GameRoom) -> Dict[str, Any]:
+        if room.state != "lobby":
+            raise HTTPException(status_code=400, detail="Game already started")
+        if room.tournament_id:
+            raise HTTPException(status_code=400, detail="Tournament rooms start on schedule")
+        
+        changes = {"state": "running"}
+        if room.seed_commitment:
+            # The server seed is already committed, so the client seed cannot be
+            # chosen to steer the shuffle; without one, the players who joined
+            # (not known at commit time) stand in for it
+            changes["client_seed"] = client_seed or players_seed(db, room_id)
+            changes["draw_pool"] = DrawEngine.fair_shuffle(
+                room.number_range_min, room.number_range_max, room.draw_seed, changes["client_seed"]
+            )
+        return changes
+    
+    # Of two concurrent starts only one compare-and-swap wins; the other
+    # re-reads the running room and gets a 400
+    room = RoomStore.transition(db, room, begin, settings.room_cas_retries)
+    if room.public:
+        await lobby_index.remove(room)
+    players = db.query(Card.owner_id).filter(Card.room_id == room_id).distinct().all()
+    await leaderboards.record_games([row.owner_id for row in players])
     
     # Broadcast game started
     await manager.broadcast(room_id, {
         "type": "game_started",
-        "room_id": room_id
+        "room_id": room_id,
+        "client_seed": room.client_seed
     })
+    await publish_event("game_started", room_id)
     
     # Start auto-draw if enabled
     if room.auto_draw:
-        asyncio.create_task(auto_draw_task(room_id))
+        start_auto_draw(room_id)
     
-    return {"message": "Game started", "state": "running"}
+    return room
+
+
+async def broadcast_draw(room_id: str, record: Dict[str, Any]):
+    """Announce a drawn number; claim answers from before it go stale"""
+    claim_guard.drawn(room_id, record["seq"])
+    await manager.broadcast(room_id, {
+        "type": "number_drawn",
+        "number": record["number"],
+        "sequence": record["seq"],
+        "hash": record["hash"]
+    })
+
+
+def finish_drawn_out(db: Session, room: GameRoom) -> Dict[str, Any]:
+    """Finish a room whose pool ran out without a winner; returns its game_finished message"""
+    room = RoomStore.transition(db, room, lambda current: {"state": "finished"} if current.state == "running" else {})
+    # Finishing reveals a commit-reveal room's seed
+    return {"type": "game_finished", "room_id": room.id, "fairness": fairness_info(room)}
 
 
 @app.post("/api/rooms/{room_id}/draw")
@@ -274,28 +829,57 @@ async def manual_draw(room_id: str, db: Session = Depends(get_db_session)):
     if room.state != "running":
         raise HTTPException(status_code=400, detail="Game not running")
     
-    # Draw number
-    draw_pool = room.draw_pool
-    number = DrawEngine.draw_number(draw_pool)
+    # Draw number: one INSERT, chained to the previous draw
+    try:
+        record = DrawStore.append(db, room)
+    except DrawConflict:
+        raise HTTPException(status_code=409, detail="Another draw is in progress")
     
-    if number is None:
+    if record is None:
+        await manager.broadcast(room_id, finish_drawn_out(db, room))
         return {"message": "No more numbers to draw"}
     
-    # Update room
-    called_numbers = room.called_numbers
-    called_numbers.append(number)
-    room.called_numbers = called_numbers
-    room.draw_pool = draw_pool
-    db.commit()
-    
     # Broadcast number drawn
-    await manager.broadcast(room_id, {
-        "type": "number_drawn",
-        "number": number,
-        "sequence": len(called_numbers)
-    })
+    await broadcast_draw(room_id, record)
+    
+    return {"number": record["number"], "sequence": record["seq"], "hash": record["hash"]}
+
+
+@app.get("/api/rooms/{room_id}/audit")
+async def verify_draw_audit(room_id: str, db: Session = Depends(get_db_session)):
+    """Replay seed -> shuffle -> hash chain and check it against the draws table"""
+    room = db.query(GameRoom).filter(GameRoom.id == room_id).first()
+    if not room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    
+    if not room.draw_seed:
+        raise HTTPException(status_code=400, detail="Room has no recorded draw seed")
     
-    return {"number": number, "sequence": len(called_numbers)}
+    draws = DrawStore.history(db, room_id)
+    called_numbers = [draw.number for draw in draws]
+    
+    if [draw.seq for draw in draws] != list(range(1, len(draws) + 1)):
+        is_valid, message = False, "Draw sequence has gaps"
+    else:
+        # Replaying the shuffle and hash chain is CPU-bound
+        is_valid, message = await job_pool.run(
+            DrawEngine.verify_draws,
+            room.draw_seed,
+            room.number_range_min,
+            room.number_range_max,
+            called_numbers,
+            [draw.chain_hash for draw in draws],
+            room.client_seed
+        )
+    
+    return {
+        "valid": is_valid,
+        "message": message,
+        "draws": len(draws),
+        "final_hash": draws[-1].chain_hash if draws else None,
+        # The seed is only revealed once the game is over
+        "seed": room.draw_seed if room.state == "finished" else None
+    }
 
 
 @app.post("/api/rooms/{room_id}/claim")
@@ -306,6 +890,15 @@ async def claim_bingo(
     db: Session = Depends(get_db_session)
 ):
     """Claim bingo"""
+    wait = claim_guard.throttle(player_id)
+    if wait:
+        raise HTTPException(status_code=429, detail="Too many claims", headers={"Retry-After": str(math.ceil(wait))})
+    
+    # The same claim since the last draw gets the same answer
+    replayed = claim_guard.replay(room_id, card_id, player_id)
+    if replayed is not None:
+        return replayed
+    
     room = db.query(GameRoom).filter(GameRoom.id == room_id).first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -313,109 +906,498 @@ async def claim_bingo(
     card = db.query(Card).filter(Card.id == card_id).first()
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
+    if card.room_id != room_id or card.owner_id != player_id:
+        raise HTTPException(status_code=400, detail="Card does not belong to this player in this room")
     
-    # Verify claim
-    pattern_name = room.pattern.get("id", "horizontal_line")
-    is_valid, message = PatternVerifier.verify_claim(
-        card.grid,
-        room.called_numbers,
-        pattern_name,
-        room.variant
-    )
+    outcome = {}
     
-    # Create claim record
-    claim = Claim(
-        room_id=room_id,
-        player_id=player_id,
-        card_id=card_id,
-        claimed_pattern=pattern_name,
-        status="accepted" if is_valid else "rejected",
-        verification_message=message,
-        verified_at=datetime.utcnow() if is_valid else None
-    )
-    db.add(claim)
-    
-    if is_valid:
-        # Add to winners
-        winners = room.winners
-        winners.append({
-            "player_id": player_id,
-            "card_id": card_id,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        room.winners = winners
-        room.state = "finished"
+    def settle(room: GameRoom) -> Dict[str, Any]:
+        called_numbers = DrawStore.called_numbers(db, room_id)
+        if room.state == "finished":
+            # Only a split win: another card completed on the same draw as
+            # the first winner, claimed after it finished the room
+            first = room.winners[0] if room.winners else {}
+            if first.get("draws") != len(called_numbers):
+                raise HTTPException(status_code=400, detail="Game is over")
+            if any(winner["card_id"] == card_id for winner in room.winners):
+                raise HTTPException(status_code=400, detail="Card already won")
+        elif room.state != "running":
+            raise HTTPException(status_code=400, detail="Game not running")
+        
+        # Derived cards are regenerated and marked from the called numbers
+        grid = card.grid
+        if grid is None:
+            grid = CardGenerator.derive_card(room.card_seed, card.serial, card.variant, called_numbers)
+        
+        # Verify claim
+        pattern_name = room.pattern.get("id", "horizontal_line")
+        is_valid, message = PatternVerifier.verify_claim(
+            grid,
+            called_numbers,
+            pattern_name,
+            room.variant
+        )
+        
+        outcome.update(valid=is_valid, message=message, draws=len(called_numbers), won=False)
+        if not is_valid:
+            # Counted by the claim guard instead of a row per attempt
+            return {}
+        
+        db.add(Claim(
+            room_id=room_id,
+            player_id=player_id,
+            card_id=card_id,
+            claimed_pattern=pattern_name,
+            status="accepted",
+            verification_message=message,
+            verified_at=datetime.utcnow()
+        ))
+        
+        # Add to winners; simultaneous winners each retry on top of the
+        # other's write instead of overwriting it
+        outcome["won"] = True
+        return {
+            "winners": room.winners + [{
+                "player_id": player_id,
+                "card_id": card_id,
+                "draws": len(called_numbers),
+                "timestamp": datetime.utcnow().isoformat()
+            }],
+            "state": "finished"
+        }
     
-    db.commit()
+    room = RoomStore.transition(db, room, settle, settings.room_cas_retries)
+    is_valid, message = outcome["valid"], outcome["message"]
+    response = {
+        "valid": is_valid,
+        "message": message,
+        "status": "accepted" if is_valid else "rejected"
+    }
+    # Remembered before the first await, so a repeat cannot verify again
+    claim_guard.remember(room_id, card_id, player_id, outcome["draws"], response)
+    if not is_valid:
+        claim_guard.reject(room_id, player_id, card_id, message)
+    
+    # Boards count only a winner this claim added
+    if outcome["won"]:
+        await leaderboards.record_win(player_id, outcome["draws"])
+        await publish_event("game_won", room_id, player_id=player_id)
     
-    # Broadcast claim result
+    # Broadcast claim result; a finished commit-reveal room reveals its seed
     await manager.broadcast(room_id, {
         "type": "claim_result",
         "player_id": player_id,
         "valid": is_valid,
-        "message": message
+        "message": message,
+        "fairness": fairness_info(room) if is_valid else None
     })
     
+    return response
+
+
+@app.get("/api/simulations")
+async def simulate_games(variant: str = "75", pattern: str = "horizontal_line", cards: int = 1, games: int = 10000):
+    """Monte Carlo game length and split-win odds, cached per parameter set"""
+    if cards < 1 or not 1 <= games <= settings.simulation_max_games:
+        raise HTTPException(status_code=400, detail=f"cards must be positive and games 1-{settings.simulation_max_games}")
+    if cards * games > settings.simulation_max_card_games:
+        raise HTTPException(status_code=400, detail=f"cards x games must not exceed {settings.simulation_max_card_games}")
+    
+    cache_key = f"simulation:{variant}:{pattern}:{cards}:{games}"
+    cached = await redis_client.get(cache_key)
+    if cached:
+        return json.loads(cached)
+    
+    # A fixed seed keeps cached and recomputed results identical
+    try:
+        result = await job_pool.run(GameSimulator.simulate, variant, pattern, cards, games, 0)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    await redis_client.set(cache_key, json.dumps(result), expire=settings.simulation_cache_ttl)
+    return result
+
+
+@app.post("/api/tournaments")
+async def create_tournament(
+    player_id: str,
+    name: str,
+    starts_at: datetime,
+    rooms: int = 10,
+    players_per_room: int = 10,
+    variant: str = "75",
+    pattern: str = "horizontal_line",
+    cards_per_player: int = 1,
+    draw_interval: int = 5,
+    db: Session = Depends(get_db_session)
+):
+    """Schedule a tournament; its first-round rooms are created now"""
+    if not 1 <= rooms <= settings.tournament_max_rooms:
+        raise HTTPException(status_code=400, detail=f"rooms must be 1-{settings.tournament_max_rooms}")
+    if not 2 <= players_per_room <= settings.max_players_per_room:
+        raise HTTPException(status_code=400, detail=f"players_per_room must be 2-{settings.max_players_per_room}")
+    
+    # Naive timestamps are UTC
+    if starts_at.tzinfo is not None:
+        starts_at = starts_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if starts_at <= datetime.utcnow():
+        raise HTTPException(status_code=400, detail="starts_at must be in the future")
+    
+    host = db.query(Player).filter(Player.id == player_id).first()
+    if not host:
+        raise HTTPException(status_code=404, detail="Player not found")
+    
+    tournament = TournamentScheduler.create(
+        db,
+        host_id=player_id,
+        name=name,
+        rooms=rooms,
+        starts_at=starts_at,
+        variant=variant,
+        pattern=pattern,
+        players_per_room=players_per_room,
+        cards_per_player=cards_per_player,
+        draw_interval=draw_interval
+    )
+    return tournament_info(db, tournament)
+
+
+@app.get("/api/tournaments/{tournament_id}")
+async def get_tournament(tournament_id: str, db: Session = Depends(get_db_session)):
+    """Tournament state and the rooms of its current round"""
+    tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return tournament_info(db, tournament)
+
+
+def tournament_info(db: Session, tournament: Tournament) -> Dict[str, Any]:
+    rooms = db.query(GameRoom.id, GameRoom.state, GameRoom.winners).filter(
+        GameRoom.tournament_id == tournament.id,
+        GameRoom.tournament_round == tournament.round
+    ).order_by(GameRoom.id).all()
     return {
-        "valid": is_valid,
-        "message": message,
-        "status": claim.status
+        "tournament_id": tournament.id,
+        "name": tournament.name,
+        "variant": tournament.variant,
+        "pattern": tournament.pattern,
+        "state": tournament.state,
+        "round": tournament.round,
+        "starts_at": tournament.starts_at.isoformat(),
+        "players_per_room": tournament.players_per_room,
+        "champions": tournament.champions,
+        "rooms": [
+            {"room_id": room.id, "state": room.state, "winners": [w["player_id"] for w in room.winners]}
+            for room in rooms
+        ]
     }
 
 
+@app.post("/api/tournaments/{tournament_id}/register")
+async def register_for_tournament(tournament_id: str, player_id: str, db: Session = Depends(get_db_session)):
+    """Seat a player in a first-round room and issue their cards ahead of the start"""
+    tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    
+    if tournament.state != "scheduled" or tournament.round != 1:
+        raise HTTPException(status_code=400, detail="Registration is closed")
+    
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    
+    room_id = TournamentScheduler.seat_of(db, tournament_id, 1, player_id)
+    if not room_id:
+        try:
+            room = await tournament_scheduler.register(db, tournament)
+        except TournamentFull:
+            raise HTTPException(status_code=409, detail="Tournament is full")
+        # The entry commits with the cards; a concurrent registration of the
+        # same player fails on its key and returns the first one's seat
+        db.add(TournamentEntry(tournament_id=tournament_id, player_id=player_id))
+        try:
+            await issue_cards(db, room, player_id)
+        except IntegrityError:
+            db.rollback()
+        room_id = TournamentScheduler.seat_of(db, tournament_id, 1, player_id)
+        if not room_id:
+            raise HTTPException(status_code=409, detail="Registration in progress, retry")
+    
+    room = db.query(GameRoom).filter(GameRoom.id == room_id).first()
+    cards = db.query(Card).filter(Card.room_id == room_id, Card.owner_id == player_id).all()
+    
+    return FastJSONResponse({
+        "message": "Registered",
+        "tournament_id": tournament_id,
+        "room_id": room.id,
+        "starts_at": tournament.starts_at.isoformat(),
+        "variant": room.variant,
+        "pattern": room.pattern.get("id"),
+        "shard": shard_router.owner(room.id) if shard_router.enabled else None,
+        "card_seed": room.card_seed,
+        "cards": [{"id": c.id, "serial": c.serial, "variant": c.variant} for c in cards]
+    })
+
+
+@app.get("/api/leaderboards/{board}")
+async def get_leaderboard(
+    board: str,
+    period: str = "daily",
+    at: str = None,
+    offset: int = 0,
+    limit: int = 50,
+    player_id: str = None,
+    db: Session = Depends(get_db_session)
+):
+    """A page of the wins, games or fastest board for a day, week or all time"""
+    if offset < 0 or not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit 1-100")
+    
+    try:
+        when = datetime.strptime(at, "%Y-%m-%d") if at else None
+        return await leaderboards.page(db, board, period, when, offset, limit, player_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def spectated_room_exists(room_id: str) -> bool:
+    """Rooms with events buffered here skip the database lookup"""
+    if room_id in spectators.feeds:
+        return True
+    # A short session of its own: a request-scoped one would stay checked
+    # out for as long as the stream or poll is open
+    with get_db() as db:
+        return db.query(GameRoom.id).filter(GameRoom.id == room_id).first() is not None
+
+
+@app.get("/api/rooms/{room_id}/events")
+async def spectate_room(
+    room_id: str,
+    request: Request,
+    last_seq: Optional[int] = None
+):
+    """Read-only Server-Sent Events stream of a room's events; resumes from Last-Event-ID"""
+    if not spectated_room_exists(room_id):
+        raise HTTPException(status_code=404, detail="Room not found")
+    if spectators.full:
+        raise HTTPException(status_code=503, detail="Too many spectators", headers={"Retry-After": "10"})
+    
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        last_seq = int(last_event_id)
+    return StreamingResponse(
+        spectators.stream(room_id, last_seq),
+        media_type="text/event-stream",
+        # Proxies must pass frames through as they come
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/rooms/{room_id}/events/poll")
+async def poll_room_events(
+    room_id: str,
+    last_seq: Optional[int] = None,
+    timeout: float = None
+):
+    """Long-poll fallback of the spectator stream: events after last_seq, waiting for one"""
+    if not spectated_room_exists(room_id):
+        raise HTTPException(status_code=404, detail="Room not found")
+    
+    timeout = min(timeout if timeout is not None else settings.spectator_poll_timeout, settings.spectator_poll_timeout)
+    body, cacheable = await spectators.poll(room_id, last_seq, max(timeout, 0))
+    # A non-empty answer never changes, so a proxy can serve it to every poller
+    cache_control = f"public, max-age={settings.spectator_cache_ttl}" if cacheable else "no-store"
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": cache_control})
+
+
 # WebSocket endpoint
 @app.websocket("/ws/{room_id}")
-async def websocket_endpoint(websocket: WebSocket, room_id: str):
-    """WebSocket connection for real-time updates"""
-    await manager.connect(websocket, room_id)
+async def websocket_endpoint(websocket: WebSocket, room_id: str, last_seq: Optional[int] = None):
+    """WebSocket connection for real-time updates; pass last_seq to resume"""
+    if not shard_router.is_local(room_id):
+        await websocket.accept()
+        await websocket.send_json({"type": "moved", "shard": shard_router.owner(room_id)})
+        await websocket.close(code=manager.MOVED)
+        return
+    
     try:
+        if not await manager.connect(websocket, room_id, last_seq):
+            return
         while True:
             data = await websocket.receive_json()
-            # Handle client messages if needed
+            manager.touch(websocket)
+            # Handle client messages if needed; a "pong" only needs the touch
             if data.get("type") == "ping":
                 await websocket.send_json({"type": "pong"})
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket, room_id)
 
 
 # Background task for auto-draw
+auto_draw_tasks: Dict[str, asyncio.Task] = {}
+
+
+def start_auto_draw(room_id: str):
+    """Run a room's auto-draw loop here unless it already runs"""
+    task = auto_draw_tasks.get(room_id)
+    if task is None or task.done():
+        auto_draw_tasks[room_id] = asyncio.create_task(auto_draw_task(room_id))
+
+
 async def auto_draw_task(room_id: str):
     """Background task to automatically draw numbers"""
-    while True:
-        try:
-            with get_db_session() as db:
-                room = next(db.query(GameRoom).filter(GameRoom.id == room_id).first())
+    try:
+        while True:
+            # Stop once the room moved to another shard or its lease was taken
+            if not shard_router.is_local(room_id) or not await shard_router.hold(room_id):
+                break
+            
+            with get_db() as db:
+                room = db.query(GameRoom).filter(GameRoom.id == room_id).first()
                 
                 if not room or room.state != "running":
                     break
                 
-                # Draw number
-                draw_pool = room.draw_pool
-                number = DrawEngine.draw_number(draw_pool)
-                
-                if number is None:
-                    break
-                
-                # Update room
-                called_numbers = room.called_numbers
-                called_numbers.append(number)
-                room.called_numbers = called_numbers
-                room.draw_pool = draw_pool
-                db.commit()
-                
-                # Broadcast
-                await manager.broadcast(room_id, {
-                    "type": "number_drawn",
-                    "number": number,
-                    "sequence": len(called_numbers)
-                })
+                draw_interval = room.draw_interval
+                finished = None
                 
-                # Wait for draw interval
-                await asyncio.sleep(room.draw_interval)
+                # Draw number
+                try:
+                    record = DrawStore.append(db, room)
+                except DrawConflict:
+                    # A manual draw won the race; try again next interval
+                    record = None
+                else:
+                    if record is None:
+                        finished = finish_drawn_out(db, room)
+            
+            if finished:
+                await manager.broadcast(room_id, finished)
+                break
+            
+            # Broadcast
+            if record:
+                await broadcast_draw(room_id, record)
+            
+            # Wait for draw interval
+            await asyncio.sleep(draw_interval)
+    
+    except Exception as e:
+        print(f"Error in auto_draw_task: {e}")
+    finally:
+        auto_draw_tasks.pop(room_id, None)
+        await shard_router.release(room_id)
+
+
+# Tournament rooms drawn by a tournament_draw_task in this process
+tournament_draw_rooms: Set[str] = set()
+
+
+async def drive_tournament_round(tournament_id: str, round_number: int, room_ids: List[str], draw_interval: int):
+    """Start hook: draw this shard's rooms of a running tournament round"""
+    local = [
+        room_id for room_id in room_ids
+        if shard_router.is_local(room_id) and room_id not in tournament_draw_rooms
+    ]
+    if local:
+        asyncio.create_task(tournament_draw_task(local, draw_interval))
+
+
+def draw_tournament_slot(room_ids: List[str]) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[str]]:
+    """One draw in each of a group of rooms; returns the draws and the rooms that are done"""
+    drawn, done = [], []
+    with get_db() as db:
+        for room in db.query(GameRoom).filter(GameRoom.id.in_(room_ids)).all():
+            if room.state != "running":
+                done.append(room.id)
+                continue
+            try:
+                record = DrawStore.append(db, room)
+            except DrawConflict:
+                continue  # Won by a claim or manual draw; the state is re-read next time
+            if record is None:
+                # Pool exhausted without a winner
+                RoomStore.transition(
+                    db, room, lambda current: {"state": "finished"} if current.state == "running" else {}
+                )
+                done.append(room.id)
+            else:
+                drawn.append((room.id, record))
+    return drawn, done
+
+
+async def tournament_draw_task(room_ids: List[str], draw_interval: int):
+    """
+    Draw for many tournament rooms from one task
+    Rooms are split into slots drawn at evenly spaced offsets within the draw
+    interval, so the round's DB writes and broadcasts are spread out instead
+    of every room drawing at the same instant.
+    """
+    tournament_draw_rooms.update(room_ids)
+    try:
+        # Announce in batches, letting other work run in between
+        batch = settings.tournament_broadcast_batch
+        for start in range(0, len(room_ids), batch):
+            for room_id in room_ids[start:start + batch]:
+                await manager.broadcast(room_id, {"type": "game_started", "room_id": room_id, "client_seed": None})
+                await publish_event("game_started", room_id)
+            await asyncio.sleep(0)
         
-        except Exception as e:
-            print(f"Error in auto_draw_task: {e}")
-            break
+        slots = TournamentScheduler.stagger(room_ids, settings.tournament_draw_slots)
+        tick = draw_interval / len(slots)
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        while any(slots):
+            for slot in slots:
+                await asyncio.sleep(max(next_at - loop.time(), 0))
+                next_at += tick
+                # Rooms handed to another shard are drawn there
+                for room_id in [room_id for room_id in slot if not shard_router.is_local(room_id)]:
+                    slot.remove(room_id)
+                    tournament_draw_rooms.discard(room_id)
+                if not slot:
+                    continue
+                
+                drawn, done = await asyncio.to_thread(draw_tournament_slot, slot)
+                for room_id, record in drawn:
+                    await broadcast_draw(room_id, record)
+                for room_id in done:
+                    slot.remove(room_id)
+                    tournament_draw_rooms.discard(room_id)
+    
+    except Exception as e:
+        print(f"Error in tournament_draw_task: {e}")
+    finally:
+        tournament_draw_rooms.difference_update(room_ids)
+
+
+def running_auto_draw_rooms() -> List[str]:
+    """Ids of running rooms drawn by the server"""
+    with get_db() as db:
+        rows = db.query(GameRoom.id).filter(GameRoom.state == "running", GameRoom.auto_draw == True).all()
+    return [row.id for row in rows]
+
+
+async def resume_auto_draws():
+    """Start the auto-draw loops of running rooms this shard owns"""
+    for room_id in await asyncio.to_thread(running_auto_draw_rooms):
+        if shard_router.is_local(room_id):
+            start_auto_draw(room_id)
+
+
+async def handoff_rooms():
+    """After a ring change, send away rooms this shard lost and adopt the ones it gained"""
+    for room_id in list(manager.active_connections):
+        if not shard_router.is_local(room_id):
+            await manager.move_room(room_id, shard_router.owner(room_id))
+    await resume_auto_draws()
+    tournament_scheduler.forget()
+    claim_guard.forget(shard_router.is_local)
 
 
 if __name__ == "__main__":
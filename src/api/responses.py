@@ -0,0 +1,20 @@
+"""
+JSON responses rendered by the project serializer
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from src.services.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson when it is installed
+    As the app's default response class it renders every endpoint; hot
+    endpoints return one directly, which also skips FastAPI's
+    jsonable_encoder pass over the payload.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
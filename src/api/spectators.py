@@ -0,0 +1,146 @@
+"""
+Read-only room event streams for spectators
+Server-Sent Events, with a long-poll fallback, served from events encoded
+once per room instead of a full WebSocket per viewer
+"""
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from src.services.serialization import dumps
+
+
+class RoomFeed:
+    """Encoded recent events of one room"""
+    
+    def __init__(self, size: int):
+        # (seq, JSON, SSE frame) of each event, oldest first
+        self.events: Deque[Tuple[int, bytes, bytes]] = deque(maxlen=size)
+        self.seq = 0
+        self.changed = asyncio.Event()
+        # Final message once the room closed or moved shard
+        self.closing: Optional[bytes] = None
+    
+    def after(self, last_seq: int) -> Optional[List[Tuple[int, bytes, bytes]]]:
+        """Events after last_seq, or None if some were already evicted"""
+        oldest = self.events[0][0] if self.events else self.seq + 1
+        if last_seq > self.seq or last_seq + 1 < oldest:
+            return None
+        return [event for event in self.events if event[0] > last_seq]
+    
+    def append(self, seq: int, data: bytes):
+        self.events.append((seq, data, b"id: %d\ndata: %s\n\n" % (seq, data)))
+        self.seq = seq
+        self.wake()
+    
+    def wake(self):
+        # Waiters hold the old event; a fresh one is armed for the next change
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class SpectatorHub:
+    """
+    Spectator fan-out
+    Every broadcast room event is serialized once, as JSON and as an SSE
+    frame, into a bounded per-room feed. Streams and long-polls only copy
+    those bytes out and park on one per-room event between broadcasts, so a
+    viewer costs an idle HTTP response instead of a WebSocket with its own
+    encoding, heartbeats and receive loop. Long-poll answers are a fixed
+    prefix of the room's history, so a reverse proxy may cache and collapse
+    them.
+    """
+    
+    def __init__(self, buffer_size: int = 256, max_streams: int = 10000, heartbeat_interval: int = 20):
+        self.buffer_size = buffer_size
+        self.max_streams = max_streams
+        self.heartbeat_interval = heartbeat_interval
+        self.feeds: Dict[str, RoomFeed] = {}
+        self.streams = 0
+    
+    @property
+    def full(self) -> bool:
+        return self.streams >= self.max_streams
+    
+    @staticmethod
+    def encode(message: Dict[str, Any]) -> bytes:
+        return dumps(message)
+    
+    def feed(self, room_id: str) -> RoomFeed:
+        if room_id not in self.feeds:
+            self.feeds[room_id] = RoomFeed(self.buffer_size)
+        return self.feeds[room_id]
+    
+    def publish(self, room_id: str, seq: int, data: bytes):
+        """Add a room event, already encoded by the broadcaster, to the room's feed"""
+        self.feed(room_id).append(seq, data)
+    
+    def close(self, room_id: str, final: Optional[Dict[str, Any]] = None):
+        """End a room's streams with a final message, e.g. where it moved"""
+        feed = self.feeds.pop(room_id, None)
+        if feed is not None:
+            feed.closing = self.encode(final or {"type": "closed"})
+            feed.wake()
+    
+    async def close_room(self, room_id: str):
+        """Purge hook for archived rooms"""
+        self.close(room_id)
+    
+    async def stream(self, room_id: str, last_seq: Optional[int] = None) -> AsyncIterator[bytes]:
+        """SSE body: missed events after last_seq, then live events until the room closes"""
+        self.streams += 1
+        try:
+            feed = self.feed(room_id)
+            yield b"retry: 2000\n\n"
+            if last_seq is None:
+                last_seq = feed.seq
+                yield b"data: %s\n\n" % self.encode({"type": "welcome", "seq": last_seq})
+            
+            while True:
+                changed = feed.changed
+                events = feed.after(last_seq)
+                if events is None:
+                    # Missed events are gone; the client reloads the room instead
+                    last_seq = feed.seq
+                    yield b"data: %s\n\n" % self.encode({"type": "resync", "seq": last_seq})
+                elif events:
+                    yield b"".join(frame for _, _, frame in events)
+                    last_seq = events[-1][0]
+                if feed.closing is not None:
+                    yield b"data: %s\n\n" % feed.closing
+                    return
+                
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from timing out an idle stream
+                    yield b": ping\n\n"
+        finally:
+            self.streams -= 1
+    
+    async def poll(self, room_id: str, last_seq: Optional[int], timeout: float) -> Tuple[bytes, bool]:
+        """
+        Long-poll body {"seq", "events"[, "resync"]} with the events after
+        last_seq, waiting up to `timeout` for one; also returns whether it
+        holds events, i.e. may be cached
+        """
+        feed = self.feed(room_id)
+        if last_seq is not None:
+            changed = feed.changed
+            events = feed.after(last_seq)
+            if events == [] and feed.closing is None:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                events = feed.after(last_seq)
+            if events is None:
+                return b'{"seq":%d,"resync":true,"events":[]}' % feed.seq, False
+        else:
+            events = []
+        
+        items = [data for _, data, _ in events]
+        if feed.closing is not None:
+            items.append(feed.closing)
+        seq = events[-1][0] if events else feed.seq if last_seq is None else last_seq
+        return b'{"seq":%d,"events":[%s]}' % (seq, b",".join(items)), bool(events)
@@ -0,0 +1,105 @@
+"""
+JSON Encoding Benchmark
+Times src.services.serialization against the previous encoding on room, join
+and broadcast payloads
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from src.services.game_service import CardGenerator
+from src.services.serialization import dumps, dumps_text, orjson
+
+
+def room_payload(players: int) -> Dict[str, Any]:
+    """A get_room response of a running room"""
+    return {
+        "id": "2f1c8a4e-0d7b-4c1e-9a53-6b0f3e2d1c7a",
+        "code": "7KQ2M9XD",
+        "host_id": "player-0",
+        "variant": "75",
+        "state": "running",
+        "pattern": {"id": "full_house", "variant": "75"},
+        "called_numbers": list(range(1, 41)),
+        "winners": [],
+        "players": [{"id": f"player-{n}", "name": f"Player {n}"} for n in range(players)],
+        "auto_draw": True,
+        "draw_interval": 5,
+        "card_seed": None,
+        "fairness": {"server_seed": None, "seed_commitment": None, "client_seed": None}
+    }
+
+
+def join_payload(cards: int) -> Dict[str, Any]:
+    """A join_room response with stored card grids"""
+    return {
+        "message": "Joined room successfully",
+        "room_id": "2f1c8a4e-0d7b-4c1e-9a53-6b0f3e2d1c7a",
+        "state": "lobby",
+        "variant": "75",
+        "pattern": "full_house",
+        "cards": [
+            {"id": f"card-{n}", "grid": grid}
+            for n, grid in enumerate(CardGenerator.generate_cards("75", cards))
+        ]
+    }
+
+
+def _time(encode: Callable[[Any], Any], payload: Any, rounds: int) -> float:
+    """Microseconds per encode"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        encode(payload)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def benchmark(players: int = 100, cards: int = 10, connections: int = 100, rounds: int = 1000) -> List[Dict[str, Any]]:
+    """
+    Microseconds to encode the API payloads the old way (FastAPI's
+    jsonable_encoder then json for responses when FastAPI is installed,
+    json per socket for broadcasts) and with this module
+    """
+    stdlib = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+    baseline = stdlib
+    try:
+        from fastapi.encoders import jsonable_encoder
+        baseline = lambda obj: stdlib(jsonable_encoder(obj))
+    except ImportError:
+        pass
+    
+    number_drawn = {"type": "number_drawn", "number": 17, "sequence": 12, "hash": "ab" * 32, "seq": 42}
+    cases = [
+        (f"get_room ({players} players)", room_payload(players), baseline, dumps, 1),
+        (f"join_room ({cards} cards)", join_payload(cards), baseline, dumps, 1),
+        # send_json on every socket, against one text frame shared by all
+        (f"broadcast ({connections} sockets)", number_drawn, stdlib, dumps_text, connections)
+    ]
+    results = []
+    for name, payload, before, after, per_broadcast in cases:
+        before_us = _time(before, payload, rounds) * per_broadcast
+        after_us = _time(after, payload, rounds)
+        results.append({
+            "payload": name,
+            "bytes": len(dumps(payload)),
+            "before_us": round(before_us, 1),
+            "after_us": round(after_us, 1),
+            "speedup": round(before_us / after_us, 1)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of API payloads")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--cards", type=int, default=10)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'json (orjson not installed)'}")
+    for row in benchmark(args.players, args.cards, args.connections, args.rounds):
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
 """
 Ethio Bingo Telegram Bot
 """
+import asyncio
+import hashlib
 import logging
+from typing import Any, Dict
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
 from src.core.config import settings
-from src.core.database import get_db
-from src.models import Player
-from sqlalchemy.orm import Session
+from src.core.redis import redis_client
+from src.services.player_registry import player_registry
 
 # Configure logging
 logging.basicConfig(
@@ -20,12 +22,36 @@ logger = logging.getLogger(__name__)
 class EthioBingoBot:
     """Main Telegram Bot class"""
     
+    # Only the update types our handlers consume
+    ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+    
+    # Path of the webhook route served by the FastAPI app
+    WEBHOOK_PATH = "/webhook"
+    
     def __init__(self):
         self.app = None
+        self._registry_task = None
+    
+    @property
+    def webhook_secret(self) -> str:
+        """Secret Telegram echoes in X-Telegram-Bot-Api-Secret-Token"""
+        if settings.telegram_webhook_secret:
+            return settings.telegram_webhook_secret
+        return hashlib.sha256(f"telegram-webhook:{settings.secret_key}".encode()).hexdigest()
     
-    def setup(self):
-        """Setup bot application"""
-        self.app = Application.builder().token(settings.telegram_bot_token).build()
+    def setup(self, webhook: bool = False):
+        """
+        Setup bot application
+        Updates are handled concurrently; in webhook mode there is no updater,
+        the FastAPI app feeds updates into the application's queue instead.
+        """
+        builder = Application.builder().token(settings.telegram_bot_token)
+        builder.concurrent_updates(settings.bot_concurrent_updates)
+        if webhook:
+            builder.updater(None)
+        else:
+            builder.post_init(self._post_init).post_shutdown(self._post_shutdown)
+        self.app = builder.build()
         
         # Register handlers
         self.app.add_handler(CommandHandler("start", self.start_command))
@@ -35,21 +61,30 @@ class EthioBingoBot:
         self.app.add_handler(CommandHandler("join", self.join_room_command))
         self.app.add_handler(CallbackQueryHandler(self.button_callback))
     
+    async def _post_init(self, application: Application):
+        """Polling mode: connect Redis and start background flushing"""
+        try:
+            await redis_client.connect()
+        except Exception as e:
+            logger.warning(f"Redis unavailable, player cache is in-process only: {e}")
+            redis_client.redis = None
+        self._registry_task = asyncio.create_task(player_registry.run())
+    
+    async def _post_shutdown(self, application: Application):
+        """Polling mode: flush queued registrations"""
+        self._registry_task.cancel()
+        await player_registry.flush()
+        await redis_client.close()
+    
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         user = update.effective_user
         
-        # Register or get player
-        with get_db() as db:
-            player = db.query(Player).filter(Player.telegram_id == str(user.id)).first()
-            if not player:
-                player = Player(
-                    telegram_id=str(user.id),
-                    display_name=user.full_name or user.username or f"Player{user.id}",
-                    avatar_url=None
-                )
-                db.add(player)
-                db.commit()
+        # Register player (cached; new players are upserted in batches)
+        await player_registry.ensure(
+            str(user.id),
+            user.full_name or user.username or f"Player{user.id}"
+        )
         
         welcome_text = f"""
 🎉 *Welcome to Ethio Bingo!* 🎉
@@ -117,9 +152,9 @@ Good luck! 🍀
         await update.message.reply_text(help_text, parse_mode='Markdown')
     
     async def play_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /play command - open mini app"""
-        # Create web app button
-        web_app_url = f"{settings.telegram_webhook_url}/app"
+        """Handle /play command - open mini app in quick play"""
+        # Create web app button; the app seats the player in a public lobby
+        web_app_url = f"{settings.telegram_webhook_url}/app?action=quick"
         
         keyboard = [
             [InlineKeyboardButton(
@@ -206,7 +241,36 @@ Good luck! 🍀
     def run(self):
         """Run the bot"""
         logger.info("Starting Ethio Bingo Bot...")
-        self.app.run_polling(allowed_updates=Update.ALL_TYPES)
+        self.app.run_polling(allowed_updates=self.ALLOWED_UPDATES)
+    
+    async def start_webhook(self):
+        """Start processing webhook updates and register the webhook"""
+        await self.app.initialize()
+        await self.app.start()
+        self._registry_task = asyncio.create_task(player_registry.run())
+        
+        webhook_url = f"{settings.telegram_webhook_url.rstrip('/')}{self.WEBHOOK_PATH}"
+        # Every API worker starts the bot; only the first needs to register
+        info = await self.app.bot.get_webhook_info()
+        if info.url != webhook_url or set(info.allowed_updates or []) != set(self.ALLOWED_UPDATES):
+            await self.app.bot.set_webhook(
+                url=webhook_url,
+                allowed_updates=self.ALLOWED_UPDATES,
+                secret_token=self.webhook_secret,
+                max_connections=settings.bot_webhook_max_connections
+            )
+            logger.info(f"Webhook set to {webhook_url}")
+    
+    async def process_webhook_update(self, data: Dict[str, Any]):
+        """Queue a webhook update; handlers run concurrently in the application"""
+        await self.app.update_queue.put(Update.de_json(data, self.app.bot))
+    
+    async def stop_webhook(self):
+        """Stop processing webhook updates"""
+        await self.app.stop()
+        await self.app.shutdown()
+        self._registry_task.cancel()
+        await player_registry.flush()
 
 
 # Create bot instance
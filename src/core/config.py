@@ -11,9 +11,23 @@ class Settings(BaseSettings):
     # Telegram Bot
     telegram_bot_token: str
     telegram_webhook_url: Optional[str] = None
+    telegram_webhook_secret: Optional[str] = None  # Derived from secret_key if unset
+    bot_mode: str = "polling"  # polling, or webhook (served by the API workers)
+    bot_concurrent_updates: int = 64  # Updates handled in parallel per process
+    bot_webhook_max_connections: int = 40
+    player_cache_size: int = 50000  # Known players remembered per process
+    player_flush_batch_size: int = 200  # New players upserted per batch
+    player_flush_interval: float = 1.0  # Max seconds a new player waits to be written
+    
+    # Notifications (Telegram allows ~30 messages/s overall and 1/s per chat)
+    notify_global_rate: float = 25.0
+    notify_chat_rate: float = 1.0
+    notify_max_retries: int = 5
+    notify_batch_size: int = 100
     
     # Database
     database_url: str
+    partition_tables: bool = False  # PostgreSQL: range-partition cards/claims by month (migration 0004)
     
     # Redis
     redis_host: str = "localhost"
@@ -30,6 +44,43 @@ class Settings(BaseSettings):
     max_players_per_room: int = 100
     default_draw_interval: int = 5
     auto_mark_enabled: bool = True
+    card_series_seed: Optional[str] = None  # Shared seed for derived cards; per-room if unset
+    job_workers: int = 2  # Processes for CPU-heavy jobs (bulk cards, audit replays)
+    job_queue_size: int = 64  # Jobs queued or running before new ones are refused
+    job_timeout: float = 10.0  # Seconds before a job is abandoned
+    job_min_cards: int = 10  # Card batches smaller than this are generated inline
+    room_cas_retries: int = 3  # Re-reads of a room after a lost compare-and-swap before answering 409
+    lobby_target_players: int = 10  # Players a quick-play lobby waits for before it starts
+    leaderboard_snapshot_interval: int = 300  # Seconds between leaderboard snapshots to the database
+    leaderboard_snapshot_size: int = 1000  # Top entries of each board kept in snapshots
+    room_code_cache_size: int = 10000  # Room codes resolved from memory per API process
+    card_payload_cache_size: int = 10000  # Encoded derived cards kept per API process
+    quick_play_attempts: int = 3  # Listed lobbies tried before quick play opens a new one
+    claim_rate: float = 1.0  # Claims per second a player may make once their burst is spent
+    claim_burst: int = 5  # Claims a player may make back to back
+    claim_cache_size: int = 10000  # Claim answers kept per API process, replayed until the next draw
+    claim_flush_interval: int = 5  # Seconds between writes of aggregated rejected claims
+    tournament_max_rooms: int = 1000  # Rooms per tournament round
+    tournament_round_break: int = 60  # Seconds between the end of a round and the start of the next
+    tournament_poll_interval: float = 1.0  # Seconds between tournament scheduler passes
+    tournament_draw_slots: int = 10  # Groups a round's rooms are drawn in, spread over the draw interval
+    tournament_broadcast_batch: int = 50  # Rooms announced per event loop turn when a round starts
+    simulation_max_games: int = 1_000_000  # Cap on games per simulation request
+    simulation_max_card_games: int = 10_000_000  # Cap on cards x games per simulation request
+    simulation_cache_ttl: int = 86400  # Seconds simulation results stay cached
+    ws_replay_buffer_size: int = 256  # Recent events per room replayed to resuming WebSockets
+    ws_heartbeat_interval: int = 20  # Seconds of silence before the server pings a WebSocket
+    ws_idle_timeout: int = 60  # Seconds of silence before a WebSocket is closed
+    ws_max_connections: int = 10000  # WebSockets per API process; per room the cap is max_players_per_room
+    spectator_max_streams: int = 10000  # Spectator SSE streams per API process
+    spectator_poll_timeout: int = 25  # Seconds a spectator long-poll waits for an event
+    spectator_cache_ttl: int = 30  # Seconds proxies may cache a non-empty spectator long-poll answer
+    
+    # Room Archival
+    archive_dir: str = "archive"
+    room_finished_ttl: int = 3600  # Seconds a finished room stays in the hot tables
+    room_lobby_ttl: int = 86400  # Seconds before an unstarted lobby is archived
+    archive_interval: int = 300  # Seconds between archiver runs
     
     # Security
     jwt_secret_key: str
@@ -40,6 +91,9 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     workers: int = 4
+    shard_id: int = 0  # This API process's shard
+    shard_count: int = 1  # API shards; rooms are consistent-hashed across them
+    shard_node_ttl: int = 15  # Seconds without a heartbeat before a shard leaves the ring
     
     class Config:
         env_file = ".env"
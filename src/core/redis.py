@@ -2,7 +2,7 @@
 Redis connection and utilities
 """
 import redis.asyncio as redis
-from typing import Optional
+from typing import Any, Optional, Dict, List, Tuple
 from src.core.config import settings
 
 
@@ -51,6 +51,12 @@ class RedisClient:
             return await self.redis.get(key)
         return None
     
+    async def incr(self, key: str) -> Optional[int]:
+        """Increment a counter; None without Redis"""
+        if self.redis:
+            return await self.redis.incr(key)
+        return None
+    
     async def delete(self, key: str):
         """Delete key"""
         if self.redis:
@@ -61,6 +67,127 @@ class RedisClient:
         if self.redis:
             return await self.redis.exists(key) > 0
         return False
+    
+    async def set_many(self, mapping: Dict[str, str], expire: Optional[int] = None):
+        """Set several key-values in one round trip"""
+        if self.redis and mapping:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=expire)
+                await pipe.execute()
+    
+    async def rpush(self, key: str, *values: str) -> int:
+        """Append values to a list, returning the new length"""
+        if self.redis:
+            return await self.redis.rpush(key, *values)
+        return 0
+    
+    async def blpop(self, key: str, timeout: int = 0) -> Optional[str]:
+        """Pop the first list item, waiting up to `timeout` seconds"""
+        if self.redis:
+            item = await self.redis.blpop([key], timeout=timeout)
+            return item[1] if item else None
+        return None
+    
+    async def lpop_many(self, key: str, count: int) -> List[str]:
+        """Pop up to `count` items from the head of a list"""
+        if self.redis:
+            return await self.redis.lpop(key, count) or []
+        return []
+    
+    async def set_nx(self, key: str, value: str, expire: Optional[int] = None) -> bool:
+        """Set a key only if it does not exist; returns whether it was set"""
+        if self.redis:
+            return bool(await self.redis.set(key, value, ex=expire, nx=True))
+        return False
+    
+    async def expire_if_equal(self, key: str, value: str, expire: int) -> bool:
+        """Refresh a key's TTL only while it still holds `value`"""
+        if self.redis:
+            script = (
+                "if redis.call('get', KEYS[1]) == ARGV[1] then "
+                "return redis.call('expire', KEYS[1], ARGV[2]) else return 0 end"
+            )
+            return bool(await self.redis.eval(script, 1, key, value, expire))
+        return False
+    
+    async def delete_if_equal(self, key: str, value: str):
+        """Delete a key only while it still holds `value`"""
+        if self.redis:
+            script = (
+                "if redis.call('get', KEYS[1]) == ARGV[1] then "
+                "return redis.call('del', KEYS[1]) else return 0 end"
+            )
+            await self.redis.eval(script, 1, key, value)
+    
+    async def zadd(self, key: str, mapping: Dict[str, float], nx: bool = False):
+        """Add or update sorted set members; with nx only add new ones"""
+        if self.redis:
+            await self.redis.zadd(key, mapping, nx=nx)
+    
+    async def zrem(self, key: str, *members: str):
+        """Remove sorted set members"""
+        if self.redis:
+            await self.redis.zrem(key, *members)
+    
+    async def zrangebyscore(self, key: str, min_score: float, max_score: float) -> List[str]:
+        """Sorted set members with scores in [min_score, max_score]"""
+        if self.redis:
+            return await self.redis.zrangebyscore(key, min_score, max_score)
+        return []
+    
+    async def zincrby_many(self, keys: Dict[str, Optional[int]], members: List[str], amount: float = 1.0):
+        """Increment members in several sorted sets in one round trip; `keys` maps key -> TTL"""
+        if self.redis:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, expire in keys.items():
+                    for member in members:
+                        pipe.zincrby(key, amount, member)
+                    if expire:
+                        pipe.expire(key, expire)
+                await pipe.execute()
+    
+    async def zadd_lower_many(self, keys: Dict[str, Optional[int]], mapping: Dict[str, float]):
+        """Add members to several sorted sets, only ever lowering existing scores"""
+        if self.redis:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, expire in keys.items():
+                    pipe.zadd(key, mapping, lt=True)
+                    if expire:
+                        pipe.expire(key, expire)
+                await pipe.execute()
+    
+    async def zrange_page(self, key: str, start: int, stop: int, desc: bool = False) -> List[Tuple[str, float]]:
+        """(member, score) pairs ranked start..stop inclusive"""
+        if self.redis:
+            return await self.redis.zrange(key, start, stop, desc=desc, withscores=True)
+        return []
+    
+    async def zcard(self, key: str) -> int:
+        """Number of sorted set members"""
+        if self.redis:
+            return await self.redis.zcard(key)
+        return 0
+    
+    async def zrank(self, key: str, member: str, desc: bool = False) -> Optional[int]:
+        """0-based rank of a member, if present"""
+        if self.redis:
+            if desc:
+                return await self.redis.zrevrank(key, member)
+            return await self.redis.zrank(key, member)
+        return None
+    
+    async def zscore(self, key: str, member: str) -> Optional[float]:
+        """Score of a member, if present"""
+        if self.redis:
+            return await self.redis.zscore(key, member)
+        return None
+    
+    async def eval(self, script: str, keys: List[str], args: List[Any]) -> Any:
+        """Run a Lua script atomically"""
+        if self.redis:
+            return await self.redis.eval(script, len(keys), *keys, *args)
+        return None
 
 
 # Global Redis client instance
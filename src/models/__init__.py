@@ -1,4 +1,4 @@
 """Models package initialization"""
-from .database import Base, Player, GameRoom, Card, DrawLog, Claim
+from .database import Base, Player, GameRoom, Card, Draw, Claim, ClaimRejection, LeaderboardSnapshot, Tournament, TournamentEntry
 
-__all__ = ["Base", "Player", "GameRoom", "Card", "DrawLog", "Claim"]
+__all__ = ["Base", "Player", "GameRoom", "Card", "Draw", "Claim", "ClaimRejection", "LeaderboardSnapshot", "Tournament", "TournamentEntry"]
@@ -1,7 +1,7 @@
 """
 Database Models for Ethio Bingo
 """
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, JSON, ForeignKey, Float
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, JSON, ForeignKey, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -33,8 +33,17 @@ class Player(Base):
 class GameRoom(Base):
     """Game room/session model"""
     __tablename__ = "game_rooms"
+    __table_args__ = (
+        # Lobby listings and the archiver filter on state, then age
+        Index("ix_game_rooms_state_updated_at", "state", "updated_at"),
+        # Joins by room code
+        Index("ix_game_rooms_code", "code", unique=True),
+        # Rooms of one tournament round
+        Index("ix_game_rooms_tournament_id_round", "tournament_id", "tournament_round"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
+    code = Column(String, nullable=True)  # Short code players type to join
     host_id = Column(String, ForeignKey("players.id"), nullable=False)
     variant = Column(String, nullable=False, default="75")  # 75-ball or 90-ball
     number_range_min = Column(Integer, nullable=False, default=1)
@@ -42,29 +51,77 @@ class GameRoom(Base):
     cards_per_player = Column(Integer, nullable=False, default=1)
     pattern = Column(JSON, nullable=False)  # Pattern configuration
     state = Column(String, nullable=False, default="lobby")  # lobby, running, verifying, finished
-    called_numbers = Column(JSON, nullable=False, default=list)
-    draw_pool = Column(JSON, nullable=False, default=list)
+    draw_pool = Column(JSON, nullable=False, default=list)  # Full draw order; draw N is draw_pool[N - 1]
+    draw_seed = Column(String, nullable=True)  # Seed of the draw pool shuffle
+    seed_commitment = Column(String, nullable=True)  # sha256(draw_seed), published for commit-reveal rooms
+    client_seed = Column(String, nullable=True)  # Public seed mixed into commit-reveal shuffles
     winners = Column(JSON, nullable=False, default=list)
     draw_interval = Column(Integer, nullable=False, default=5)  # seconds
     auto_draw = Column(Boolean, nullable=False, default=True)
+    public = Column(Boolean, nullable=False, default=False)  # Listed in the lobby index for quick play
+    target_players = Column(Integer, nullable=True)  # Auto-start once this many players joined
+    card_seed = Column(String, nullable=True)  # Set when cards are derived from (seed, serial)
+    cards_issued = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=1)  # Bumped by every state transition (compare-and-swap guard)
+    tournament_id = Column(String, ForeignKey("tournaments.id"), nullable=True)
+    tournament_round = Column(Integer, nullable=True)  # 1-based round within the tournament
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     host = relationship("Player", back_populates="rooms_created")
+    tournament = relationship("Tournament", back_populates="rooms")
     cards = relationship("Card", back_populates="room")
-    draw_logs = relationship("DrawLog", back_populates="room")
+    draws = relationship("Draw", back_populates="room", order_by="Draw.seq")
+
+
+class Tournament(Base):
+    """Rounds of rooms started together at scheduled times"""
+    __tablename__ = "tournaments"
+    
+    id = Column(String, primary_key=True, default=generate_uuid)
+    name = Column(String, nullable=False)
+    host_id = Column(String, ForeignKey("players.id"), nullable=False)
+    variant = Column(String, nullable=False, default="75")
+    pattern = Column(String, nullable=False, default="horizontal_line")
+    cards_per_player = Column(Integer, nullable=False, default=1)
+    players_per_room = Column(Integer, nullable=False, default=10)
+    draw_interval = Column(Integer, nullable=False, default=5)  # seconds
+    state = Column(String, nullable=False, default="scheduled")  # scheduled, running, finished
+    round = Column(Integer, nullable=False, default=1)  # Current round
+    starts_at = Column(DateTime, nullable=False)  # Start of the current round
+    champions = Column(JSON, nullable=False, default=list)  # Player ids left after the final round
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    rooms = relationship("GameRoom", back_populates="tournament")
+
+
+class TournamentEntry(Base):
+    """A player's registration; the key admits each player once per tournament"""
+    __tablename__ = "tournament_entries"
+    
+    tournament_id = Column(String, ForeignKey("tournaments.id"), primary_key=True)
+    player_id = Column(String, ForeignKey("players.id"), primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 
 class Card(Base):
     """Bingo card model"""
     __tablename__ = "cards"
+    __table_args__ = (
+        # Room rosters (get_room) and a player's cards within a room
+        Index("ix_cards_room_id_owner_id", "room_id", "owner_id"),
+        Index("ix_cards_owner_id", "owner_id"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     room_id = Column(String, ForeignKey("game_rooms.id"), nullable=False)
     owner_id = Column(String, ForeignKey("players.id"), nullable=False)
     variant = Column(String, nullable=False)
-    grid = Column(JSON, nullable=False)  # 2D array of cells
+    serial = Column(Integer, nullable=True)  # Serial within the room's card series
+    grid = Column(JSON, nullable=True)  # 2D array of cells, NULL for derived cards
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -72,24 +129,29 @@ class Card(Base):
     room = relationship("GameRoom", back_populates="cards")
 
 
-class DrawLog(Base):
-    """Draw audit log model"""
-    __tablename__ = "draw_logs"
+class Draw(Base):
+    """One drawn number; append-only source of truth for a room's calls"""
+    __tablename__ = "draws"
     
-    id = Column(String, primary_key=True, default=generate_uuid)
-    room_id = Column(String, ForeignKey("game_rooms.id"), nullable=False)
-    sequence = Column(JSON, nullable=False)  # List of draw records
-    seed = Column(String, nullable=False)
-    final_hash = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # The (room_id, seq) key rejects a second draw of the same sequence, and
+    # a room's history is a range scan over it
+    room_id = Column(String, ForeignKey("game_rooms.id"), primary_key=True)
+    seq = Column(Integer, primary_key=True, autoincrement=False)  # 1-based
+    number = Column(Integer, nullable=False)
+    drawn_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    chain_hash = Column(String, nullable=False)  # sha256(previous hash:seq:number)
     
     # Relationships
-    room = relationship("GameRoom", back_populates="draw_logs")
+    room = relationship("GameRoom", back_populates="draws")
 
 
 class Claim(Base):
     """Bingo claim model"""
     __tablename__ = "claims"
+    __table_args__ = (
+        # Claims of a room, and of one card within a room
+        Index("ix_claims_room_id_card_id", "room_id", "card_id"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     room_id = Column(String, ForeignKey("game_rooms.id"), nullable=False)
@@ -100,3 +162,29 @@ class Claim(Base):
     verification_message = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     verified_at = Column(DateTime, nullable=True)
+
+
+class ClaimRejection(Base):
+    """Rejected claims of a player on one card, counted instead of stored one by one"""
+    __tablename__ = "claim_rejections"
+    
+    room_id = Column(String, ForeignKey("game_rooms.id"), primary_key=True)
+    player_id = Column(String, ForeignKey("players.id"), primary_key=True)
+    # No foreign key: partitioned cards (migration 0004) have no unique id
+    card_id = Column(String, primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_message = Column(String, nullable=True)
+    first_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class LeaderboardSnapshot(Base):
+    """Periodic copy of a Redis leaderboard; outlives the expiring live boards"""
+    __tablename__ = "leaderboard_snapshots"
+    
+    board = Column(String, primary_key=True)  # wins, games, fastest
+    period = Column(String, primary_key=True)  # daily:2024-01-31, weekly:2024-W05, all
+    rank = Column(Integer, primary_key=True, autoincrement=False)  # 1-based
+    player_id = Column(String, ForeignKey("players.id"), nullable=False)
+    score = Column(Float, nullable=False)
+    taken_at = Column(DateTime, nullable=False, default=datetime.utcnow)
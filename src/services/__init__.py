@@ -1,4 +1,6 @@
 """Services package initialization"""
 from .game_service import CardGenerator, DrawEngine, PatternVerifier
+from .rate_limit import TokenBucket, KeyedTokenBuckets
+from .hash_ring import HashRing
 
-__all__ = ["CardGenerator", "DrawEngine", "PatternVerifier"]
+__all__ = ["CardGenerator", "DrawEngine", "PatternVerifier", "TokenBucket", "KeyedTokenBuckets", "HashRing"]
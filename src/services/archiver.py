@@ -0,0 +1,163 @@
+"""
+Room Archiver
+Moves finished rooms out of the hot tables into compressed archive files
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import or_, and_
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.core.redis import redis_client
+from src.models import GameRoom, Card, Claim, ClaimRejection, Draw
+
+logger = logging.getLogger(__name__)
+
+
+def row_to_dict(row) -> Dict[str, Any]:
+    """Serialize a model row to JSON-compatible values"""
+    data = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.name)
+        data[column.name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+class RoomArchiver:
+    """
+    Background garbage collector for game rooms
+    Finished rooms (and lobbies nobody started) are appended, together with
+    their cards, claims and draw logs, to a gzip JSON-lines file per creation
+    date, then deleted from the database. Purge hooks drop the per-room
+    in-memory and Redis state. Archive files are written before rows are
+    deleted, so a crash in between can leave a duplicate record; readers
+    should keep the last record per room id.
+    """
+    
+    # Per-room Redis keys dropped when a room is archived
+    REDIS_KEYS = ["room:lease:{room_id}", "lobby:seated:{room_id}"]
+    
+    def __init__(
+        self,
+        archive_dir: str = "archive",
+        finished_ttl: int = 3600,
+        lobby_ttl: int = 86400,
+        interval: int = 300,
+        batch_size: int = 100
+    ):
+        self.archive_dir = archive_dir
+        self.finished_ttl = finished_ttl
+        self.lobby_ttl = lobby_ttl
+        self.interval = interval
+        self.batch_size = batch_size
+        self._purge_hooks: List[Callable[[str], Awaitable[None]]] = []
+    
+    def add_purge_hook(self, hook: Callable[[str], Awaitable[None]]):
+        """Register a coroutine called with the id of every archived room"""
+        self._purge_hooks.append(hook)
+    
+    def archive_path(self, created_at: datetime) -> str:
+        """Date-partitioned archive file for rooms created on a given day"""
+        return os.path.join(
+            self.archive_dir,
+            created_at.strftime("%Y"),
+            created_at.strftime("%m"),
+            # One file per process so concurrent workers never interleave appends
+            f"rooms-{created_at.strftime('%Y-%m-%d')}-{os.getpid()}.jsonl.gz"
+        )
+    
+    def _archive_batch(self) -> List[str]:
+        """
+        Archive and delete one batch of expired rooms; returns their ids
+        Rows are locked with SKIP LOCKED so workers archive disjoint batches.
+        """
+        now = datetime.utcnow()
+        finished_cutoff = now - timedelta(seconds=self.finished_ttl)
+        lobby_cutoff = now - timedelta(seconds=self.lobby_ttl)
+        
+        with get_db() as db:
+            rooms = db.query(GameRoom).filter(or_(
+                and_(GameRoom.state == "finished", GameRoom.updated_at < finished_cutoff),
+                # Tournament lobbies wait for their scheduled start instead
+                and_(GameRoom.state == "lobby", GameRoom.updated_at < lobby_cutoff, GameRoom.tournament_id.is_(None))
+            )).limit(self.batch_size).with_for_update(skip_locked=True).all()
+            if not rooms:
+                return []
+            
+            room_ids = [room.id for room in rooms]
+            cards = db.query(Card).filter(Card.room_id.in_(room_ids)).all()
+            claims = db.query(Claim).filter(Claim.room_id.in_(room_ids)).all()
+            rejections = db.query(ClaimRejection).filter(ClaimRejection.room_id.in_(room_ids)).all()
+            draws = db.query(Draw).filter(Draw.room_id.in_(room_ids)).order_by(Draw.room_id, Draw.seq).all()
+            
+            records: Dict[str, Dict[str, Any]] = {
+                room.id: {"room": row_to_dict(room), "cards": [], "claims": [], "rejections": [], "draws": []}
+                for room in rooms
+            }
+            for key, rows in (("cards", cards), ("claims", claims), ("rejections", rejections), ("draws", draws)):
+                for row in rows:
+                    records[row.room_id][key].append(row_to_dict(row))
+            
+            # Group by partition; each write appends one gzip member
+            partitions: Dict[str, List[str]] = {}
+            for room in rooms:
+                line = json.dumps(records[room.id], separators=(",", ":"))
+                partitions.setdefault(self.archive_path(room.created_at or now), []).append(line)
+            for path, lines in partitions.items():
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with gzip.open(path, "at", encoding="utf-8") as archive:
+                    archive.write("\n".join(lines) + "\n")
+            
+            # Children first to satisfy foreign keys
+            for model in (Claim, ClaimRejection, Card, Draw):
+                db.query(model).filter(model.room_id.in_(room_ids)).delete(synchronize_session=False)
+            db.query(GameRoom).filter(GameRoom.id.in_(room_ids)).delete(synchronize_session=False)
+        
+        return room_ids
+    
+    async def purge(self, room_id: str):
+        """Drop in-memory and Redis state of an archived room"""
+        for hook in self._purge_hooks:
+            try:
+                await hook(room_id)
+            except Exception as e:
+                logger.error(f"Purge hook failed for room {room_id}: {e}")
+        for key in self.REDIS_KEYS:
+            await redis_client.delete(key.format(room_id=room_id))
+    
+    async def run_once(self) -> int:
+        """Archive every expired room; returns the number archived"""
+        archived = 0
+        while True:
+            room_ids = await asyncio.to_thread(self._archive_batch)
+            for room_id in room_ids:
+                await self.purge(room_id)
+            archived += len(room_ids)
+            if len(room_ids) < self.batch_size:
+                return archived
+    
+    async def run(self):
+        """Background archive loop"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                archived = await self.run_once()
+                if archived:
+                    logger.info(f"Archived {archived} rooms")
+            except Exception as e:
+                logger.error(f"Room archiver failed: {e}")
+
+
+# Global archiver instance
+room_archiver = RoomArchiver(
+    archive_dir=settings.archive_dir,
+    finished_ttl=settings.room_finished_ttl,
+    lobby_ttl=settings.room_lobby_ttl,
+    interval=settings.archive_interval
+)
@@ -0,0 +1,182 @@
+"""
+Claim Guard
+Rate limiting, dedupe and aggregated rejections for bingo claims
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.models import Card, ClaimRejection
+from src.services.rate_limit import KeyedTokenBuckets
+
+logger = logging.getLogger(__name__)
+
+# (room_id, player_id, card_id)
+RejectionKey = Tuple[str, str, str]
+
+
+class ClaimGuard:
+    """
+    Cheap answers to repeated claims
+    A claim's verdict only depends on the card and the numbers called so far,
+    so the answer for a (card, draw sequence) is kept and replayed until the
+    room's next draw without touching the database. Each player has a token
+    bucket, and rejected claims are counted per (room, player, card) and
+    written in periodic batches instead of as one Claim row per attempt.
+    Room requests are served by the room's shard, so all of this is kept per
+    process.
+    """
+    
+    def __init__(self, rate: float = 1.0, burst: int = 5, cache_size: int = 10000, flush_interval: int = 5,
+                 clock: Callable[[], datetime] = datetime.utcnow):
+        self.buckets = KeyedTokenBuckets(rate, burst)
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        # Latest draw sequence seen per room
+        self.draw_seqs: Dict[str, int] = {}
+        # (card_id, draw seq) -> (player_id, response), least recently used first
+        self.results: "OrderedDict[Tuple[str, int], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        # Rejections not yet written: [attempts, last message, first at, last at]
+        self.pending: Dict[RejectionKey, List[Any]] = {}
+    
+    def throttle(self, player_id: str) -> float:
+        """0 if the player may claim now, otherwise the seconds to wait"""
+        return self.buckets.get(player_id).try_acquire()
+    
+    def drawn(self, room_id: str, seq: int):
+        """Note a room's latest draw; answers from earlier draws go stale"""
+        if seq > self.draw_seqs.get(room_id, 0):
+            self.draw_seqs[room_id] = seq
+    
+    def replay(self, room_id: str, card_id: str, player_id: str) -> Optional[Dict[str, Any]]:
+        """The answer already given to this claim since the last draw, if any"""
+        key = (card_id, self.draw_seqs.get(room_id, -1))
+        entry = self.results.get(key)
+        if entry is None or entry[0] != player_id:
+            return None
+        self.results.move_to_end(key)
+        response = entry[1]
+        if not response["valid"]:
+            self.reject(room_id, player_id, card_id, response["message"])
+        return response
+    
+    def remember(self, room_id: str, card_id: str, player_id: str, seq: int, response: Dict[str, Any]):
+        """Keep the answer to a claim verified against `seq` draws"""
+        self.drawn(room_id, seq)
+        self.results[(card_id, seq)] = (player_id, response)
+        self.results.move_to_end((card_id, seq))
+        while len(self.results) > self.cache_size:
+            self.results.popitem(last=False)
+    
+    def reject(self, room_id: str, player_id: str, card_id: str, message: str):
+        """Count a rejected claim"""
+        now = self.clock()
+        entry = self.pending.get((room_id, player_id, card_id))
+        if entry is None:
+            self.pending[(room_id, player_id, card_id)] = [1, message, now, now]
+        else:
+            entry[0] += 1
+            entry[1] = message
+            entry[3] = now
+    
+    def forget(self, keep: Callable[[str], bool]):
+        """Drop draw sequences of rooms no longer served here, e.g. after a shard handoff"""
+        self.draw_seqs = {room_id: seq for room_id, seq in self.draw_seqs.items() if keep(room_id)}
+    
+    async def close_room(self, room_id: str):
+        """Purge hook for archived rooms; their unwritten rejections go too"""
+        self.draw_seqs.pop(room_id, None)
+        self.pending = {key: entry for key, entry in self.pending.items() if key[0] != room_id}
+    
+    @staticmethod
+    def _add(db: Session, key: RejectionKey, entry: List[Any]):
+        """Add one key's counted rejections to its row"""
+        room_id, player_id, card_id = key
+        attempts, message, first_at, last_at = entry
+        updated = db.query(ClaimRejection).filter(
+            ClaimRejection.room_id == room_id,
+            ClaimRejection.player_id == player_id,
+            ClaimRejection.card_id == card_id
+        ).update({
+            ClaimRejection.attempts: ClaimRejection.attempts + attempts,
+            ClaimRejection.last_message: message,
+            ClaimRejection.last_at: last_at
+        }, synchronize_session=False)
+        if not updated:
+            db.add(ClaimRejection(
+                room_id=room_id,
+                player_id=player_id,
+                card_id=card_id,
+                attempts=attempts,
+                last_message=message,
+                first_at=first_at,
+                last_at=last_at
+            ))
+    
+    @staticmethod
+    def _store(batch: Dict[RejectionKey, List[Any]]) -> int:
+        """
+        Write a batch in one transaction; if a key's room or player is gone,
+        fall back to one transaction per key and skip the bad ones. Cards
+        have no foreign key here (see migration 0011), so keys whose card is
+        gone are skipped up front. Returns the keys written.
+        """
+        with get_db() as db:
+            card_ids = {card_id for _, _, card_id in batch}
+            found = {card_id for card_id, in db.query(Card.id).filter(Card.id.in_(card_ids))}
+            for key in [key for key in batch if key[2] not in found]:
+                logger.warning(f"Dropped {batch.pop(key)[0]} rejected claims of {key}: card is gone")
+            if not batch:
+                return 0
+            
+            try:
+                for key, entry in batch.items():
+                    ClaimGuard._add(db, key, entry)
+                db.commit()
+                return len(batch)
+            except IntegrityError:
+                db.rollback()
+            
+            written = 0
+            for key, entry in batch.items():
+                try:
+                    ClaimGuard._add(db, key, entry)
+                    db.commit()
+                    written += 1
+                except IntegrityError:
+                    db.rollback()
+                    logger.warning(f"Dropped {entry[0]} rejected claims of {key}: room or player is gone")
+            return written
+    
+    async def flush(self) -> int:
+        """Write pending rejections; returns the rows touched"""
+        batch, self.pending = self.pending, {}
+        if not batch:
+            return 0
+        return await asyncio.to_thread(self._store, batch)
+    
+    async def run(self):
+        """Background flush loop"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Claim rejection flush failed: {e}")
+
+
+# Global claim guard instance
+claim_guard = ClaimGuard(
+    rate=settings.claim_rate,
+    burst=settings.claim_burst,
+    cache_size=settings.claim_cache_size,
+    flush_interval=settings.claim_flush_interval
+)
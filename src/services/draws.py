@@ -0,0 +1,80 @@
+"""
+Draw Store
+Each draw is one INSERT into the append-only draws table
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models import Draw, GameRoom
+from src.services.game_service import DrawEngine
+
+
+class DrawConflict(Exception):
+    """Another draw of the same sequence was committed first"""
+
+
+class DrawStore:
+    """Room draw history backed by the draws table"""
+    
+    @staticmethod
+    def history(db: Session, room_id: str) -> List[Draw]:
+        """Draws of a room in order"""
+        return db.query(Draw).filter(Draw.room_id == room_id).order_by(Draw.seq).all()
+    
+    @staticmethod
+    def called_numbers(db: Session, room_id: str) -> List[int]:
+        """Numbers called in a room, in order"""
+        rows = db.query(Draw.number).filter(Draw.room_id == room_id).order_by(Draw.seq).all()
+        return [row.number for row in rows]
+    
+    @staticmethod
+    def append(db: Session, room: GameRoom) -> Optional[Dict[str, Any]]:
+        """
+        Insert and commit the room's next draw
+        Returns the draw record {"seq", "number", "hash", "drawn_at"}, or None
+        once the pool is exhausted; raises DrawConflict if a concurrent draw
+        took the same sequence or the room stopped running.
+        """
+        # Guard on the room's state in the same transaction, so no draw lands
+        # after a claim finished the game; it does not bump the version, so
+        # claims in flight are not forced to retry on every draw
+        running = db.query(GameRoom).filter(
+            GameRoom.id == room.id,
+            GameRoom.state == "running"
+        ).update({GameRoom.updated_at: datetime.utcnow()}, synchronize_session=False)
+        if not running:
+            db.rollback()
+            raise DrawConflict(f"Room {room.id} is no longer running")
+        
+        last = db.query(Draw.seq, Draw.chain_hash).filter(
+            Draw.room_id == room.id
+        ).order_by(Draw.seq.desc()).first()
+        seq = last.seq + 1 if last else 1
+        if seq > len(room.draw_pool):
+            db.rollback()
+            return None
+        
+        number = room.draw_pool[seq - 1]
+        previous = last.chain_hash if last else DrawEngine.genesis_hash(room.draw_seed or "")
+        record = {
+            "seq": seq,
+            "number": number,
+            "hash": DrawEngine.chain_hash(previous, seq, number),
+            "drawn_at": datetime.utcnow()
+        }
+        db.add(Draw(
+            room_id=room.id,
+            seq=seq,
+            number=number,
+            drawn_at=record["drawn_at"],
+            chain_hash=record["hash"]
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise DrawConflict(f"Draw {seq} of room {room.id} already exists")
+        return record
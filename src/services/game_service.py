@@ -2,23 +2,126 @@
 Bingo Card Generation Service
 """
 import random
-from typing import List, Dict, Any, Optional
-from secrets import SystemRandom
+import hashlib
+import hmac
+import struct
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from secrets import SystemRandom, token_hex
 
 # Use cryptographically secure random
 secure_random = SystemRandom()
 
+# Number of derived card layouts kept in memory per process
+DERIVED_CARD_CACHE_SIZE = 4096
+
+
+class WordStream:
+    """
+    Base for deterministic streams of unsigned 32-bit words
+    Implements the subset of the random.Random API used by CardGenerator and
+    DrawEngine on top of `_refill`, mirrored bit-for-bit by static/js so
+    clients can re-derive cards and draws.
+    """
+    
+    def __init__(self):
+        self._words: List[int] = []
+    
+    def _refill(self) -> bytes:
+        """Next block of stream output (a multiple of 4 bytes)"""
+        raise NotImplementedError
+    
+    def _next_word(self) -> int:
+        """Next unsigned 32-bit word of the stream"""
+        if not self._words:
+            block = self._refill()
+            # Reversed so pop() yields words in big-endian block order
+            self._words = list(struct.unpack(f">{len(block) // 4}I", block))[::-1]
+        return self._words.pop()
+    
+    def randbelow(self, n: int) -> int:
+        """Unbiased integer in [0, n) using rejection sampling"""
+        limit = (1 << 32) - ((1 << 32) % n)
+        while True:
+            word = self._next_word()
+            if word < limit:
+                return word % n
+    
+    def randint(self, a: int, b: int) -> int:
+        """Integer in [a, b], inclusive"""
+        return a + self.randbelow(b - a + 1)
+    
+    def sample(self, population: Sequence[int], k: int) -> List[int]:
+        """k distinct items via a partial Fisher-Yates shuffle"""
+        pool = list(population)
+        for i in range(k):
+            j = i + self.randbelow(len(pool) - i)
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+    
+    def shuffle(self, pool: List[int]):
+        """In-place Fisher-Yates shuffle, last position first"""
+        for i in range(len(pool) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            pool[i], pool[j] = pool[j], pool[i]
+
+
+class HashStream(WordStream):
+    """Deterministic random stream: SHA-256 in counter mode over a text key"""
+    
+    def __init__(self, key: str):
+        super().__init__()
+        self.key = key
+        self._counter = 0
+    
+    def _refill(self) -> bytes:
+        digest = hashlib.sha256(f"{self.key}:{self._counter}".encode()).digest()
+        self._counter += 1
+        return digest
+
+
+class HmacDrbg(WordStream):
+    """
+    HMAC-DRBG (NIST SP 800-90A) with SHA-256, without reseeding
+    Keyed by the secret server seed and the public client seed, so neither
+    party alone controls the draw order.
+    """
+    
+    def __init__(self, seed_material: bytes):
+        super().__init__()
+        self._key = b"\x00" * 32
+        self._value = b"\x01" * 32
+        self._update(seed_material)
+    
+    def _hmac(self, data: bytes) -> bytes:
+        return hmac.new(self._key, data, hashlib.sha256).digest()
+    
+    def _update(self, provided: bytes = b""):
+        self._key = self._hmac(self._value + b"\x00" + provided)
+        self._value = self._hmac(self._value)
+        if provided:
+            self._key = self._hmac(self._value + b"\x01" + provided)
+            self._value = self._hmac(self._value)
+    
+    def _refill(self) -> bytes:
+        # One 32-byte generate call per refill
+        self._value = self._hmac(self._value)
+        block = self._value
+        self._update()
+        return block
+
 
 class CardGenerator:
     """Generate bingo cards for different variants"""
     
     @staticmethod
-    def generate_75_ball_card() -> List[List[Dict[str, Any]]]:
+    def generate_75_ball_card(rng=None) -> List[List[Dict[str, Any]]]:
         """
         Generate a 75-ball bingo card (5x5 grid)
         Columns: B(1-15), I(16-30), N(31-45), G(46-60), O(61-75)
         Center is FREE
         """
+        rng = rng or secure_random
         card = []
         column_ranges = [
             (1, 15),   # B
@@ -42,7 +145,7 @@ class CardGenerator:
                     # Get available numbers for this column
                     min_val, max_val = column_ranges[col]
                     # Generate unique numbers for this column
-                    value = secure_random.randint(min_val, max_val)
+                    value = rng.randint(min_val, max_val)
                     card_row.append({
                         "value": value,
                         "marked": False,
@@ -57,18 +160,19 @@ class CardGenerator:
                 if card[row][col]["value"] is not None:
                     while card[row][col]["value"] in used_numbers:
                         min_val, max_val = column_ranges[col]
-                        card[row][col]["value"] = secure_random.randint(min_val, max_val)
+                        card[row][col]["value"] = rng.randint(min_val, max_val)
                     used_numbers.add(card[row][col]["value"])
         
         return card
     
     @staticmethod
-    def generate_90_ball_card() -> List[List[Dict[str, Any]]]:
+    def generate_90_ball_card(rng=None) -> List[List[Dict[str, Any]]]:
         """
         Generate a 90-ball bingo card (3 rows x 9 columns)
         Each row has 5 numbers and 4 blanks
         Numbers 1-90 distributed across columns
         """
+        rng = rng or secure_random
         card = []
         
         # Column ranges for 90-ball: col0(1-9), col1(10-19), ..., col8(80-90)
@@ -88,17 +192,17 @@ class CardGenerator:
         used_numbers = set()
         for row in range(3):
             # Randomly select 5 columns to have numbers
-            columns_with_numbers = secure_random.sample(range(9), 5)
+            columns_with_numbers = rng.sample(range(9), 5)
             columns_with_numbers.sort()
             
             card_row = []
             for col in range(9):
                 if col in columns_with_numbers:
                     min_val, max_val = column_ranges[col]
-                    value = secure_random.randint(min_val, max_val)
+                    value = rng.randint(min_val, max_val)
                     # Ensure uniqueness
                     while value in used_numbers:
-                        value = secure_random.randint(min_val, max_val)
+                        value = rng.randint(min_val, max_val)
                     used_numbers.add(value)
                     
                     card_row.append({
@@ -117,12 +221,57 @@ class CardGenerator:
         return card
     
     @staticmethod
-    def generate_card(variant: str = "75") -> List[List[Dict[str, Any]]]:
+    def generate_card(variant: str = "75", rng=None) -> List[List[Dict[str, Any]]]:
         """Generate card based on variant"""
         if variant == "90":
-            return CardGenerator.generate_90_ball_card()
+            return CardGenerator.generate_90_ball_card(rng)
         else:
-            return CardGenerator.generate_75_ball_card()
+            return CardGenerator.generate_75_ball_card(rng)
+    
+    @staticmethod
+    def generate_cards(variant: str = "75", count: int = 1) -> List[List[List[Dict[str, Any]]]]:
+        """Generate several cards; runs in the job pool for large batches"""
+        return [CardGenerator.generate_card(variant) for _ in range(count)]
+    
+    @staticmethod
+    def new_series_seed() -> str:
+        """Generate a seed for a series of derived cards"""
+        return token_hex(16)
+    
+    @staticmethod
+    @lru_cache(maxsize=DERIVED_CARD_CACHE_SIZE)
+    def _derive_layout(seed: str, serial: int, variant: str) -> Tuple[Tuple[Optional[int], ...], ...]:
+        """Cached immutable value layout of a derived card"""
+        grid = CardGenerator.generate_card(variant, HashStream(f"{seed}:{variant}:{serial}"))
+        return tuple(tuple(cell["value"] for cell in row) for row in grid)
+    
+    @staticmethod
+    def derive_card(
+        seed: str,
+        serial: int,
+        variant: str = "75",
+        called_numbers: Optional[Sequence[int]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Derive card number `serial` of the series identified by `seed`
+        The same (seed, serial, variant) always yields the same grid, so the
+        grid does not need to be stored. Cells whose values are in
+        `called_numbers` are returned marked.
+        """
+        called = set(called_numbers or ())
+        layout = CardGenerator._derive_layout(seed, serial, variant)
+        card = []
+        for row_idx, row in enumerate(layout):
+            card_row = []
+            for col_idx, value in enumerate(row):
+                free = variant != "90" and row_idx == 2 and col_idx == 2
+                card_row.append({
+                    "value": value,
+                    "marked": free or (value is not None and value in called),
+                    "free": free
+                })
+            card.append(card_row)
+        return card
 
 
 class DrawEngine:
@@ -147,12 +296,84 @@ class DrawEngine:
         
         return pool, seed
     
+    @staticmethod
+    def new_server_seed() -> str:
+        """Secret seed for a commit-reveal room"""
+        return token_hex(32)
+    
+    @staticmethod
+    def commit_seed(server_seed: str) -> str:
+        """Public commitment to a server seed, published before the game"""
+        return hashlib.sha256(server_seed.encode()).hexdigest()
+    
+    @staticmethod
+    def fair_shuffle(min_num: int, max_num: int, server_seed: str, client_seed: str) -> List[int]:
+        """Draw order derived from an HMAC-DRBG over server and client seeds"""
+        pool = list(range(min_num, max_num + 1))
+        HmacDrbg(f"{server_seed}:{client_seed}".encode()).shuffle(pool)
+        return pool
+    
+    @staticmethod
+    def derive_pool(min_num: int, max_num: int, seed: str, client_seed: Optional[str] = None) -> List[int]:
+        """Replay the draw order of a room from its seed(s)"""
+        if client_seed is not None:
+            return DrawEngine.fair_shuffle(min_num, max_num, seed, client_seed)
+        pool, _ = DrawEngine.initialize_draw_pool(min_num, max_num, seed)
+        return pool
+    
     @staticmethod
     def draw_number(pool: List[int]) -> Optional[int]:
         """Draw next number from pool"""
         if pool:
             return pool.pop(0)
         return None
+    
+    @staticmethod
+    def genesis_hash(seed: str) -> str:
+        """Starting link of a room's draw hash chain"""
+        return hashlib.sha256(seed.encode()).hexdigest()
+    
+    @staticmethod
+    def chain_hash(previous_hash: str, sequence: int, number: int) -> str:
+        """Next link of the draw hash chain"""
+        return hashlib.sha256(f"{previous_hash}:{sequence}:{number}".encode()).hexdigest()
+    
+    @staticmethod
+    def build_chain(seed: str, numbers: Sequence[int]) -> List[str]:
+        """Hash chain over a draw sequence; element i is the hash after draw i + 1"""
+        hashes = []
+        head = DrawEngine.genesis_hash(seed)
+        for sequence, number in enumerate(numbers, start=1):
+            head = DrawEngine.chain_hash(head, sequence, number)
+            hashes.append(head)
+        return hashes
+    
+    @staticmethod
+    def verify_draws(
+        seed: str,
+        min_num: int,
+        max_num: int,
+        numbers: Sequence[int],
+        hashes: Sequence[str],
+        client_seed: Optional[str] = None
+    ) -> tuple[bool, str]:
+        """
+        Replay seed -> shuffle -> chain and compare with a recorded draw history
+        Returns: (is_valid, message)
+        """
+        pool = DrawEngine.derive_pool(min_num, max_num, seed, client_seed)
+        if list(numbers) != pool[:len(numbers)]:
+            return False, "Draw order does not match the seeded shuffle"
+        
+        expected = DrawEngine.build_chain(seed, numbers)
+        for sequence, (recorded, replayed) in enumerate(zip(hashes, expected), start=1):
+            if recorded != replayed:
+                return False, f"Hash chain mismatch at draw {sequence}"
+        
+        if len(hashes) != len(numbers):
+            return False, f"{len(hashes)} of {len(numbers)} draws are logged"
+        
+        return True, "Draw history verified"
 
 
 class PatternVerifier:
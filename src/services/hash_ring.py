@@ -0,0 +1,48 @@
+"""
+Consistent Hashing
+"""
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Tuple
+
+
+def _point(key: str) -> int:
+    """Position of a key on the ring"""
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes
+    Adding or removing a node only moves the keys in the arcs it gains or
+    loses, about 1/N of them, instead of reshuffling everything.
+    """
+    
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        self.vnodes = vnodes
+        self.nodes: List[str] = sorted(set(nodes))
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        ring: List[Tuple[int, str]] = sorted(
+            (_point(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes)
+        )
+        for point, node in ring:
+            self._points.append(point)
+            self._owners.append(node)
+    
+    def __len__(self) -> int:
+        return len(self.nodes)
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, HashRing) and self.nodes == other.nodes and self.vnodes == other.vnodes
+    
+    def node_for(self, key: str) -> str:
+        """Node owning a key: the first virtual node clockwise from it"""
+        if not self._points:
+            raise LookupError("Hash ring is empty")
+        index = bisect.bisect(self._points, _point(key)) % len(self._points)
+        return self._owners[index]
+    
+    def assignments(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Owner of every key"""
+        return {key: self.node_for(key) for key in keys}
@@ -0,0 +1,92 @@
+"""
+CPU Job Pool
+Runs CPU-bound work in worker processes so one large room never blocks the
+event loop that serves every other room's WebSockets
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """The pool already has its maximum number of pending jobs"""
+
+
+class JobTimeout(Exception):
+    """A job did not finish within its timeout"""
+
+
+class JobPool:
+    """
+    Bounded, process-backed job runner
+    At most `max_pending` jobs may be queued or running; further submissions
+    fail fast with JobQueueFull instead of piling up. Jobs that exceed their
+    timeout raise JobTimeout (the worker finishes in the background, since
+    processes cannot be interrupted safely, and keeps counting as pending
+    until it does). Functions and arguments must be
+    picklable, i.e. module-level functions or static methods.
+    """
+    
+    def __init__(self, workers: int = 2, max_pending: int = 64, timeout: float = 10.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        # Jobs finish on the executor's thread
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned, not forked: forking a process that runs an event loop
+            # and database connections is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run fn(*args) in a worker process and return its result"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise JobQueueFull(f"{self.pending} jobs pending")
+            self.pending += 1
+        
+        try:
+            job = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            self._finished(None)
+            self._broken()
+            raise
+        # Registered before the asyncio wrapper's callback, so the count
+        # drops before run() returns, but not before the worker is done
+        job.add_done_callback(self._finished)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            raise JobTimeout(f"{getattr(fn, '__qualname__', fn)} exceeded {timeout or self.timeout}s")
+        except BrokenProcessPool:
+            self._broken()
+            raise
+    
+    def _finished(self, job: Optional[Future]):
+        with self._lock:
+            self.pending -= 1
+    
+    def _broken(self):
+        # A worker died; start a fresh pool for the next job
+        logger.error("Job pool broken, restarting")
+        self._executor = None
+    
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
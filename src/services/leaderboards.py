@@ -0,0 +1,182 @@
+"""
+Leaderboards
+Daily, weekly and all-time boards kept incrementally in Redis sorted sets
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.core.redis import redis_client
+from src.models import LeaderboardSnapshot, Player
+
+logger = logging.getLogger(__name__)
+
+
+class Leaderboards:
+    """
+    Win, games played and fastest bingo boards
+    Every accepted claim and game start updates the current day, week and
+    all-time sorted sets in one pipelined round trip, so reads are a ranked
+    range (O(log n + page)) instead of aggregates over the claims table.
+    Boards are snapshotted to the database periodically; periods whose Redis
+    keys have expired are served from the latest snapshot.
+    """
+    
+    KEY = "leaderboard:{board}:{period}"
+    LOCK_KEY = "leaderboard:snapshot:lock"
+    # Board -> whether a higher score ranks first
+    BOARDS = {"wins": True, "games": True, "fastest": False}
+    # Period -> TTL of its live keys; past periods live on in snapshots
+    PERIODS = {"daily": 8 * 86400, "weekly": 36 * 86400, "all": None}
+    
+    def __init__(self, snapshot_interval: int = 300, snapshot_size: int = 1000):
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_size = snapshot_size
+    
+    @staticmethod
+    def period_id(period: str, when: datetime) -> str:
+        """Id of the daily/weekly/all-time period containing `when` (UTC)"""
+        if period == "daily":
+            return f"daily:{when:%Y-%m-%d}"
+        if period == "weekly":
+            year, week, _ = when.isocalendar()
+            return f"weekly:{year}-W{week:02d}"
+        if period == "all":
+            return "all"
+        raise ValueError(f"Unknown period '{period}'")
+    
+    def _keys(self, board: str, when: datetime) -> Dict[str, Optional[int]]:
+        """Live keys of a board for every period containing `when`, with their TTLs"""
+        return {
+            self.KEY.format(board=board, period=self.period_id(period, when)): ttl
+            for period, ttl in self.PERIODS.items()
+        }
+    
+    async def record_win(self, player_id: str, draws: int, when: Optional[datetime] = None):
+        """Count a win, and the draws it took toward fastest bingo"""
+        when = when or datetime.utcnow()
+        await redis_client.zincrby_many(self._keys("wins", when), [player_id])
+        await redis_client.zadd_lower_many(self._keys("fastest", when), {player_id: draws})
+    
+    async def record_games(self, player_ids: List[str], when: Optional[datetime] = None):
+        """Count a started game for each of its players"""
+        if player_ids:
+            await redis_client.zincrby_many(self._keys("games", when or datetime.utcnow()), player_ids)
+    
+    async def page(
+        self,
+        db: Session,
+        board: str,
+        period: str,
+        when: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 50,
+        player_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One page of a board, with the player's own standing if requested"""
+        if board not in self.BOARDS:
+            raise ValueError(f"Unknown board '{board}'")
+        period_id = self.period_id(period, when or datetime.utcnow())
+        key = self.KEY.format(board=board, period=period_id)
+        desc = self.BOARDS[board]
+        
+        total = await redis_client.zcard(key)
+        if total:
+            source = "live"
+            rows = await redis_client.zrange_page(key, offset, offset + limit - 1, desc=desc)
+            standing = None
+            if player_id:
+                rank = await redis_client.zrank(key, player_id, desc=desc)
+                if rank is not None:
+                    standing = {"rank": rank + 1, "score": await redis_client.zscore(key, player_id)}
+        else:
+            source = "snapshot"
+            snapshot = db.query(LeaderboardSnapshot).filter(
+                LeaderboardSnapshot.board == board,
+                LeaderboardSnapshot.period == period_id
+            )
+            total = snapshot.count()
+            rows = [
+                (row.player_id, row.score)
+                for row in snapshot.order_by(LeaderboardSnapshot.rank).offset(offset).limit(limit)
+            ]
+            standing = None
+            if player_id:
+                row = snapshot.filter(LeaderboardSnapshot.player_id == player_id).first()
+                if row:
+                    standing = {"rank": row.rank, "score": row.score}
+        
+        ids = [member for member, _ in rows]
+        names = dict(db.query(Player.id, Player.display_name).filter(Player.id.in_(ids)).all()) if ids else {}
+        return {
+            "board": board,
+            "period": period_id,
+            "source": source,
+            "total": total,
+            "entries": [
+                {"rank": offset + i + 1, "player_id": member, "name": names.get(member), "score": score}
+                for i, (member, score) in enumerate(rows)
+            ],
+            "player": standing
+        }
+    
+    @staticmethod
+    def _store(board: str, period_id: str, rows: List[Any], taken_at: datetime):
+        """Replace the snapshot of one board period"""
+        with get_db() as db:
+            db.query(LeaderboardSnapshot).filter(
+                LeaderboardSnapshot.board == board,
+                LeaderboardSnapshot.period == period_id
+            ).delete(synchronize_session=False)
+            db.add_all([
+                LeaderboardSnapshot(
+                    board=board,
+                    period=period_id,
+                    rank=rank,
+                    player_id=member,
+                    score=score,
+                    taken_at=taken_at
+                )
+                for rank, (member, score) in enumerate(rows, start=1)
+            ])
+    
+    async def snapshot(self, when: Optional[datetime] = None) -> int:
+        """Copy the top of every current board to the database; returns boards copied"""
+        when = when or datetime.utcnow()
+        # Include the period just ended so its final minutes are not lost
+        period_ids = {
+            self.period_id(period, moment)
+            for period in self.PERIODS
+            for moment in (when, when - timedelta(seconds=self.snapshot_interval))
+        }
+        copied = 0
+        for board, desc in self.BOARDS.items():
+            for period_id in period_ids:
+                key = self.KEY.format(board=board, period=period_id)
+                rows = await redis_client.zrange_page(key, 0, self.snapshot_size - 1, desc=desc)
+                if rows:
+                    await asyncio.to_thread(self._store, board, period_id, rows, when)
+                    copied += 1
+        return copied
+    
+    async def run(self):
+        """Background snapshot loop; one API process snapshots per interval"""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                if await redis_client.set_nx(self.LOCK_KEY, "1", self.snapshot_interval - 1):
+                    await self.snapshot()
+            except Exception as e:
+                logger.error(f"Leaderboard snapshot failed: {e}")
+
+
+# Global leaderboards instance
+leaderboards = Leaderboards(
+    snapshot_interval=settings.leaderboard_snapshot_interval,
+    snapshot_size=settings.leaderboard_snapshot_size
+)
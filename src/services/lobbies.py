@@ -0,0 +1,143 @@
+"""
+Lobby Index
+Open public lobbies in Redis sorted sets, so quick play finds a seat in
+O(log n) however many lobbies are waiting
+"""
+import logging
+from typing import Optional
+
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.redis import redis_client
+from src.models import Card, GameRoom
+
+logger = logging.getLogger(__name__)
+
+# First of the `candidates` fullest lobbies the player is not already seated in
+PICK_SCRIPT = """
+local rooms = redis.call('ZRANGEBYSCORE', KEYS[1], 1, '+inf', 'LIMIT', 0, ARGV[2])
+for _, room in ipairs(rooms) do
+    if redis.call('SISMEMBER', ARGV[3] .. room, ARGV[1]) == 0 then
+        return room
+    end
+end
+return false
+"""
+
+# 1 seated, 2 already seated, 0 full, -1 not listed
+SEAT_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[2], ARGV[2]) == 1 then
+    return 2
+end
+local left = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not left then
+    return -1
+end
+if tonumber(left) < 1 then
+    return 0
+end
+redis.call('ZINCRBY', KEYS[1], -1, ARGV[1])
+redis.call('SADD', KEYS[2], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+UNSEAT_SCRIPT = """
+if redis.call('SREM', KEYS[2], ARGV[2]) == 1 and redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    redis.call('ZINCRBY', KEYS[1], 1, ARGV[1])
+end
+return 1
+"""
+
+
+class LobbyIndex:
+    """
+    Public lobbies waiting for players
+    One sorted set per (variant, pattern) holds the lobbies scored by seats
+    left, so the fullest lobby with room is the first member scored >= 1.
+    Seating runs as a Lua script: the seat check, the decrement and the
+    seated-player set change together, whichever API process handles it.
+    Full lobbies stay listed at 0 until they start, so late joins are refused.
+    """
+    
+    INDEX_KEY = "lobbies:{variant}:{pattern}"
+    SEATED_KEY = "lobby:seated:{room_id}"
+    
+    # Outcomes of seat()
+    FULL = 0
+    SEATED = 1
+    ALREADY_SEATED = 2
+    
+    def __init__(self, candidates: int = 8, seated_ttl: int = 86400):
+        self.candidates = candidates
+        self.seated_ttl = seated_ttl
+    
+    @staticmethod
+    def index_key(variant: str, pattern: str) -> str:
+        return LobbyIndex.INDEX_KEY.format(variant=variant, pattern=pattern)
+    
+    @staticmethod
+    def room_key(room: GameRoom) -> str:
+        return LobbyIndex.index_key(room.variant, room.pattern.get("id", "horizontal_line"))
+    
+    @staticmethod
+    def seated_count(db: Session, room_id: str) -> int:
+        """Players holding cards in a room"""
+        return db.query(func.count(distinct(Card.owner_id))).filter(Card.room_id == room_id).scalar()
+    
+    async def add(self, room: GameRoom, seated: int = 0, replace: bool = True):
+        """List a public lobby; without `replace` an existing entry is kept"""
+        seats = max((room.target_players or settings.max_players_per_room) - seated, 0)
+        await redis_client.zadd(self.room_key(room), {room.id: seats}, nx=not replace)
+    
+    async def remove(self, room: GameRoom):
+        """Unlist a lobby once it started or went away"""
+        await self.discard(room.id, room.variant, room.pattern.get("id", "horizontal_line"))
+    
+    async def discard(self, room_id: str, variant: str, pattern: str):
+        await redis_client.zrem(self.index_key(variant, pattern), room_id)
+        await redis_client.delete(self.SEATED_KEY.format(room_id=room_id))
+    
+    async def pick(self, variant: str, pattern: str, player_id: str) -> Optional[str]:
+        """Fullest open lobby with a free seat for the player, if any"""
+        room_id = await redis_client.eval(
+            PICK_SCRIPT,
+            [self.index_key(variant, pattern)],
+            [player_id, self.candidates, self.SEATED_KEY.format(room_id="")]
+        )
+        return room_id or None
+    
+    async def seat(self, room: GameRoom, player_id: str) -> int:
+        """Take a seat in a lobby; SEATED, FULL or ALREADY_SEATED"""
+        result = await redis_client.eval(
+            SEAT_SCRIPT,
+            [self.room_key(room), self.SEATED_KEY.format(room_id=room.id)],
+            [room.id, player_id, self.seated_ttl]
+        )
+        if result in (self.FULL, self.ALREADY_SEATED):
+            return result
+        # Unlisted lobbies (or no Redis) are not capped here; they still
+        # auto-start at their target
+        return self.SEATED
+    
+    async def unseat(self, room: GameRoom, player_id: str):
+        """Give a seat back after a join failed"""
+        await redis_client.eval(
+            UNSEAT_SCRIPT,
+            [self.room_key(room), self.SEATED_KEY.format(room_id=room.id)],
+            [room.id, player_id]
+        )
+    
+    async def rebuild(self, db: Session):
+        """List public lobbies missing from the index, e.g. after a Redis restart"""
+        rooms = db.query(GameRoom).filter(GameRoom.state == "lobby", GameRoom.public.is_(True)).all()
+        for room in rooms:
+            await self.add(room, self.seated_count(db, room.id), replace=False)
+        if rooms:
+            logger.info(f"Lobby index holds {len(rooms)} public lobbies")
+
+
+# Global lobby index instance
+lobby_index = LobbyIndex(seated_ttl=settings.room_lobby_ttl)
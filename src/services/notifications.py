@@ -0,0 +1,152 @@
+"""
+Outbound Telegram Notifications
+Room events are queued in Redis by the API and delivered by a separate worker
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.core.redis import redis_client
+from src.models import Card, GameRoom, Player
+from src.services.rate_limit import KeyedTokenBuckets, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "notifications:queue"
+
+
+async def publish_event(event: str, room_id: str, **data: Any):
+    """Queue a room event for notification; one Redis push, never blocks on Telegram"""
+    if not redis_client.redis:
+        logger.warning(f"Redis unavailable, dropping {event} notification for room {room_id}")
+        return
+    await redis_client.rpush(QUEUE_KEY, json.dumps({"event": event, "room_id": room_id, **data}))
+
+
+class NotificationWorker:
+    """
+    Delivers queued room events as Telegram messages
+    Events are popped in batches and expanded to one message per player.
+    Sends go through a global and a per-chat token bucket matching
+    Telegram's limits, run concurrently, and are retried with exponential
+    backoff on network errors or after the delay Telegram asks for.
+    """
+    
+    def __init__(
+        self,
+        global_rate: float = 25.0,
+        chat_rate: float = 1.0,
+        max_retries: int = 5,
+        batch_size: int = 100,
+        concurrency: int = 50
+    ):
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_buckets = KeyedTokenBuckets(chat_rate)
+        self.max_retries = max_retries
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.bot: Optional[Bot] = None
+    
+    @staticmethod
+    def _room_players(room_id: str) -> List[Tuple[str, str, str]]:
+        """(player_id, telegram_id, display_name) of everyone holding a card in the room"""
+        with get_db() as db:
+            rows = db.query(Player.id, Player.telegram_id, Player.display_name).join(
+                Card, Card.owner_id == Player.id
+            ).filter(Card.room_id == room_id).distinct().all()
+        return [tuple(row) for row in rows]
+    
+    @staticmethod
+    def _room_code(room_id: str) -> str:
+        """Join code players were given for the room"""
+        with get_db() as db:
+            row = db.query(GameRoom.code).filter(GameRoom.id == room_id).first()
+        return row.code if row and row.code else room_id[:8].upper()
+    
+    def _messages(self, event: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Expand an event to (chat_id, text) pairs"""
+        room_code = self._room_code(event["room_id"])
+        players = self._room_players(event["room_id"])
+        
+        if event["event"] == "game_started":
+            text = f"🎮 Your Ethio Bingo game in room {room_code} is starting now!"
+            return [(telegram_id, text) for _, telegram_id, _ in players]
+        
+        if event["event"] == "game_won":
+            winner_id = event.get("player_id")
+            winner_name = next((name for pid, _, name in players if pid == winner_id), "A player")
+            messages = []
+            for player_id, telegram_id, _ in players:
+                if player_id == winner_id:
+                    messages.append((telegram_id, f"🎉 BINGO! You won the game in room {room_code}!"))
+                else:
+                    messages.append((telegram_id, f"🏁 Room {room_code} is closing: {winner_name} won this round."))
+            return messages
+        
+        logger.warning(f"Unknown notification event: {event['event']}")
+        return []
+    
+    async def send(self, chat_id: str, text: str):
+        """Send one message within the rate limits, retrying transient failures"""
+        await self.chat_buckets.get(chat_id).acquire()
+        for attempt in range(self.max_retries):
+            await self.global_bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text)
+                return
+            except RetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+            except (Forbidden, BadRequest) as e:
+                # Blocked the bot or never started it: retrying will not help
+                logger.info(f"Dropping notification to {chat_id}: {e}")
+                return
+            except NetworkError as e:
+                await asyncio.sleep(min(2 ** attempt, 30))
+                logger.warning(f"Retrying notification to {chat_id}: {e}")
+        logger.error(f"Giving up on notification to {chat_id}")
+    
+    async def process_batch(self, items: List[str]):
+        """Deliver one batch of queued events"""
+        messages = []
+        for item in items:
+            event = json.loads(item)
+            messages.extend(await asyncio.to_thread(self._messages, event))
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def send_limited(chat_id: str, text: str):
+            async with semaphore:
+                await self.send(chat_id, text)
+        
+        await asyncio.gather(*[send_limited(chat_id, text) for chat_id, text in messages])
+    
+    async def run(self):
+        """Worker loop: block for an event, then drain up to a batch"""
+        await redis_client.connect()
+        async with Bot(settings.telegram_bot_token) as bot:
+            self.bot = bot
+            logger.info("Notification worker started")
+            while True:
+                first = await redis_client.blpop(QUEUE_KEY, timeout=5)
+                if first is None:
+                    continue
+                items = [first] + await redis_client.lpop_many(QUEUE_KEY, self.batch_size - 1)
+                try:
+                    await self.process_batch(items)
+                except Exception as e:
+                    logger.error(f"Notification batch failed: {e}", exc_info=True)
+
+
+# Global notification worker instance
+notification_worker = NotificationWorker(
+    global_rate=settings.notify_global_rate,
+    chat_rate=settings.notify_chat_rate,
+    max_retries=settings.notify_max_retries,
+    batch_size=settings.notify_batch_size
+)
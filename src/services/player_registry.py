@@ -0,0 +1,132 @@
+"""
+Player Registry
+Cached, batched player registration for the bot's hot paths
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.core.redis import redis_client
+from src.models import Player
+
+logger = logging.getLogger(__name__)
+
+
+class PlayerRegistry:
+    """
+    Registers Telegram users without a database round trip per /start
+    Known users are remembered in an in-process LRU and in Redis. Unknown
+    users are queued and upserted in batches keyed on telegram_id, so a burst
+    of /start commands costs one INSERT ... ON CONFLICT per batch. New players
+    get the deterministic id "tg_<telegram_id>", the id the Mini App uses.
+    """
+    
+    KNOWN_KEY = "player:tg:{telegram_id}"
+    KNOWN_TTL = 7 * 24 * 3600
+    
+    def __init__(self, cache_size: int = 50000, batch_size: int = 200, flush_interval: float = 1.0):
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._known: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Dict[str, str] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+    
+    @staticmethod
+    def player_id_for(telegram_id: str) -> str:
+        """Id given to players registered through the registry"""
+        return f"tg_{telegram_id}"
+    
+    def _remember(self, telegram_id: str):
+        self._known[telegram_id] = None
+        self._known.move_to_end(telegram_id)
+        if len(self._known) > self.cache_size:
+            self._known.popitem(last=False)
+    
+    async def ensure(self, telegram_id: str, display_name: str):
+        """Make sure a player exists; returns without touching the database"""
+        if telegram_id in self._known:
+            self._known.move_to_end(telegram_id)
+            return
+        
+        if telegram_id not in self._pending:
+            if await redis_client.exists(self.KNOWN_KEY.format(telegram_id=telegram_id)):
+                self._remember(telegram_id)
+                return
+        
+        self._pending[telegram_id] = display_name
+        if len(self._pending) >= self.batch_size:
+            asyncio.create_task(self.flush())
+    
+    @staticmethod
+    def _upsert(players: Dict[str, str]):
+        """Insert new players, refreshing names of existing ones"""
+        with get_db() as db:
+            dialect = db.get_bind().dialect.name
+            insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+            now = datetime.utcnow()
+            statement = insert(Player).values([
+                {
+                    "id": PlayerRegistry.player_id_for(telegram_id),
+                    "telegram_id": telegram_id,
+                    "display_name": display_name,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for telegram_id, display_name in players.items()
+            ])
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[Player.telegram_id],
+                set_={
+                    "display_name": statement.excluded.display_name,
+                    "updated_at": statement.excluded.updated_at
+                }
+            ))
+    
+    async def flush(self):
+        """Upsert queued players in one statement"""
+        # Created lazily so it binds to the running event loop
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._upsert, batch)
+            except Exception:
+                # Requeue unless the user re-registered meanwhile
+                for telegram_id, display_name in batch.items():
+                    self._pending.setdefault(telegram_id, display_name)
+                raise
+            
+            for telegram_id in batch:
+                self._remember(telegram_id)
+            await redis_client.set_many(
+                {self.KNOWN_KEY.format(telegram_id=telegram_id): "1" for telegram_id in batch},
+                expire=self.KNOWN_TTL
+            )
+    
+    async def run(self):
+        """Background loop flushing partial batches"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Player registry flush failed: {e}")
+
+
+# Global player registry instance
+player_registry = PlayerRegistry(
+    cache_size=settings.player_cache_size,
+    batch_size=settings.player_flush_batch_size,
+    flush_interval=settings.player_flush_interval
+)
@@ -0,0 +1,76 @@
+"""
+Rate Limiting Primitives
+"""
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Token bucket: `rate` tokens per second, bursts of up to `capacity`"""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+    
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if available
+        Returns 0 on success, otherwise the seconds until they will be
+        """
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+    
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until tokens are available and take them"""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+    
+    @property
+    def is_full(self) -> bool:
+        """True when the bucket has refilled completely (safe to forget)"""
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+class KeyedTokenBuckets:
+    """Independent token buckets per key, pruned once idle"""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None, max_keys: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+    
+    def get(self, key: str) -> TokenBucket:
+        """Bucket for a key, created full"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self.prune()
+            bucket = TokenBucket(self.rate, self.capacity, self.clock)
+            self._buckets[key] = bucket
+        return bucket
+    
+    def prune(self):
+        """Drop buckets that are full again; they behave like new ones"""
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if not bucket.is_full}
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,97 @@
+"""
+Room Codes
+Short codes players type to join a room, resolved with a key lookup
+"""
+import secrets
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.redis import redis_client
+from src.models import GameRoom
+from src.services.short_codes import ShortCodes
+
+
+class RoomCodes:
+    """
+    Allocation and lookup of room codes
+    Codes are a shared Redis counter run through ShortCodes, so they never
+    collide while the counter lives; after a Redis reset (or without Redis)
+    allocation falls back to random counters and the unique index on
+    game_rooms.code catches the rare clash. Lookups go through an
+    in-process LRU, then Redis, then the indexed column. Archived rooms are
+    forgotten here and in Redis; another process's LRU may still map the
+    code to the gone room until it ages out, which only leads to a 404.
+    """
+    
+    COUNTER_KEY = "room:code:counter"
+    CODE_KEY = "room:code:{code}"
+    # Code of a room, so an archived room's code key can be found
+    ROOM_KEY = "room:code:room:{room_id}"
+    
+    def __init__(self, key: str, cache_size: int = 10000, cache_ttl: int = 86400):
+        self.codes = ShortCodes(key)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._rooms: "OrderedDict[str, str]" = OrderedDict()
+        # room_id -> code of the entries in _rooms
+        self._codes: Dict[str, str] = {}
+    
+    async def allocate(self, fresh: bool = False) -> str:
+        """A new code; pass `fresh` after a clash to skip the counter"""
+        counter = None if fresh else await redis_client.incr(self.COUNTER_KEY)
+        if counter is None:
+            counter = secrets.randbelow(self.codes.capacity)
+        return self.codes.encode(counter % self.codes.capacity)
+    
+    def _remember(self, code: str, room_id: str):
+        self._rooms[code] = room_id
+        self._codes[room_id] = code
+        self._rooms.move_to_end(code)
+        if len(self._rooms) > self.cache_size:
+            self._codes.pop(self._rooms.popitem(last=False)[1], None)
+    
+    async def remember(self, code: str, room_id: str):
+        """Cache a code of a new room"""
+        self._remember(code, room_id)
+        await redis_client.set_many({
+            self.CODE_KEY.format(code=code): room_id,
+            self.ROOM_KEY.format(room_id=room_id): code
+        }, expire=self.cache_ttl)
+    
+    async def forget(self, room_id: str):
+        """Purge hook for archived rooms; their code stops resolving"""
+        code = self._codes.pop(room_id, None)
+        if code is None:
+            code = await redis_client.get(self.ROOM_KEY.format(room_id=room_id))
+        if code is None:
+            return
+        if self._rooms.get(code) == room_id:
+            del self._rooms[code]
+        await redis_client.delete_if_equal(self.CODE_KEY.format(code=code), room_id)
+        await redis_client.delete(self.ROOM_KEY.format(room_id=room_id))
+    
+    async def resolve(self, db: Session, code: str) -> Optional[str]:
+        """Room id of a code typed by a player, if any"""
+        code = ShortCodes.normalize(code)
+        room_id = self._rooms.get(code)
+        if room_id:
+            self._rooms.move_to_end(code)
+            return room_id
+        
+        room_id = await redis_client.get(self.CODE_KEY.format(code=code))
+        if room_id:
+            self._remember(code, room_id)
+            return room_id
+        
+        row = db.query(GameRoom.id).filter(GameRoom.code == code).first()
+        if row is None:
+            return None
+        await self.remember(code, row.id)
+        return row.id
+
+
+# Global room code directory
+room_codes = RoomCodes(settings.secret_key, cache_size=settings.room_code_cache_size, cache_ttl=settings.room_lobby_ttl)
@@ -0,0 +1,57 @@
+"""
+Room State Transitions
+Optimistic concurrency for GameRoom: read, decide, then compare-and-swap on
+the room's version instead of locking the row for the whole request
+"""
+from typing import Any, Callable, Dict
+
+from sqlalchemy.orm import Session
+
+from src.models import GameRoom
+
+
+class RoomConflict(Exception):
+    """The room kept changing underneath a transition"""
+
+
+class RoomStore:
+    """Versioned updates of game rooms"""
+    
+    @staticmethod
+    def compare_and_set(db: Session, room: GameRoom, changes: Dict[str, Any]) -> bool:
+        """
+        Apply `changes` only if the room is still at the version it was read
+        at, bumping the version; returns whether it matched. Not committed.
+        """
+        values = {getattr(GameRoom, name): value for name, value in changes.items()}
+        values[GameRoom.version] = GameRoom.version + 1
+        updated = db.query(GameRoom).filter(
+            GameRoom.id == room.id,
+            GameRoom.version == room.version
+        ).update(values, synchronize_session=False)
+        return updated == 1
+    
+    @staticmethod
+    def transition(
+        db: Session,
+        room: GameRoom,
+        decide: Callable[[GameRoom], Dict[str, Any]],
+        retries: int = 3
+    ) -> GameRoom:
+        """
+        Commit the changes `decide` returns for the current room state
+        `decide` must not modify the room itself; it returns the column
+        changes (empty for none) and may add other rows to the session, which
+        commit with them. When another writer bumped the version first, the
+        transaction is rolled back, the room re-read and `decide` run again,
+        up to `retries` times before RoomConflict is raised.
+        """
+        for _ in range(retries + 1):
+            changes = decide(room)
+            if not changes or RoomStore.compare_and_set(db, room, changes):
+                db.commit()
+                db.refresh(room)
+                return room
+            db.rollback()
+            db.refresh(room)
+        raise RoomConflict(f"Room {room.id} changed {retries + 1} times during a transition")
@@ -0,0 +1,110 @@
+"""
+Room Sharding
+Assigns every room to one API shard so its sockets, draw loop and in-memory
+state live in a single process
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List
+
+from src.core.config import settings
+from src.core.redis import redis_client
+from src.services.hash_ring import HashRing
+
+logger = logging.getLogger(__name__)
+
+
+class ShardRouter:
+    """
+    Consistent-hash routing of rooms to API shards
+    Live shards heartbeat into a Redis sorted set and every refresh rebuilds
+    the ring from the shards seen within `node_ttl`; when membership changes
+    the change hooks hand rooms over to their new owners. A per-room lease
+    keeps a draw loop on one shard while shards briefly disagree.
+    """
+    
+    NODES_KEY = "shards:live"
+    LEASE_KEY = "room:lease:{room_id}"
+    
+    def __init__(self, shard_id: int = 0, shard_count: int = 1, node_ttl: int = 15, lease_ttl: int = 30):
+        self.shard_id = str(shard_id)
+        self.shard_count = shard_count
+        self.node_ttl = node_ttl
+        self.lease_ttl = lease_ttl
+        self.ring = HashRing(self.static_nodes())
+        self._change_hooks: List[Callable[[], Awaitable[None]]] = []
+    
+    @property
+    def enabled(self) -> bool:
+        return self.shard_count > 1
+    
+    def static_nodes(self) -> List[str]:
+        """Configured shard ids, used until Redis reports the live ones"""
+        return [str(i) for i in range(self.shard_count)]
+    
+    def owner(self, room_id: str) -> str:
+        """Shard id owning a room"""
+        if not self.enabled:
+            return self.shard_id
+        return self.ring.node_for(room_id)
+    
+    def is_local(self, room_id: str) -> bool:
+        """Whether this process owns a room"""
+        return self.owner(room_id) == self.shard_id
+    
+    def add_change_hook(self, hook: Callable[[], Awaitable[None]]):
+        """Register a coroutine called after the ring changes"""
+        self._change_hooks.append(hook)
+    
+    async def refresh(self) -> bool:
+        """Heartbeat and rebuild the ring from live shards; returns whether it changed"""
+        if not self.enabled or not redis_client.redis:
+            return False
+        
+        now = time.time()
+        await redis_client.zadd(self.NODES_KEY, {self.shard_id: now})
+        live = await redis_client.zrangebyscore(self.NODES_KEY, now - self.node_ttl, float("inf"))
+        ring = HashRing(set(live) | {self.shard_id})
+        if ring == self.ring:
+            return False
+        
+        logger.info(f"Shard ring changed: {self.ring.nodes} -> {ring.nodes}")
+        self.ring = ring
+        for hook in self._change_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Shard change hook failed: {e}")
+        return True
+    
+    async def hold(self, room_id: str) -> bool:
+        """Acquire or renew this shard's lease on a room"""
+        if not self.enabled or not redis_client.redis:
+            return True
+        key = self.LEASE_KEY.format(room_id=room_id)
+        if await redis_client.expire_if_equal(key, self.shard_id, self.lease_ttl):
+            return True
+        return await redis_client.set_nx(key, self.shard_id, self.lease_ttl)
+    
+    async def release(self, room_id: str):
+        """Give up this shard's lease on a room"""
+        if self.enabled:
+            await redis_client.delete_if_equal(self.LEASE_KEY.format(room_id=room_id), self.shard_id)
+    
+    async def run(self):
+        """Background membership loop"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Shard refresh failed: {e}")
+            await asyncio.sleep(self.node_ttl / 3)
+
+
+# Global shard router instance
+shard_router = ShardRouter(
+    shard_id=settings.shard_id,
+    shard_count=settings.shard_count,
+    node_ttl=settings.shard_node_ttl
+)
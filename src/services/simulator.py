@@ -0,0 +1,156 @@
+"""
+Game Simulator
+Monte Carlo estimates of game length and split wins, for setting prize pools
+and draw intervals
+"""
+import argparse
+import json
+import random
+from typing import Any, Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only the simulator needs it
+    np = None
+
+from src.services.game_service import CardGenerator, PatternVerifier
+
+# Cells gathered per batch (games x cards x card cells); bounds memory
+BATCH_CELLS = 4_000_000
+# Games simulated on a fresh set of cards
+GAMES_PER_CARD_SET = 256
+
+
+class GameSimulator:
+    """
+    Vectorized bingo simulator
+    Rather than marking a cards x draws boolean matrix draw by draw, each
+    cell is mapped to the draw that calls it (its rank in the shuffled order).
+    A line completes at the max rank of its cells, a card wins at the
+    `required`-th line to complete, and a game ends at the min over cards;
+    every step is one NumPy reduction over all games of a batch.
+    """
+    
+    @staticmethod
+    def number_count(variant: str) -> int:
+        return 90 if variant == "90" else 75
+    
+    @staticmethod
+    def pattern_lines(pattern: str, variant: str = "75"):
+        """Lines of a pattern as (lines x cells) indexes into a card, and how many must complete"""
+        if variant == "90":
+            # 90-ball cards are reduced to their 15 numbers, five per row
+            rows = np.arange(15).reshape(3, 5)
+            if pattern == "one_line":
+                return rows, 1
+            if pattern == "two_lines":
+                return rows, 2
+            if pattern == "full_house":
+                return np.arange(15).reshape(1, 15), 1
+        elif pattern in PatternVerifier.PATTERNS_75:
+            masks = PatternVerifier.PATTERNS_75[pattern]
+            return np.array([np.flatnonzero(np.array(mask)) for mask in masks]), 1
+        raise ValueError(f"Unknown pattern '{pattern}' for variant {variant}")
+    
+    @staticmethod
+    def card_values(variant: str, count: int, rng: random.Random):
+        """Numbers of `count` generated cards as a (cards x cells) array; 0 is the free cell"""
+        values = []
+        for _ in range(count):
+            grid = CardGenerator.generate_card(variant, rng)
+            cells = [cell["value"] or 0 for row in grid for cell in row]
+            if variant == "90":
+                cells = [value for value in cells if value]
+            values.append(cells)
+        return np.array(values, dtype=np.intp)
+    
+    @staticmethod
+    def _batch(values, lines, required: int, numbers: int, games: int, rng):
+        """First-win draw and winner count of `games` games over one card set"""
+        # ranks[g, n] is the draw that calls number n in game g; 0 (the free
+        # cell) counts as called before the first draw
+        order = rng.random((games, numbers)).argsort(axis=1)
+        ranks = np.zeros((games, numbers + 1), dtype=np.uint8)
+        np.put_along_axis(ranks[:, 1:], order, np.arange(1, numbers + 1, dtype=np.uint8)[None, :], axis=1)
+        
+        called_at = ranks[:, values]  # games x cards x cells
+        line_done = called_at[..., lines].max(axis=-1)  # games x cards x lines
+        if required == 1:
+            card_done = line_done.min(axis=-1)
+        else:
+            card_done = np.partition(line_done, required - 1, axis=-1)[..., required - 1]
+        first = card_done.min(axis=1)
+        winners = (card_done == first[:, None]).sum(axis=1)
+        return first, winners
+    
+    @staticmethod
+    def simulate(
+        variant: str = "75",
+        pattern: str = "horizontal_line",
+        cards: int = 1,
+        games: int = 10000,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Simulate `games` games with `cards` cards in play
+        Returns the expected draws to the first win, its percentiles, and the
+        probability that more than one card wins on that draw.
+        """
+        if np is None:
+            raise RuntimeError("The simulator requires numpy")
+        if cards < 1 or games < 1:
+            raise ValueError("cards and games must be positive")
+        
+        lines, required = GameSimulator.pattern_lines(pattern, variant)
+        numbers = GameSimulator.number_count(variant)
+        card_rng = random.Random(seed)
+        rng = np.random.default_rng(seed)
+        
+        firsts, winner_counts = [], []
+        values = None
+        done = 0
+        while done < games:
+            if done % GAMES_PER_CARD_SET == 0:
+                values = GameSimulator.card_values(variant, cards, card_rng)
+            batch = max(1, min(
+                games - done,
+                GAMES_PER_CARD_SET - done % GAMES_PER_CARD_SET,
+                BATCH_CELLS // values.size
+            ))
+            first, winners = GameSimulator._batch(values, lines, required, numbers, batch, rng)
+            firsts.append(first)
+            winner_counts.append(winners)
+            done += batch
+        
+        first = np.concatenate(firsts)
+        winners = np.concatenate(winner_counts)
+        p50, p90, p99 = np.percentile(first, [50, 90, 99])
+        return {
+            "variant": variant,
+            "pattern": pattern,
+            "cards": cards,
+            "games": games,
+            "mean_draws": round(float(first.mean()), 2),
+            "p50_draws": int(p50),
+            "p90_draws": int(p90),
+            "p99_draws": int(p99),
+            "min_draws": int(first.min()),
+            "max_draws": int(first.max()),
+            "split_probability": round(float((winners > 1).mean()), 4),
+            "mean_winners": round(float(winners.mean()), 3)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate bingo games")
+    parser.add_argument("--variant", default="75", choices=["75", "90"])
+    parser.add_argument("--pattern", default="horizontal_line")
+    parser.add_argument("--cards", type=int, default=1)
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    print(json.dumps(GameSimulator.simulate(args.variant, args.pattern, args.cards, args.games, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
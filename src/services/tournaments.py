@@ -0,0 +1,350 @@
+"""
+Tournaments
+Rounds of many rooms that start together at a scheduled time
+"""
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.core.redis import redis_client
+from src.models import Card, GameRoom, Tournament
+from src.services.game_service import CardGenerator, DrawEngine
+from src.services.leaderboards import leaderboards
+
+logger = logging.getLogger(__name__)
+
+# Called with (tournament_id, round, room_ids, draw_interval) when a round runs
+StartHook = Callable[[str, int, List[str], int], Awaitable[None]]
+
+
+class TournamentFull(Exception):
+    """Every seat of the first round is taken"""
+
+
+class TournamentScheduler:
+    """
+    Scheduled starts of tournament rounds
+    Rooms and their cards are created ahead of time: round-one rooms when
+    the tournament is created and cards as players register, later rounds as
+    soon as the previous one ends. At the start time one UPDATE moves every
+    room of the round to running, whichever API process gets there first;
+    start hooks then drive the draws of each process's own rooms. A round
+    ends once none of its rooms is running, and its winners are seated in the
+    next round's rooms, until a single room decides the champions.
+    """
+    
+    SEATS_KEY = "tournament:seats:{tournament_id}"
+    
+    def __init__(self, poll_interval: float = 1.0, round_break: int = 60):
+        self.poll_interval = poll_interval
+        self.round_break = round_break
+        self._start_hooks: List[StartHook] = []
+        self._started: Set[Tuple[str, int]] = set()
+    
+    def add_start_hook(self, hook: StartHook):
+        """Register a coroutine called in every process when a round starts"""
+        self._start_hooks.append(hook)
+    
+    def forget(self):
+        """Call the start hooks again for running rounds, e.g. after rooms changed shard"""
+        self._started.clear()
+    
+    @staticmethod
+    def stagger(room_ids: List[str], slots: int) -> List[List[str]]:
+        """Split rooms into at most `slots` groups drawn at evenly spaced offsets"""
+        count = max(min(slots, len(room_ids)), 1)
+        return [room_ids[slot::count] for slot in range(count)]
+    
+    @staticmethod
+    def _new_rooms(tournament: Tournament, round_number: int, count: int) -> List[GameRoom]:
+        """Unsaved lobby rooms of one round, with their draw pools and card series"""
+        max_num = 90 if tournament.variant == "90" else 75
+        rooms = []
+        for _ in range(count):
+            draw_pool, seed = DrawEngine.initialize_draw_pool(1, max_num)
+            rooms.append(GameRoom(
+                host_id=tournament.host_id,
+                variant=tournament.variant,
+                number_range_min=1,
+                number_range_max=max_num,
+                cards_per_player=tournament.cards_per_player,
+                pattern={"id": tournament.pattern, "variant": tournament.variant},
+                state="lobby",
+                draw_pool=draw_pool,
+                winners=[],
+                draw_interval=tournament.draw_interval,
+                # Drawn by the tournament's start hooks, not per-room loops
+                auto_draw=False,
+                draw_seed=seed,
+                # Derived cards, so claims are marked from the called numbers
+                card_seed=settings.card_series_seed or CardGenerator.new_series_seed(),
+                tournament_id=tournament.id,
+                tournament_round=round_number
+            ))
+        return rooms
+    
+    @staticmethod
+    def create(
+        db: Session,
+        host_id: str,
+        name: str,
+        rooms: int,
+        starts_at: datetime,
+        variant: str = "75",
+        pattern: str = "horizontal_line",
+        players_per_room: int = 10,
+        cards_per_player: int = 1,
+        draw_interval: int = 5
+    ) -> Tournament:
+        """Create a tournament with its first-round rooms in one commit"""
+        tournament = Tournament(
+            name=name,
+            host_id=host_id,
+            variant=variant,
+            pattern=pattern,
+            cards_per_player=cards_per_player,
+            players_per_room=players_per_room,
+            draw_interval=draw_interval,
+            state="scheduled",
+            round=1,
+            starts_at=starts_at,
+            champions=[]
+        )
+        db.add(tournament)
+        db.flush()
+        db.add_all(TournamentScheduler._new_rooms(tournament, 1, rooms))
+        db.commit()
+        db.refresh(tournament)
+        return tournament
+    
+    @staticmethod
+    def round_rooms(db: Session, tournament_id: str, round_number: int) -> List[GameRoom]:
+        """Rooms of one round, in seating order"""
+        return db.query(GameRoom).filter(
+            GameRoom.tournament_id == tournament_id,
+            GameRoom.tournament_round == round_number
+        ).order_by(GameRoom.id).all()
+    
+    @staticmethod
+    def seat_of(db: Session, tournament_id: str, round_number: int, player_id: str) -> Optional[str]:
+        """Room a player holds cards in for a round, if any"""
+        row = db.query(Card.room_id).join(GameRoom, Card.room_id == GameRoom.id).filter(
+            GameRoom.tournament_id == tournament_id,
+            GameRoom.tournament_round == round_number,
+            Card.owner_id == player_id
+        ).first()
+        return row.room_id if row else None
+    
+    async def register(self, db: Session, tournament: Tournament) -> GameRoom:
+        """
+        First-round room for a new player; rooms fill in order
+        Seats are numbered by a shared Redis counter, or by the players
+        already seated without Redis. Raises TournamentFull.
+        """
+        rooms = self.round_rooms(db, tournament.id, 1)
+        seat = await redis_client.incr(self.SEATS_KEY.format(tournament_id=tournament.id))
+        if seat is None:
+            seat = db.query(Card.owner_id).filter(
+                Card.room_id.in_([room.id for room in rooms])
+            ).distinct().count() + 1
+        index = (seat - 1) // tournament.players_per_room
+        if index >= len(rooms):
+            raise TournamentFull(f"Tournament {tournament.id} is full")
+        return rooms[index]
+    
+    @staticmethod
+    def round_players(db: Session, tournament_id: str, round_number: int) -> List[str]:
+        """Players holding cards in the running rooms of a round"""
+        rows = db.query(Card.owner_id).join(GameRoom, Card.room_id == GameRoom.id).filter(
+            GameRoom.tournament_id == tournament_id,
+            GameRoom.tournament_round == round_number,
+            GameRoom.state == "running"
+        ).distinct()
+        return [row.owner_id for row in rows]
+    
+    @staticmethod
+    def start_round(db: Session, tournament_id: str, now: Optional[datetime] = None) -> bool:
+        """
+        Move every lobby of the tournament's scheduled round to running
+        Two UPDATEs for the whole round instead of one transition per room;
+        rooms nobody joined are closed. Returns False if another process
+        started the round first or it is not due.
+        """
+        now = now or datetime.utcnow()
+        tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+        if tournament is None:
+            return False
+        claimed = db.query(Tournament).filter(
+            Tournament.id == tournament_id,
+            Tournament.state == "scheduled",
+            Tournament.round == tournament.round,
+            Tournament.starts_at <= now
+        ).update({Tournament.state: "running", Tournament.updated_at: now}, synchronize_session=False)
+        if not claimed:
+            db.rollback()
+            return False
+        
+        lobbies = db.query(GameRoom.id).filter(
+            GameRoom.tournament_id == tournament_id,
+            GameRoom.tournament_round == tournament.round,
+            GameRoom.state == "lobby"
+        )
+        seated = db.query(Card.room_id).filter(Card.room_id.in_(lobbies))
+        db.query(GameRoom).filter(
+            GameRoom.id.in_(lobbies),
+            ~GameRoom.id.in_(seated)
+        ).update(
+            {GameRoom.state: "finished", GameRoom.version: GameRoom.version + 1, GameRoom.updated_at: now},
+            synchronize_session=False
+        )
+        db.query(GameRoom).filter(GameRoom.id.in_(lobbies)).update(
+            {GameRoom.state: "running", GameRoom.version: GameRoom.version + 1, GameRoom.updated_at: now},
+            synchronize_session=False
+        )
+        db.commit()
+        return True
+    
+    @staticmethod
+    def advance(db: Session, tournament_id: str, round_break: int = 60, now: Optional[datetime] = None) -> bool:
+        """
+        Close a running round whose rooms all finished
+        Winners are seated, with fresh cards, in the next round's rooms,
+        scheduled `round_break` seconds later; the winners of a round that
+        could not shrink any further are the champions. Returns whether the
+        round was closed by this call.
+        """
+        now = now or datetime.utcnow()
+        tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+        if tournament is None or tournament.state != "running":
+            return False
+        in_round = db.query(GameRoom).filter(
+            GameRoom.tournament_id == tournament_id,
+            GameRoom.tournament_round == tournament.round
+        )
+        if in_round.with_entities(GameRoom.id).filter(GameRoom.state.in_(["lobby", "running"])).first():
+            return False
+        
+        rooms = in_round.with_entities(GameRoom.winners).order_by(GameRoom.id).all()
+        winners: List[str] = []
+        for room in rooms:
+            for winner in room.winners:
+                if winner["player_id"] not in winners:
+                    winners.append(winner["player_id"])
+        next_count = math.ceil(len(winners) / tournament.players_per_room)
+        final = len(winners) <= 1 or next_count >= len(rooms)
+        
+        changes = {Tournament.updated_at: now}
+        if final:
+            changes.update({Tournament.state: "finished", Tournament.champions: winners})
+        else:
+            changes.update({
+                Tournament.state: "scheduled",
+                Tournament.round: tournament.round + 1,
+                Tournament.starts_at: now + timedelta(seconds=round_break)
+            })
+        claimed = db.query(Tournament).filter(
+            Tournament.id == tournament_id,
+            Tournament.state == "running",
+            Tournament.round == tournament.round
+        ).update(changes, synchronize_session=False)
+        if not claimed:
+            db.rollback()
+            return False
+        
+        if not final:
+            next_rooms = TournamentScheduler._new_rooms(tournament, tournament.round + 1, next_count)
+            seated: List[List[str]] = [winners[index::next_count] for index in range(next_count)]
+            for room, players in zip(next_rooms, seated):
+                room.cards_issued = len(players) * room.cards_per_player
+            db.add_all(next_rooms)
+            db.flush()
+            for room, players in zip(next_rooms, seated):
+                serial = 0
+                for player_id in players:
+                    for _ in range(room.cards_per_player):
+                        serial += 1
+                        db.add(Card(room_id=room.id, owner_id=player_id, variant=room.variant, serial=serial))
+        db.commit()
+        return True
+    
+    def _tick(self) -> Tuple[List[Tuple[str, int, List[str], int]], List[List[str]], Optional[datetime]]:
+        """
+        Start due rounds and close finished ones; returns the running rounds
+        whose hooks have not run here, as (tournament_id, round, room_ids,
+        draw_interval), the players of each round started by this pass, and
+        the next scheduled start
+        """
+        now = datetime.utcnow()
+        started = []
+        with get_db() as db:
+            due = db.query(Tournament.id, Tournament.round).filter(
+                Tournament.state == "scheduled",
+                Tournament.starts_at <= now
+            ).all()
+            for row in due:
+                if TournamentScheduler.start_round(db, row.id, now):
+                    logger.info(f"Started a round of tournament {row.id}")
+                    started.append(TournamentScheduler.round_players(db, row.id, row.round))
+            
+            running = []
+            for tournament in db.query(Tournament).filter(Tournament.state == "running").all():
+                if TournamentScheduler.advance(db, tournament.id, self.round_break, now):
+                    continue
+                if (tournament.id, tournament.round) in self._started:
+                    continue
+                room_ids = [
+                    row.id for row in db.query(GameRoom.id).filter(
+                        GameRoom.tournament_id == tournament.id,
+                        GameRoom.tournament_round == tournament.round,
+                        GameRoom.state == "running"
+                    ).order_by(GameRoom.id)
+                ]
+                running.append((tournament.id, tournament.round, room_ids, tournament.draw_interval))
+            
+            next_start = db.query(Tournament.starts_at).filter(
+                Tournament.state == "scheduled"
+            ).order_by(Tournament.starts_at).first()
+        return running, started, next_start.starts_at if next_start else None
+    
+    async def run_once(self) -> float:
+        """One scheduling pass; returns seconds until the next pass"""
+        running, started, next_start = await asyncio.to_thread(self._tick)
+        # Only the process that started a round counts its games
+        for players in started:
+            await leaderboards.record_games(players)
+        for tournament_id, round_number, room_ids, draw_interval in running:
+            self._started.add((tournament_id, round_number))
+            for hook in self._start_hooks:
+                try:
+                    await hook(tournament_id, round_number, room_ids, draw_interval)
+                except Exception as e:
+                    logger.error(f"Start hook failed for tournament {tournament_id}: {e}")
+        
+        # Wake exactly at the next start instead of up to a poll late
+        if next_start is not None:
+            until = (next_start - datetime.utcnow()).total_seconds()
+            return min(max(until, 0.0), self.poll_interval)
+        return self.poll_interval
+    
+    async def run(self):
+        """Background scheduling loop"""
+        while True:
+            try:
+                delay = await self.run_once()
+            except Exception as e:
+                logger.error(f"Tournament scheduler failed: {e}")
+                delay = self.poll_interval
+            await asyncio.sleep(delay)
+
+
+# Global tournament scheduler instance
+tournament_scheduler = TournamentScheduler(
+    poll_interval=settings.tournament_poll_interval,
+    round_break=settings.tournament_round_break
+)
@@ -9,15 +9,36 @@ const state = {
     roomId: null,
     playerId: null,
     cards: [],
-    currentCard: null,
+    cardSet: null,
     calledNumbers: [],
+    drawHashes: [],
     isHost: false,
-    ws: null
+    ws: null,
+    shard: null,
+    lastSeq: null,
+    reconnectDelay: 1000,
+    finished: false,
+    spectator: false
 };
 
+// Renderers, created once the DOM is ready
+let board = null;
+let calledStrip = null;
+
 // API Base URL
 const API_BASE = window.location.origin;
 
+// Room requests carry the room's shard so the proxy routes them to its owner
+async function roomFetch(roomId, path = '', options = {}) {
+    const query = state.shard === null ? '' : `?shard=${state.shard}`;
+    const response = await fetch(`${API_BASE}/api/rooms/${roomId}${path}${query}`, options);
+    const shard = response.headers.get('X-Bingo-Shard');
+    if (shard !== null) {
+        state.shard = shard;
+    }
+    return response;
+}
+
 // Initialize Application
 async function init() {
     try {
@@ -38,12 +59,18 @@ async function init() {
         const roomCode = urlParams.get('room');
         const variant = urlParams.get('variant') || '75';
         
-        // Setup event listeners
+        // Setup renderers and event listeners
+        board = new BingoRenderer.CardBoard(document.getElementById('card-container'));
+        calledStrip = new BingoRenderer.CalledStrip(document.getElementById('called-numbers-strip'));
         setupEventListeners();
         
         // Handle different actions
         if (action === 'create') {
             await createRoom(variant);
+        } else if (action === 'quick') {
+            await quickPlay(variant);
+        } else if (action === 'watch' && roomCode) {
+            await watchRoomByCode(roomCode);
         } else if (roomCode) {
             await joinRoomByCode(roomCode);
         } else {
@@ -72,7 +99,7 @@ function hideScreen(screenId) {
 // Event Listeners Setup
 function setupEventListeners() {
     document.getElementById('btn-create').addEventListener('click', () => createRoom('75'));
-    document.getElementById('btn-quick-play').addEventListener('click', quickPlay);
+    document.getElementById('btn-quick-play').addEventListener('click', () => quickPlay('75'));
     document.getElementById('btn-start').addEventListener('click', startGame);
     document.getElementById('btn-claim').addEventListener('click', claimBingo);
     document.getElementById('btn-new-game').addEventListener('click', () => {
@@ -98,6 +125,7 @@ async function createRoom(variant = '75') {
         
         const data = await response.json();
         state.roomId = data.room_id;
+        state.shard = data.shard;
         state.isHost = true;
         
         // Update UI
@@ -119,9 +147,16 @@ async function createRoom(variant = '75') {
 
 async function joinRoomByCode(roomCode) {
     try {
-        // In a real implementation, you'd have an endpoint to resolve room code to ID
-        // For now, we'll use the code as the ID
-        await joinRoom(roomCode);
+        const response = await fetch(`${API_BASE}/api/codes/${encodeURIComponent(roomCode)}`);
+        if (!response.ok) {
+            tg.showAlert('Room not found');
+            showScreen('lobby-screen');
+            return;
+        }
+        const data = await response.json();
+        state.shard = data.shard;
+        document.getElementById('room-code').textContent = data.room_code;
+        await joinRoom(data.room_id);
     } catch (error) {
         console.error('Join room error:', error);
         tg.showAlert('Failed to join room');
@@ -130,35 +165,66 @@ async function joinRoomByCode(roomCode) {
 
 async function joinRoom(roomId) {
     try {
-        const response = await fetch(`${API_BASE}/api/rooms/${roomId}/join`, {
+        const response = await roomFetch(roomId, '/join', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ player_id: state.playerId })
         });
         
-        const data = await response.json();
-        state.cards = data.cards;
-        state.currentCard = data.cards[0];
-        
-        // Connect WebSocket
-        connectWebSocket(roomId);
-        
-        showScreen('lobby-screen');
+        enterRoom(await response.json());
     } catch (error) {
         console.error('Join room error:', error);
         throw error;
     }
 }
 
-async function quickPlay() {
-    // Create a room and auto-start
-    await createRoom('75');
-    setTimeout(() => startGame(), 1000);
+// Take the seat a join (or quick play) response describes
+function enterRoom(data) {
+    state.roomId = data.room_id;
+    data.cards.forEach(card => {
+        card.variant = card.variant || data.variant;
+        if (data.card_seed) {
+            // Derived cards: regenerate grids locally from seed + serial
+            card.grid = BingoCards.deriveCard(data.card_seed, card.serial, card.variant);
+        }
+    });
+    state.cards = data.cards;
+    state.cardSet = new BingoPatterns.CardSet(data.cards, data.pattern);
+    
+    // Connect WebSocket
+    connectWebSocket(state.roomId);
+    
+    // Joining the last seat of a public lobby starts it
+    if (data.state === 'running') {
+        showGameScreen();
+    } else {
+        showScreen('lobby-screen');
+    }
+}
+
+async function quickPlay(variant = '75') {
+    // Seat in the fullest public lobby; it starts itself once full
+    try {
+        const params = new URLSearchParams({ player_id: state.playerId, variant: variant });
+        const response = await fetch(`${API_BASE}/api/lobbies/quick-play?${params}`, { method: 'POST' });
+        if (!response.ok) {
+            throw new Error(`Quick play failed: ${response.status}`);
+        }
+        state.shard = response.headers.get('X-Bingo-Shard');
+        const data = await response.json();
+        enterRoom(data);
+        if (data.state !== 'running') {
+            tg.showAlert('Waiting for players to join...');
+        }
+    } catch (error) {
+        console.error('Quick play error:', error);
+        tg.showAlert('Failed to find a game');
+    }
 }
 
 async function startGame() {
     try {
-        const response = await fetch(`${API_BASE}/api/rooms/${state.roomId}/start`, {
+        const response = await roomFetch(state.roomId, '/start', {
             method: 'POST'
         });
         
@@ -174,17 +240,32 @@ async function startGame() {
 // WebSocket Connection
 function connectWebSocket(roomId) {
     const wsProtocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = `${wsProtocol}//${window.location.host}/ws/${roomId}`;
+    // Resume from the last event seen so the server replays only what we missed
+    const params = new URLSearchParams();
+    if (state.shard !== null) {
+        params.set('shard', state.shard);
+    }
+    if (state.lastSeq !== null) {
+        params.set('last_seq', state.lastSeq);
+    }
+    const wsUrl = `${wsProtocol}//${window.location.host}/ws/${roomId}?${params}`;
     
     state.ws = new WebSocket(wsUrl);
     
     state.ws.onopen = () => {
         console.log('WebSocket connected');
+        state.reconnectDelay = 1000;
     };
     
     state.ws.onmessage = (event) => {
         const message = JSON.parse(event.data);
-        handleWebSocketMessage(message);
+        if (message.type === 'moved') {
+            // The room lives on another shard; reconnect there right away
+            state.shard = message.shard;
+            state.reconnectDelay = 250;
+            return;
+        }
+        applyRoomMessage(message);
     };
     
     state.ws.onerror = (error) => {
@@ -193,23 +274,147 @@ function connectWebSocket(roomId) {
     
     state.ws.onclose = () => {
         console.log('WebSocket disconnected');
+        if (state.finished) {
+            return;
+        }
+        // Reconnect with jittered backoff so a blip does not reconnect everyone at once
+        const delay = state.reconnectDelay * (0.5 + Math.random());
+        state.reconnectDelay = Math.min(state.reconnectDelay * 2, 30000);
+        setTimeout(() => connectWebSocket(roomId), delay);
     };
-    
-    // Keep alive
-    setInterval(() => {
-        if (state.ws.readyState === WebSocket.OPEN) {
-            state.ws.send(JSON.stringify({ type: 'ping' }));
+}
+
+// Keep alive
+setInterval(() => {
+    if (state.ws && state.ws.readyState === WebSocket.OPEN) {
+        state.ws.send(JSON.stringify({ type: 'ping' }));
+    }
+}, 30000);
+
+// Apply each room event once and in order, whichever transport delivered it
+function applyRoomMessage(message) {
+    if (message.seq !== undefined && message.type !== 'welcome' && message.type !== 'resync') {
+        if (state.lastSeq !== null && message.seq <= state.lastSeq) {
+            return;  // Already applied
+        }
+        state.lastSeq = message.seq;
+    }
+    handleWebSocketMessage(message);
+}
+
+// Spectators follow a room read-only over Server-Sent Events, without a seat
+async function watchRoomByCode(roomCode) {
+    const response = await fetch(`${API_BASE}/api/codes/${encodeURIComponent(roomCode)}`);
+    if (!response.ok) {
+        tg.showAlert('Room not found');
+        showScreen('lobby-screen');
+        return;
+    }
+    const data = await response.json();
+    state.shard = data.shard;
+    state.roomId = data.room_id;
+    state.spectator = true;
+    document.getElementById('room-code').textContent = data.room_code;
+    document.getElementById('btn-claim').hidden = true;
+    showScreen('lobby-screen');
+    connectSpectator(state.roomId);
+}
+
+function spectatorUrl(roomId, path) {
+    const params = new URLSearchParams();
+    if (state.shard !== null) {
+        params.set('shard', state.shard);
+    }
+    if (state.lastSeq !== null) {
+        params.set('last_seq', state.lastSeq);
+    }
+    return `${API_BASE}/api/rooms/${roomId}${path}?${params}`;
+}
+
+function connectSpectator(roomId) {
+    if (!window.EventSource) {
+        pollSpectator(roomId);
+        return;
+    }
+    // EventSource reconnects by itself, resuming from the last event id
+    const source = new EventSource(spectatorUrl(roomId, '/events'));
+    source.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'moved') {
+            source.close();
+            state.shard = message.shard;
+            connectSpectator(roomId);
+        } else if (message.type === 'closed' || state.finished) {
+            source.close();
+        } else {
+            applyRoomMessage(message);
+        }
+    };
+    source.onerror = () => {
+        // Refused outright (e.g. a proxy without streaming): fall back to long-polling
+        if (source.readyState === EventSource.CLOSED) {
+            pollSpectator(roomId);
         }
-    }, 30000);
+    };
+}
+
+async function pollSpectator(roomId) {
+    while (!state.finished) {
+        try {
+            const response = await fetch(spectatorUrl(roomId, '/events/poll'));
+            if (!response.ok) {
+                throw new Error(`Poll failed: ${response.status}`);
+            }
+            const data = await response.json();
+            if (data.resync || state.lastSeq === null) {
+                state.lastSeq = data.seq;
+                await resyncRoom();
+            }
+            for (const message of data.events) {
+                if (message.type === 'moved') {
+                    state.shard = message.shard;
+                } else if (message.type === 'closed') {
+                    return;
+                } else {
+                    applyRoomMessage(message);
+                }
+            }
+            state.reconnectDelay = 1000;
+        } catch (error) {
+            console.error('Spectator poll error:', error);
+            const delay = state.reconnectDelay * (0.5 + Math.random());
+            state.reconnectDelay = Math.min(state.reconnectDelay * 2, 30000);
+            await new Promise(resolve => setTimeout(resolve, delay));
+        }
+    }
 }
 
 function handleWebSocketMessage(message) {
     switch (message.type) {
+        case 'welcome':
+            state.lastSeq = message.seq;
+            if (state.spectator) {
+                resyncRoom();  // Catch up on numbers called before we tuned in
+            }
+            break;
+        
+        case 'ping':
+            // Server heartbeat
+            state.ws.send(JSON.stringify({ type: 'pong' }));
+            break;
+        
+        case 'resync':
+            // Missed events were evicted from the server's buffer
+            state.lastSeq = message.seq;
+            resyncRoom();
+            break;
+        
         case 'game_started':
             showGameScreen();
             break;
         
         case 'number_drawn':
+            state.drawHashes[message.sequence - 1] = message.hash;
             addCalledNumber(message.number);
             updateLastNumber(message.number);
             autoMarkCard(message.number);
@@ -219,96 +424,49 @@ function handleWebSocketMessage(message) {
             handleClaimResult(message);
             break;
         
+        case 'game_finished':
+            // Numbers ran out without a winner
+            state.finished = true;
+            if (message.fairness && message.fairness.server_seed) {
+                showFairnessResult(message.fairness);
+            }
+            break;
+        
         case 'player_joined':
             addPlayerToList(message.player);
             break;
     }
 }
 
-// Game Screen
-function showGameScreen() {
-    showScreen('game-screen');
-    renderCard(state.currentCard);
-}
-
-function renderCard(card) {
-    const container = document.getElementById('card-container');
-    container.innerHTML = '';
-    
-    const variant = card.variant || '75';
-    const cardDiv = document.createElement('div');
-    cardDiv.className = 'bingo-card';
-    
-    // Add column headers for 75-ball
-    if (variant === '75') {
-        const headerDiv = document.createElement('div');
-        headerDiv.className = 'card-header';
-        ['B', 'I', 'N', 'G', 'O'].forEach(letter => {
-            const label = document.createElement('div');
-            label.className = 'card-column-label';
-            label.textContent = letter;
-            headerDiv.appendChild(label);
-        });
-        cardDiv.appendChild(headerDiv);
+// Reload the full room state after a gap in the event stream
+async function resyncRoom() {
+    const response = await roomFetch(state.roomId);
+    const room = await response.json();
+    if (room.state === 'running' && !document.getElementById('game-screen').classList.contains('active')) {
+        showGameScreen();
+    }
+    if (board.set) {
+        room.called_numbers.forEach(number => board.mark(number));
+    }
+    state.calledNumbers = room.called_numbers.slice();
+    calledStrip.reset(state.calledNumbers);
+    document.getElementById('numbers-called').textContent = state.calledNumbers.length;
+    if (state.calledNumbers.length) {
+        updateLastNumber(state.calledNumbers[state.calledNumbers.length - 1]);
     }
-    
-    // Add grid
-    const gridDiv = document.createElement('div');
-    gridDiv.className = `card-grid card-grid-${variant}`;
-    
-    card.grid.forEach((row, rowIndex) => {
-        row.forEach((cell, colIndex) => {
-            const cellDiv = document.createElement('div');
-            cellDiv.className = 'card-cell';
-            cellDiv.dataset.row = rowIndex;
-            cellDiv.dataset.col = colIndex;
-            
-            if (cell.free) {
-                cellDiv.classList.add('free');
-                cellDiv.textContent = 'FREE';
-            } else if (cell.value === null) {
-                cellDiv.classList.add('blank');
-            } else {
-                cellDiv.textContent = cell.value;
-                if (cell.marked) {
-                    cellDiv.classList.add('marked');
-                }
-                
-                // Add click handler for manual marking
-                cellDiv.addEventListener('click', () => {
-                    toggleCellMark(rowIndex, colIndex);
-                });
-            }
-            
-            gridDiv.appendChild(cellDiv);
-        });
-    });
-    
-    cardDiv.appendChild(gridDiv);
-    container.appendChild(cardDiv);
 }
 
-function toggleCellMark(row, col) {
-    const cell = state.currentCard.grid[row][col];
-    if (cell.value !== null && !cell.free) {
-        cell.marked = !cell.marked;
-        renderCard(state.currentCard);
+// Game Screen
+function showGameScreen() {
+    showScreen('game-screen');
+    // Spectators have no cards; they see the called numbers only
+    if (state.cardSet) {
+        board.render(state.cardSet);
     }
 }
 
 function autoMarkCard(number) {
-    let updated = false;
-    state.currentCard.grid.forEach(row => {
-        row.forEach(cell => {
-            if (cell.value === number && !cell.marked) {
-                cell.marked = true;
-                updated = true;
-            }
-        });
-    });
-    
-    if (updated) {
-        renderCard(state.currentCard);
+    if (board.set && board.mark(number) > 0) {
         // Vibrate for feedback
         if (tg.HapticFeedback) {
             tg.HapticFeedback.impactOccurred('light');
@@ -318,15 +476,7 @@ function autoMarkCard(number) {
 
 function addCalledNumber(number) {
     state.calledNumbers.push(number);
-    
-    const strip = document.getElementById('called-numbers-strip');
-    const chip = document.createElement('div');
-    chip.className = 'called-number-chip';
-    chip.textContent = number;
-    strip.appendChild(chip);
-    
-    // Scroll to end
-    strip.scrollLeft = strip.scrollWidth;
+    calledStrip.push(number);
     
     // Update counter
     document.getElementById('numbers-called').textContent = state.calledNumbers.length;
@@ -338,13 +488,15 @@ function updateLastNumber(number) {
 
 // Claim Bingo
 async function claimBingo() {
+    // Claim with the card closest to a bingo
+    const card = state.cards[state.cardSet.bestCard()];
     try {
-        const response = await fetch(`${API_BASE}/api/rooms/${state.roomId}/claim`, {
+        const response = await roomFetch(state.roomId, '/claim', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
                 player_id: state.playerId,
-                card_id: state.currentCard.id
+                card_id: card.id
             })
         });
         
@@ -364,14 +516,38 @@ async function claimBingo() {
 
 function handleClaimResult(message) {
     if (message.valid) {
+        state.finished = true;
         document.getElementById('winner-message').textContent = 
             message.player_id === state.playerId ? 
             'Congratulations! You won!' : 
-            'Game Over! Another player won.';
+            state.spectator ? 'Game Over!' : 'Game Over! Another player won.';
         showScreen('winner-screen');
+        if (message.fairness && message.fairness.server_seed) {
+            showFairnessResult(message.fairness);
+        }
     }
 }
 
+async function showFairnessResult(fairness) {
+    // Re-derive the whole draw locally from the revealed seed; the full
+    // history is fetched in case we joined or reconnected mid-game
+    const response = await roomFetch(state.roomId);
+    const room = await response.json();
+    const [min, max] = fairness.number_range;
+    const result = BingoVerifier.verifyGame({
+        serverSeed: fairness.server_seed,
+        clientSeed: fairness.client_seed,
+        commitment: fairness.commitment,
+        min: min,
+        max: max,
+        calledNumbers: room.called_numbers,
+        hashes: state.drawHashes
+    });
+    const element = document.getElementById('fairness-result');
+    element.textContent = result.valid ? `✅ Fair draw: ${result.message}` : `⚠️ ${result.message}`;
+    element.style.display = 'block';
+}
+
 // Helper Functions
 function addPlayerToList(player) {
     const container = document.getElementById('players-container');
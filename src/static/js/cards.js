@@ -0,0 +1,186 @@
+// Ethio Bingo - Deterministic card derivation
+// Mirrors HashStream and CardGenerator in src/services/game_service.py so a
+// card can be regenerated from (seed, serial) without downloading its grid.
+
+const BingoCards = (() => {
+    // SHA-256 round constants
+    const K = new Uint32Array([
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+    ]);
+
+    const encoder = new TextEncoder();
+    const W = new Uint32Array(64);
+
+    // Synchronous SHA-256 (crypto.subtle is async and needs a secure context)
+    function sha256(input) {
+        const data = typeof input === 'string' ? encoder.encode(input) : input;
+        const bitLength = data.length * 8;
+        const padded = new Uint8Array(((data.length + 9 + 63) >> 6) << 6);
+        padded.set(data);
+        padded[data.length] = 0x80;
+        const view = new DataView(padded.buffer);
+        view.setUint32(padded.length - 8, Math.floor(bitLength / 0x100000000));
+        view.setUint32(padded.length - 4, bitLength >>> 0);
+
+        const H = new Uint32Array([
+            0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+            0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+        ]);
+
+        for (let offset = 0; offset < padded.length; offset += 64) {
+            for (let i = 0; i < 16; i++) {
+                W[i] = view.getUint32(offset + i * 4);
+            }
+            for (let i = 16; i < 64; i++) {
+                const w15 = W[i - 15];
+                const w2 = W[i - 2];
+                const s0 = ((w15 >>> 7) | (w15 << 25)) ^ ((w15 >>> 18) | (w15 << 14)) ^ (w15 >>> 3);
+                const s1 = ((w2 >>> 17) | (w2 << 15)) ^ ((w2 >>> 19) | (w2 << 13)) ^ (w2 >>> 10);
+                W[i] = W[i - 16] + s0 + W[i - 7] + s1;
+            }
+
+            let a = H[0], b = H[1], c = H[2], d = H[3];
+            let e = H[4], f = H[5], g = H[6], h = H[7];
+            for (let i = 0; i < 64; i++) {
+                const S1 = ((e >>> 6) | (e << 26)) ^ ((e >>> 11) | (e << 21)) ^ ((e >>> 25) | (e << 7));
+                const ch = (e & f) ^ (~e & g);
+                const t1 = (h + S1 + ch + K[i] + W[i]) | 0;
+                const S0 = ((a >>> 2) | (a << 30)) ^ ((a >>> 13) | (a << 19)) ^ ((a >>> 22) | (a << 10));
+                const maj = (a & b) ^ (a & c) ^ (b & c);
+                const t2 = (S0 + maj) | 0;
+                h = g; g = f; f = e; e = (d + t1) | 0;
+                d = c; c = b; b = a; a = (t1 + t2) | 0;
+            }
+            H[0] += a; H[1] += b; H[2] += c; H[3] += d;
+            H[4] += e; H[5] += f; H[6] += g; H[7] += h;
+        }
+
+        const digest = new Uint8Array(32);
+        const out = new DataView(digest.buffer);
+        H.forEach((word, i) => out.setUint32(i * 4, word));
+        return digest;
+    }
+
+    // SHA-256 counter-mode stream over a text key (see HashStream)
+    class HashStream {
+        constructor(key) {
+            this.key = key;
+            this.counter = 0;
+            this.words = [];
+            this.index = 0;
+        }
+
+        nextWord() {
+            if (this.index >= this.words.length) {
+                const view = new DataView(sha256(`${this.key}:${this.counter}`).buffer);
+                this.counter += 1;
+                this.words = [];
+                for (let i = 0; i < 8; i++) {
+                    this.words.push(view.getUint32(i * 4));
+                }
+                this.index = 0;
+            }
+            return this.words[this.index++];
+        }
+
+        randbelow(n) {
+            const limit = 0x100000000 - (0x100000000 % n);
+            while (true) {
+                const word = this.nextWord();
+                if (word < limit) {
+                    return word % n;
+                }
+            }
+        }
+
+        randint(a, b) {
+            return a + this.randbelow(b - a + 1);
+        }
+
+        sample(population, k) {
+            const pool = population.slice();
+            for (let i = 0; i < k; i++) {
+                const j = i + this.randbelow(pool.length - i);
+                [pool[i], pool[j]] = [pool[j], pool[i]];
+            }
+            return pool.slice(0, k);
+        }
+    }
+
+    function derive75(rng) {
+        const ranges = [[1, 15], [16, 30], [31, 45], [46, 60], [61, 75]];
+        const values = [];
+        for (let row = 0; row < 5; row++) {
+            const valueRow = [];
+            for (let col = 0; col < 5; col++) {
+                valueRow.push(row === 2 && col === 2 ? null : rng.randint(...ranges[col]));
+            }
+            values.push(valueRow);
+        }
+
+        // Same de-duplication pass as the server
+        const used = new Set();
+        for (let row = 0; row < 5; row++) {
+            for (let col = 0; col < 5; col++) {
+                if (values[row][col] !== null) {
+                    while (used.has(values[row][col])) {
+                        values[row][col] = rng.randint(...ranges[col]);
+                    }
+                    used.add(values[row][col]);
+                }
+            }
+        }
+        return values;
+    }
+
+    function derive90(rng) {
+        const ranges = [[1, 9], [10, 19], [20, 29], [30, 39], [40, 49], [50, 59], [60, 69], [70, 79], [80, 90]];
+        const columns = [0, 1, 2, 3, 4, 5, 6, 7, 8];
+        const used = new Set();
+        const values = [];
+        for (let row = 0; row < 3; row++) {
+            const withNumbers = new Set(rng.sample(columns, 5));
+            const valueRow = [];
+            for (let col = 0; col < 9; col++) {
+                if (withNumbers.has(col)) {
+                    let value = rng.randint(...ranges[col]);
+                    while (used.has(value)) {
+                        value = rng.randint(...ranges[col]);
+                    }
+                    used.add(value);
+                    valueRow.push(value);
+                } else {
+                    valueRow.push(null);
+                }
+            }
+            values.push(valueRow);
+        }
+        return values;
+    }
+
+    // Regenerate card `serial` of the series `seed` as a grid of cells
+    function deriveCard(seed, serial, variant = '75', calledNumbers = []) {
+        const rng = new HashStream(`${seed}:${variant}:${serial}`);
+        const values = variant === '90' ? derive90(rng) : derive75(rng);
+        const called = new Set(calledNumbers);
+        return values.map((row, rowIndex) => row.map((value, colIndex) => {
+            const free = variant !== '90' && rowIndex === 2 && colIndex === 2;
+            return {
+                value: value,
+                marked: free || (value !== null && called.has(value)),
+                free: free
+            };
+        }));
+    }
+
+    return { sha256, HashStream, deriveCard };
+})();
+
+window.BingoCards = BingoCards;
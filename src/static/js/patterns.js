@@ -0,0 +1,144 @@
+// Ethio Bingo - Multi-card pattern tracking
+// Mirrors PatternVerifier in src/services/game_service.py. All of a player's
+// cards share one number -> (card, cell) index, and every pattern line keeps
+// a count of cells still to mark, so a draw costs O(hits) and each card's
+// distance to bingo ("one to go") is updated only for the cards it touched.
+
+const BingoPatterns = (() => {
+    const range = n => Array.from({ length: n }, (_, i) => i);
+
+    // Lines of a pattern as cell indexes (row * width + col), and how many
+    // of them must be complete for a bingo
+    function linesFor(pattern, variant = '75') {
+        if (variant === '90') {
+            const rows = range(3).map(row => range(9).map(col => row * 9 + col));
+            if (pattern === 'two_lines') {
+                return { width: 9, lines: rows, required: 2 };
+            }
+            if (pattern === 'full_house') {
+                return { width: 9, lines: [range(27)], required: 1 };
+            }
+            return { width: 9, lines: rows, required: 1 };
+        }
+
+        const rows = range(5).map(row => range(5).map(col => row * 5 + col));
+        const lines = {
+            horizontal_line: rows,
+            vertical_line: range(5).map(col => range(5).map(row => row * 5 + col)),
+            diagonal: [[0, 6, 12, 18, 24], [4, 8, 12, 16, 20]],
+            four_corners: [[0, 4, 20, 24]],
+            full_house: [range(25)]
+        }[pattern] || rows;
+        return { width: 5, lines: lines, required: 1 };
+    }
+
+    class CardSet {
+        constructor(cards, pattern = 'horizontal_line') {
+            const variant = (cards[0] && cards[0].variant) || '75';
+            const { width, lines, required } = linesFor(pattern, variant);
+            this.cards = cards;
+            this.width = width;
+            this.lines = lines;
+            this.required = required;
+            this.cellCount = width * (variant === '90' ? 3 : 5);
+
+            // Lines through each cell, shared by all cards
+            this.cellLines = range(this.cellCount).map(() => []);
+            lines.forEach((line, lineIndex) => {
+                line.forEach(cell => this.cellLines[cell].push(lineIndex));
+            });
+
+            // Refs are card * cellCount + cell
+            this.index = new Map();
+            this.remaining = new Uint8Array(cards.length * lines.length);
+            this.distance = new Uint8Array(cards.length);
+
+            cards.forEach((card, cardIndex) => {
+                for (let cell = 0; cell < this.cellCount; cell++) {
+                    const { value, marked } = this.cellAt(cardIndex, cell);
+                    if (value === null) {
+                        continue;
+                    }
+                    if (!this.index.has(value)) {
+                        this.index.set(value, []);
+                    }
+                    this.index.get(value).push(cardIndex * this.cellCount + cell);
+                    if (!marked) {
+                        this.cellLines[cell].forEach(line => {
+                            this.remaining[cardIndex * lines.length + line]++;
+                        });
+                    }
+                }
+                this.updateDistance(cardIndex);
+            });
+        }
+
+        cellAt(cardIndex, cell) {
+            return this.cards[cardIndex].grid[Math.floor(cell / this.width)][cell % this.width];
+        }
+
+        // Cells still to mark for a bingo: sum of the `required` smallest lines
+        updateDistance(cardIndex) {
+            const base = cardIndex * this.lines.length;
+            const counts = Array.from(this.remaining.subarray(base, base + this.lines.length));
+            counts.sort((a, b) => a - b);
+            this.distance[cardIndex] = counts.slice(0, this.required).reduce((sum, n) => sum + n, 0);
+        }
+
+        // Set one cell's mark; returns false if it was already in that state
+        setMarked(cardIndex, cell, marked) {
+            const state = this.cellAt(cardIndex, cell);
+            if (state.value === null || state.free || state.marked === marked) {
+                return false;
+            }
+            state.marked = marked;
+            const delta = marked ? -1 : 1;
+            this.cellLines[cell].forEach(line => {
+                this.remaining[cardIndex * this.lines.length + line] += delta;
+            });
+            this.updateDistance(cardIndex);
+            return true;
+        }
+
+        // Mark a drawn number on every card; returns the refs that changed
+        mark(number) {
+            return (this.index.get(number) || []).filter(ref => {
+                return this.setMarked(Math.floor(ref / this.cellCount), ref % this.cellCount, true);
+            });
+        }
+
+        // Unmarked cells that would complete the pattern on a one-to-go card
+        neededCells(cardIndex) {
+            if (this.distance[cardIndex] !== 1) {
+                return [];
+            }
+            const base = cardIndex * this.lines.length;
+            const needed = new Set();
+            this.lines.forEach((line, lineIndex) => {
+                if (this.remaining[base + lineIndex] === 1) {
+                    const cell = line.find(c => {
+                        const state = this.cellAt(cardIndex, c);
+                        return state.value !== null && !state.marked;
+                    });
+                    needed.add(cell);
+                }
+            });
+            return Array.from(needed);
+        }
+
+        // Card closest to a bingo (first complete card, if any)
+        bestCard() {
+            let best = 0;
+            for (let i = 1; i < this.cards.length; i++) {
+                if (this.distance[i] < this.distance[best]) {
+                    best = i;
+                }
+            }
+            return best;
+        }
+    }
+
+    return { linesFor, CardSet };
+})();
+
+window.BingoPatterns = BingoPatterns;
@@ -0,0 +1,189 @@
+// Ethio Bingo - Incremental card and called-number rendering
+// Cards are built once; afterwards a draw or a tap touches only the affected
+// cells, found through the CardSet's number -> (card, cell) index. One
+// delegated click listener serves every card, and the called-numbers strip
+// keeps a fixed number of chips in the DOM however long the game runs.
+
+const BingoRenderer = (() => {
+    const LETTERS = ['B', 'I', 'N', 'G', 'O'];
+
+    class CardBoard {
+        constructor(container, { onToggle = null } = {}) {
+            this.container = container;
+            this.onToggle = onToggle;
+            this.set = null;
+            this.cardElements = [];
+            this.cells = [];          // cells[cardIndex][cell] -> element
+            this.needed = [];         // highlighted cells per card
+            container.addEventListener('click', event => this.handleClick(event));
+        }
+
+        // Build the DOM for every card of a BingoPatterns.CardSet once
+        render(cardSet) {
+            this.set = cardSet;
+            this.cardElements = [];
+            this.cells = [];
+            this.needed = cardSet.cards.map(() => []);
+
+            const fragment = document.createDocumentFragment();
+            cardSet.cards.forEach((card, cardIndex) => {
+                fragment.appendChild(this.buildCard(card, cardIndex));
+                this.updateCard(cardIndex);
+            });
+            this.container.classList.toggle('multi-card', cardSet.cards.length > 1);
+            this.container.replaceChildren(fragment);
+        }
+
+        buildCard(card, cardIndex) {
+            const variant = card.variant || '75';
+            const cardDiv = document.createElement('div');
+            cardDiv.className = 'bingo-card';
+            cardDiv.dataset.card = cardIndex;
+
+            if (variant === '75') {
+                const headerDiv = document.createElement('div');
+                headerDiv.className = 'card-header';
+                LETTERS.forEach(letter => {
+                    const label = document.createElement('div');
+                    label.className = 'card-column-label';
+                    label.textContent = letter;
+                    headerDiv.appendChild(label);
+                });
+                cardDiv.appendChild(headerDiv);
+            }
+
+            const gridDiv = document.createElement('div');
+            gridDiv.className = `card-grid card-grid-${variant}`;
+            const cells = [];
+            card.grid.forEach(row => row.forEach(cell => {
+                const cellDiv = document.createElement('div');
+                cellDiv.className = 'card-cell';
+                cellDiv.dataset.card = cardIndex;
+                cellDiv.dataset.cell = cells.length;
+
+                if (cell.free) {
+                    cellDiv.classList.add('free');
+                    cellDiv.textContent = 'FREE';
+                } else if (cell.value === null) {
+                    cellDiv.classList.add('blank');
+                } else {
+                    cellDiv.textContent = cell.value;
+                    cellDiv.classList.toggle('marked', !!cell.marked);
+                }
+
+                gridDiv.appendChild(cellDiv);
+                cells.push(cellDiv);
+            }));
+            this.cells[cardIndex] = cells;
+            this.cardElements[cardIndex] = cardDiv;
+
+            cardDiv.appendChild(gridDiv);
+            return cardDiv;
+        }
+
+        handleClick(event) {
+            const cellDiv = event.target.closest('.card-cell');
+            if (!cellDiv || !this.container.contains(cellDiv)) {
+                return;
+            }
+            this.toggle(Number(cellDiv.dataset.card), Number(cellDiv.dataset.cell));
+        }
+
+        // Manual marking of one cell
+        toggle(cardIndex, cell) {
+            const marked = !this.set.cellAt(cardIndex, cell).marked;
+            if (this.set.setMarked(cardIndex, cell, marked)) {
+                this.cells[cardIndex][cell].classList.toggle('marked', marked);
+                this.updateCard(cardIndex);
+                if (this.onToggle) {
+                    this.onToggle(cardIndex, cell, marked);
+                }
+            }
+        }
+
+        // Refresh a card's "one to go" and bingo highlights
+        updateCard(cardIndex) {
+            const distance = this.set.distance[cardIndex];
+            const cardDiv = this.cardElements[cardIndex];
+            cardDiv.classList.toggle('one-to-go', distance === 1);
+            cardDiv.classList.toggle('complete', distance === 0);
+
+            this.needed[cardIndex].forEach(cell => this.cells[cardIndex][cell].classList.remove('needed'));
+            this.needed[cardIndex] = this.set.neededCells(cardIndex);
+            this.needed[cardIndex].forEach(cell => this.cells[cardIndex][cell].classList.add('needed'));
+        }
+
+        // Mark a drawn number on every card; returns how many cells changed
+        mark(number) {
+            const refs = this.set.mark(number);
+            const touched = new Set();
+            refs.forEach(ref => {
+                const cardIndex = Math.floor(ref / this.set.cellCount);
+                this.cells[cardIndex][ref % this.set.cellCount].classList.add('marked');
+                touched.add(cardIndex);
+            });
+            touched.forEach(cardIndex => this.updateCard(cardIndex));
+            return refs.length;
+        }
+    }
+
+    // Shows the most recent `capacity` numbers; older chips are recycled and
+    // summarised by a "+N" chip, so DOM size stays constant
+    class CalledStrip {
+        constructor(element, capacity = 15) {
+            this.element = element;
+            this.capacity = capacity;
+            this.total = 0;
+            this.overflow = document.createElement('div');
+            this.overflow.className = 'called-number-chip called-number-overflow';
+            this.chips = [];
+        }
+
+        reset(numbers = []) {
+            this.chips = [];
+            this.total = 0;
+            this.element.replaceChildren();
+            numbers.slice(-this.capacity).forEach(number => this.appendChip(number));
+            this.total = numbers.length;
+            this.updateOverflow();
+        }
+
+        push(number) {
+            if (this.chips.length >= this.capacity) {
+                const chip = this.chips.shift();
+                chip.textContent = number;
+                this.element.appendChild(chip);
+                this.chips.push(chip);
+            } else {
+                this.appendChip(number);
+            }
+            this.total++;
+            this.updateOverflow();
+            this.element.scrollLeft = this.element.scrollWidth;
+        }
+
+        appendChip(number) {
+            const chip = document.createElement('div');
+            chip.className = 'called-number-chip';
+            chip.textContent = number;
+            this.element.appendChild(chip);
+            this.chips.push(chip);
+        }
+
+        updateOverflow() {
+            const hidden = this.total - this.chips.length;
+            if (hidden > 0) {
+                this.overflow.textContent = `+${hidden}`;
+                if (this.element.firstChild !== this.overflow) {
+                    this.element.prepend(this.overflow);
+                }
+            } else if (this.overflow.parentNode) {
+                this.overflow.remove();
+            }
+        }
+    }
+
+    return { CardBoard, CalledStrip };
+})();
+
+window.BingoRenderer = BingoRenderer;
@@ -0,0 +1,131 @@
+// Ethio Bingo - Provably fair draw verifier
+// Mirrors HmacDrbg and DrawEngine in src/services/game_service.py. After a
+// commit-reveal game ends, the revealed server seed is checked against the
+// commitment published at room creation, the draw order is re-derived from
+// (server seed, client seed) and the hash chain is replayed.
+
+const BingoVerifier = (() => {
+    const { sha256 } = BingoCards;
+    const encoder = new TextEncoder();
+
+    function concat(...parts) {
+        const total = parts.reduce((sum, part) => sum + part.length, 0);
+        const out = new Uint8Array(total);
+        let offset = 0;
+        parts.forEach(part => {
+            out.set(part, offset);
+            offset += part.length;
+        });
+        return out;
+    }
+
+    function toHex(bytes) {
+        return Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('');
+    }
+
+    // HMAC-SHA256 with a 32-byte key (always shorter than the block size)
+    function hmacSha256(key, data) {
+        const inner = new Uint8Array(64);
+        const outer = new Uint8Array(64);
+        for (let i = 0; i < 64; i++) {
+            const k = i < key.length ? key[i] : 0;
+            inner[i] = k ^ 0x36;
+            outer[i] = k ^ 0x5c;
+        }
+        return sha256(concat(outer, sha256(concat(inner, data))));
+    }
+
+    const ZERO = Uint8Array.of(0x00);
+    const ONE = Uint8Array.of(0x01);
+
+    class HmacDrbg {
+        constructor(seedMaterial) {
+            this.key = new Uint8Array(32);
+            this.value = new Uint8Array(32).fill(0x01);
+            this.words = [];
+            this.index = 0;
+            this.update(seedMaterial);
+        }
+
+        update(provided = new Uint8Array(0)) {
+            this.key = hmacSha256(this.key, concat(this.value, ZERO, provided));
+            this.value = hmacSha256(this.key, this.value);
+            if (provided.length) {
+                this.key = hmacSha256(this.key, concat(this.value, ONE, provided));
+                this.value = hmacSha256(this.key, this.value);
+            }
+        }
+
+        nextWord() {
+            if (this.index >= this.words.length) {
+                this.value = hmacSha256(this.key, this.value);
+                const view = new DataView(this.value.buffer.slice(0));
+                this.update();
+                this.words = [];
+                for (let i = 0; i < 8; i++) {
+                    this.words.push(view.getUint32(i * 4));
+                }
+                this.index = 0;
+            }
+            return this.words[this.index++];
+        }
+
+        randbelow(n) {
+            const limit = 0x100000000 - (0x100000000 % n);
+            while (true) {
+                const word = this.nextWord();
+                if (word < limit) {
+                    return word % n;
+                }
+            }
+        }
+    }
+
+    function fairShuffle(min, max, serverSeed, clientSeed) {
+        const pool = [];
+        for (let n = min; n <= max; n++) {
+            pool.push(n);
+        }
+        const rng = new HmacDrbg(encoder.encode(`${serverSeed}:${clientSeed}`));
+        for (let i = pool.length - 1; i > 0; i--) {
+            const j = rng.randbelow(i + 1);
+            [pool[i], pool[j]] = [pool[j], pool[i]];
+        }
+        return pool;
+    }
+
+    function buildChain(seed, numbers) {
+        let head = toHex(sha256(seed));
+        return numbers.map((number, i) => {
+            head = toHex(sha256(`${head}:${i + 1}:${number}`));
+            return head;
+        });
+    }
+
+    // Check a finished game; `hashes` are the chain links seen during play
+    function verifyGame({ serverSeed, clientSeed, commitment, min, max, calledNumbers, hashes = [] }) {
+        if (toHex(sha256(serverSeed)) !== commitment) {
+            return { valid: false, message: 'Server seed does not match the commitment' };
+        }
+
+        const pool = fairShuffle(min, max, serverSeed, clientSeed);
+        for (let i = 0; i < calledNumbers.length; i++) {
+            if (pool[i] !== calledNumbers[i]) {
+                return { valid: false, message: `Draw ${i + 1} does not match the seeded shuffle` };
+            }
+        }
+
+        const chain = buildChain(serverSeed, calledNumbers);
+        for (let i = 0; i < hashes.length; i++) {
+            if (hashes[i] && hashes[i] !== chain[i]) {
+                return { valid: false, message: `Hash chain mismatch at draw ${i + 1}` };
+            }
+        }
+
+        return { valid: true, message: `All ${calledNumbers.length} draws verified` };
+    }
+
+    return { hmacSha256, HmacDrbg, fairShuffle, buildChain, verifyGame };
+})();
+
+window.BingoVerifier = BingoVerifier;
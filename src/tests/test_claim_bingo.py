@@ -0,0 +1,199 @@
+"""
+Test Claim Endpoint
+"""
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+# src.api imports the application
+pytest.importorskip("fastapi")
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.api import main
+from src.models.database import Base, Card, GameRoom, Player
+from src.services.claims import ClaimGuard
+from src.services.draws import DrawStore
+from src.services.game_service import CardGenerator, DrawEngine
+from src.services.tournaments import TournamentScheduler
+
+SEED = "claim-test-series"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory SQLite session with a running room whose first five draws complete card 1's top row"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    for player_id in ("p1", "p2"):
+        session.add(Player(id=player_id, telegram_id=player_id, display_name=player_id.upper()))
+    
+    top_row = [cell["value"] for cell in CardGenerator.derive_card(SEED, 1)[0]]
+    session.add(GameRoom(
+        id="room",
+        host_id="p1",
+        pattern={"id": "horizontal_line", "variant": "75"},
+        state="running",
+        draw_pool=top_row + [n for n in range(1, 76) if n not in top_row],
+        card_seed=SEED
+    ))
+    session.add(Card(id="winner", room_id="room", owner_id="p1", variant="75", serial=1))
+    session.add(Card(id="loser", room_id="room", owner_id="p2", variant="75", serial=2))
+    session.commit()
+    
+    monkeypatch.setattr(main, "claim_guard", ClaimGuard())
+    yield session
+    session.close()
+
+
+def draw(db, count):
+    room = db.query(GameRoom).filter(GameRoom.id == "room").first()
+    for _ in range(count):
+        asyncio.run(main.broadcast_draw("room", DrawStore.append(db, room)))
+
+
+def claim(db, player_id, card_id):
+    return asyncio.run(main.claim_bingo("room", player_id, card_id, db))
+
+
+def winners(db):
+    db.expire_all()
+    return db.query(GameRoom).filter(GameRoom.id == "room").first().winners
+
+
+class TestClaimBingo:
+    """Test claims are settled once, on the right cards"""
+    
+    def test_completed_row_wins(self, db):
+        """Test a derived card wins once its row is called"""
+        draw(db, 4)
+        assert not claim(db, "p1", "winner")["valid"]
+        draw(db, 1)
+        assert claim(db, "p1", "winner") == {"valid": True, "message": "Valid bingo!", "status": "accepted"}
+        assert [(winner["card_id"], winner["draws"]) for winner in winners(db)] == [("winner", 5)]
+    
+    def test_claim_after_finish(self, db, monkeypatch):
+        """Test a finished room refuses a repeat claim, even once the cached answer is gone"""
+        draw(db, 5)
+        claim(db, "p1", "winner")
+        monkeypatch.setattr(main, "claim_guard", ClaimGuard())
+        
+        with pytest.raises(HTTPException) as raised:
+            claim(db, "p1", "winner")
+        assert raised.value.status_code == 400
+        assert len(winners(db)) == 1
+    
+    def test_split_win(self, db):
+        """Test another card completed on the winning draw is still accepted"""
+        draw(db, 5)
+        called = DrawStore.called_numbers(db, "room")
+        db.add(Card(
+            id="twin",
+            room_id="room",
+            owner_id="p2",
+            variant="75",
+            grid=CardGenerator.derive_card(SEED, 1, "75", called)
+        ))
+        db.commit()
+        
+        claim(db, "p1", "winner")
+        assert claim(db, "p2", "twin")["valid"]
+        assert [winner["player_id"] for winner in winners(db)] == ["p1", "p2"]
+    
+    def test_other_players_card(self, db):
+        """Test a player cannot claim with someone else's card"""
+        draw(db, 5)
+        with pytest.raises(HTTPException) as raised:
+            claim(db, "p2", "winner")
+        assert raised.value.status_code == 400
+        assert winners(db) == []
+    
+    def test_win_counted_once(self, db, monkeypatch):
+        """Test only the claim that added the winner reaches the leaderboards"""
+        wins = []
+        
+        async def record_win(player_id, draws):
+            wins.append((player_id, draws))
+        
+        monkeypatch.setattr(main.leaderboards, "record_win", record_win)
+        draw(db, 5)
+        claim(db, "p1", "winner")
+        claim(db, "p1", "winner")
+        monkeypatch.setattr(main, "claim_guard", ClaimGuard())
+        with pytest.raises(HTTPException):
+            claim(db, "p1", "winner")
+        assert wins == [("p1", 5)]
+    
+    def test_tournament_card_wins(self, db):
+        """Test a tournament room can be won with the cards registration issued"""
+        tournament = TournamentScheduler.create(
+            db,
+            host_id="p1",
+            name="Cup",
+            rooms=1,
+            starts_at=datetime.utcnow() - timedelta(seconds=1),
+            players_per_room=2
+        )
+        room, = TournamentScheduler.round_rooms(db, tournament.id, 1)
+        card, = asyncio.run(main.issue_cards(db, room, "p2"))
+        assert TournamentScheduler.start_round(db, tournament.id)
+        
+        db.refresh(room)
+        for _ in range(75):
+            DrawStore.append(db, room)
+        result = asyncio.run(main.claim_bingo(room.id, "p2", card.id, db))
+        assert result["valid"]
+        
+        assert TournamentScheduler.advance(db, tournament.id)
+        db.refresh(tournament)
+        assert tournament.champions == ["p2"]
+    
+    def test_drawn_out_room_finishes(self, db, monkeypatch):
+        """Test a room out of numbers finishes and reveals its seed"""
+        sent = []
+        
+        async def broadcast(room_id, message):
+            sent.append(message)
+        
+        monkeypatch.setattr(main.manager, "broadcast", broadcast)
+        room = db.query(GameRoom).filter(GameRoom.id == "room").first()
+        room.draw_seed, room.seed_commitment = "server-seed", "commitment"
+        db.commit()
+        draw(db, 75)
+        
+        result = asyncio.run(main.manual_draw("room", db))
+        assert result == {"message": "No more numbers to draw"}
+        assert sent[-1]["type"] == "game_finished"
+        assert sent[-1]["fairness"]["server_seed"] == "server-seed"
+        db.expire_all()
+        assert db.query(GameRoom).filter(GameRoom.id == "room").first().state == "finished"
+    
+    def test_default_client_seed(self, db, monkeypatch):
+        """Test a commit-reveal room started without a client seed mixes in its players"""
+        async def ignore(*args, **kwargs):
+            pass
+        
+        monkeypatch.setattr(main.manager, "broadcast", ignore)
+        monkeypatch.setattr(main, "publish_event", ignore)
+        monkeypatch.setattr(main.leaderboards, "record_games", ignore)
+        db.add(GameRoom(
+            id="fair",
+            host_id="p1",
+            pattern={"id": "horizontal_line", "variant": "75"},
+            auto_draw=False,
+            draw_seed="server-seed",
+            seed_commitment="commitment"
+        ))
+        for player_id in ("p2", "p1"):
+            db.add(Card(room_id="fair", owner_id=player_id, variant="75", grid=[]))
+        db.commit()
+        
+        room = asyncio.run(main.begin_game(db, db.query(GameRoom).filter(GameRoom.id == "fair").first()))
+        assert room.client_seed == hashlib.sha256(b"p1,p2").hexdigest()
+        assert room.draw_pool == DrawEngine.fair_shuffle(1, 75, "server-seed", room.client_seed)
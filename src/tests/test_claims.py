@@ -0,0 +1,127 @@
+"""
+Test Claim Guard
+"""
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.models.database import Base, Card, ClaimRejection, GameRoom, Player
+from src.services import claims
+from src.services.claims import ClaimGuard
+
+REJECTED = {"valid": False, "message": "Pattern not complete", "status": "rejected"}
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    """In-memory SQLite with one room, player and card, used by the guard's writes"""
+    # One shared connection: the guard writes from a worker thread
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    
+    @event.listens_for(engine, "connect")
+    def enforce_foreign_keys(connection, record):
+        connection.execute("PRAGMA foreign_keys=ON")
+    
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(Player(id="p1", telegram_id="1", display_name="P1"))
+        db.add(GameRoom(id="room", host_id="p1", pattern={"id": "full_house"}))
+        db.add(Card(id="card", room_id="room", owner_id="p1", variant="75", grid=[]))
+        db.commit()
+    
+    @contextmanager
+    def get_db():
+        db = factory()
+        try:
+            yield db
+            db.commit()
+        finally:
+            db.close()
+    
+    monkeypatch.setattr(claims, "get_db", get_db)
+    return factory
+
+
+class TestClaimGuard:
+    """Test throttling, replayed answers and aggregated rejections"""
+    
+    def test_throttle(self):
+        """Test a player gets a burst of claims, then a wait"""
+        guard = ClaimGuard(rate=1.0, burst=2)
+        assert guard.throttle("p1") == 0
+        assert guard.throttle("p1") == 0
+        assert guard.throttle("p1") > 0
+        assert guard.throttle("p2") == 0
+    
+    def test_replay_until_next_draw(self):
+        """Test an answer is replayed to its player until the room draws again"""
+        guard = ClaimGuard()
+        assert guard.replay("room", "card", "p1") is None
+        guard.remember("room", "card", "p1", 12, REJECTED)
+        
+        assert guard.replay("room", "card", "p1") is REJECTED
+        assert guard.replay("room", "card", "p2") is None
+        guard.drawn("room", 13)
+        assert guard.replay("room", "card", "p1") is None
+    
+    def test_cache_is_bounded(self):
+        """Test the least recently used answers are dropped"""
+        guard = ClaimGuard(cache_size=2)
+        for index in range(3):
+            guard.remember("room", f"card{index}", "p1", 1, REJECTED)
+        assert guard.replay("room", "card0", "p1") is None
+        assert guard.replay("room", "card2", "p1") is REJECTED
+    
+    def test_rejections_are_aggregated(self, session_factory):
+        """Test repeated rejections become one row with a count"""
+        guard = ClaimGuard()
+        guard.remember("room", "card", "p1", 5, REJECTED)
+        guard.reject("room", "p1", "card", REJECTED["message"])
+        guard.replay("room", "card", "p1")
+        assert asyncio.run(guard.flush()) == 1
+        
+        guard.reject("room", "p1", "card", "Number 48 has not been called")
+        assert asyncio.run(guard.flush()) == 1
+        assert asyncio.run(guard.flush()) == 0
+        
+        with session_factory() as db:
+            row, = db.query(ClaimRejection).all()
+            assert (row.attempts, row.last_message) == (3, "Number 48 has not been called")
+            assert row.first_at <= row.last_at
+    
+    def test_bad_key_keeps_rest_of_batch(self, session_factory):
+        """Test a rejection whose player does not exist is dropped alone"""
+        guard = ClaimGuard()
+        guard.reject("room", "ghost", "card", REJECTED["message"])
+        guard.reject("room", "p1", "card", REJECTED["message"])
+        assert asyncio.run(guard.flush()) == 1
+        
+        with session_factory() as db:
+            row, = db.query(ClaimRejection).all()
+            assert (row.player_id, row.attempts) == ("p1", 1)
+    
+    def test_missing_card_is_skipped(self, session_factory):
+        """Test a rejection on a card that does not exist is dropped without a foreign key"""
+        guard = ClaimGuard()
+        guard.reject("room", "p1", "gone", REJECTED["message"])
+        guard.reject("room", "p1", "card", REJECTED["message"])
+        assert asyncio.run(guard.flush()) == 1
+        
+        with session_factory() as db:
+            row, = db.query(ClaimRejection).all()
+            assert row.card_id == "card"
+    
+    def test_closed_room_drops_pending(self):
+        """Test an archived room's unwritten rejections are not flushed"""
+        guard = ClaimGuard()
+        guard.reject("room", "p1", "card", REJECTED["message"])
+        guard.reject("other", "p1", "card", REJECTED["message"])
+        asyncio.run(guard.close_room("room"))
+        assert list(guard.pending) == [("other", "p1", "card")]
@@ -0,0 +1,65 @@
+"""
+Test Room WebSockets
+"""
+import asyncio
+import json
+
+import pytest
+
+# src.api imports the application
+pytest.importorskip("fastapi")
+
+from src.api.main import ConnectionManager
+
+
+class FakeSocket:
+    """Records sent frames; may run a coroutine while its first frame is in flight"""
+    
+    def __init__(self, during_first_send=None):
+        self.sent = []
+        self.during_first_send = during_first_send
+    
+    async def accept(self):
+        pass
+    
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+        if self.during_first_send is not None:
+            during, self.during_first_send = self.during_first_send, None
+            await during()
+    
+    async def close(self, code=None):
+        pass
+
+
+class TestConnectionManager:
+    """Test sockets see every event after the sequence they start from"""
+    
+    def test_event_during_welcome(self):
+        """Test an event broadcast while the welcome is sent still reaches the new socket"""
+        async def run():
+            manager = ConnectionManager()
+            await manager.broadcast("room", {"type": "player_joined"})
+            socket = FakeSocket(lambda: manager.broadcast("room", {"type": "number_drawn", "number": 5}))
+            assert await manager.connect(socket, "room")
+            await manager.broadcast("room", {"type": "number_drawn", "number": 9})
+            return socket.sent
+        
+        sent = asyncio.run(run())
+        assert [(frame["type"], frame["seq"]) for frame in sent] == [
+            ("welcome", 1),
+            ("number_drawn", 2),
+            ("number_drawn", 3)
+        ]
+    
+    def test_resume_replays_missed(self):
+        """Test a resuming socket gets the buffered events after its last sequence"""
+        async def run():
+            manager = ConnectionManager()
+            for number in (1, 2, 3):
+                await manager.broadcast("room", {"type": "number_drawn", "number": number})
+            socket = FakeSocket()
+            await manager.connect(socket, "room", last_seq=1)
+            return socket.sent
+        
+        assert [frame["number"] for frame in asyncio.run(run())] == [2, 3]
@@ -68,6 +68,40 @@ class TestCardGenerator:
                     all_numbers.append(cell["value"])
         
         assert len(all_numbers) == len(set(all_numbers))
+    
+    def test_derive_card_deterministic(self):
+        """Test same seed and serial derive the same card"""
+        card1 = CardGenerator.derive_card("series-1", 42, "75")
+        card2 = CardGenerator.derive_card("series-1", 42, "75")
+        other = CardGenerator.derive_card("series-1", 43, "75")
+        
+        assert card1 == card2
+        assert card1 != other
+        assert card1[2][2] == {"value": None, "marked": True, "free": True}
+        
+        # Known answer shared with static/js/cards.js
+        assert [cell["value"] for cell in CardGenerator.derive_card("seed1", 7, "75")[0]] == [5, 23, 33, 57, 69]
+    
+    def test_derive_card_valid_layout(self):
+        """Test derived cards follow the variant rules"""
+        for serial in range(1, 50):
+            card = CardGenerator.derive_card("series-2", serial, "90")
+            assert all(sum(1 for cell in row if cell["value"] is not None) == 5 for row in card)
+            numbers = [cell["value"] for row in card for cell in row if cell["value"] is not None]
+            assert len(numbers) == len(set(numbers))
+    
+    def test_derive_card_marks_called_numbers(self):
+        """Test derived cards are marked from called numbers and not shared"""
+        card = CardGenerator.derive_card("series-3", 1, "75")
+        called = [card[0][0]["value"], card[4][4]["value"]]
+        
+        marked = CardGenerator.derive_card("series-3", 1, "75", called)
+        assert marked[0][0]["marked"] is True
+        assert marked[4][4]["marked"] is True
+        assert marked[1][1]["marked"] is False
+        
+        # Cached layouts must not leak marks between calls
+        assert CardGenerator.derive_card("series-3", 1, "75")[0][0]["marked"] is False
 
 
 class TestDrawEngine:
@@ -104,6 +138,53 @@ class TestDrawEngine:
         pool2, _ = DrawEngine.initialize_draw_pool(1, 20, seed="test123")
         
         assert pool1 == pool2
+    
+    def test_hash_chain_links(self):
+        """Test each chain link commits to the previous one"""
+        hashes = DrawEngine.build_chain("seed", [5, 9, 12])
+        
+        assert len(hashes) == 3
+        assert hashes[0] == DrawEngine.chain_hash(DrawEngine.genesis_hash("seed"), 1, 5)
+        assert hashes[2] == DrawEngine.chain_hash(hashes[1], 3, 12)
+        assert DrawEngine.build_chain("seed", [5, 9, 13])[:2] == hashes[:2]
+        assert DrawEngine.build_chain("seed", [5, 9, 13])[2] != hashes[2]
+    
+    def test_verify_draws(self):
+        """Test replaying seed, shuffle and chain against a draw history"""
+        pool, seed = DrawEngine.initialize_draw_pool(1, 75, seed="audit")
+        numbers = pool[:10]
+        hashes = DrawEngine.build_chain(seed, numbers)
+        
+        assert DrawEngine.verify_draws(seed, 1, 75, numbers, hashes)[0] is True
+        
+        tampered = numbers[:]
+        tampered[3], tampered[4] = tampered[4], tampered[3]
+        assert DrawEngine.verify_draws(seed, 1, 75, tampered, hashes)[0] is False
+        
+        forged = hashes[:]
+        forged[5] = "0" * 64
+        is_valid, message = DrawEngine.verify_draws(seed, 1, 75, numbers, forged)
+        assert is_valid is False
+        assert "draw 6" in message
+        
+        assert DrawEngine.verify_draws(seed, 1, 75, numbers, hashes[:8])[0] is False
+    
+    def test_fair_shuffle(self):
+        """Test commit-reveal shuffle depends on both seeds"""
+        server_seed = DrawEngine.new_server_seed()
+        pool = DrawEngine.fair_shuffle(1, 90, server_seed, "client")
+        
+        assert sorted(pool) == list(range(1, 91))
+        assert pool == DrawEngine.fair_shuffle(1, 90, server_seed, "client")
+        assert pool != DrawEngine.fair_shuffle(1, 90, server_seed, "other-client")
+        assert DrawEngine.genesis_hash(server_seed) == DrawEngine.commit_seed(server_seed)
+        
+        hashes = DrawEngine.build_chain(server_seed, pool[:20])
+        assert DrawEngine.verify_draws(server_seed, 1, 90, pool[:20], hashes, "client")[0] is True
+        assert DrawEngine.verify_draws(server_seed, 1, 90, pool[:20], hashes, "other-client")[0] is False
+        
+        # Known answer shared with static/js/verifier.js
+        assert DrawEngine.fair_shuffle(1, 90, "srv", "cli")[:5] == [20, 62, 65, 90, 13]
 
 
 class TestPatternVerifier:
@@ -0,0 +1,43 @@
+"""
+Test Consistent Hashing
+"""
+import pytest
+from src.services.hash_ring import HashRing
+
+
+ROOMS = [f"room-{i}" for i in range(2000)]
+
+
+class TestHashRing:
+    """Test room to shard assignment"""
+    
+    def test_deterministic(self):
+        """Test every process computes the same owners"""
+        assert HashRing(["0", "1", "2"]).assignments(ROOMS) == HashRing(["2", "0", "1"]).assignments(ROOMS)
+    
+    def test_balanced(self):
+        """Test keys spread roughly evenly"""
+        owners = list(HashRing(["0", "1", "2", "3"]).assignments(ROOMS).values())
+        for node in ["0", "1", "2", "3"]:
+            assert 0.15 < owners.count(node) / len(ROOMS) < 0.35
+    
+    def test_adding_node_moves_only_its_share(self):
+        """Test a joining node only takes keys, about 1/N of them"""
+        before = HashRing(["0", "1", "2"]).assignments(ROOMS)
+        after = HashRing(["0", "1", "2", "3"]).assignments(ROOMS)
+        moved = [room for room in ROOMS if before[room] != after[room]]
+        assert all(after[room] == "3" for room in moved)
+        assert len(moved) / len(ROOMS) < 0.4
+    
+    def test_removing_node_moves_only_its_keys(self):
+        """Test a leaving node's keys are the only ones reassigned"""
+        before = HashRing(["0", "1", "2"]).assignments(ROOMS)
+        after = HashRing(["0", "2"]).assignments(ROOMS)
+        for room in ROOMS:
+            if before[room] != "1":
+                assert after[room] == before[room]
+    
+    def test_empty_ring(self):
+        """Test lookups on an empty ring fail loudly"""
+        with pytest.raises(LookupError):
+            HashRing().node_for("room")
@@ -0,0 +1,56 @@
+"""
+Test CPU Job Pool
+"""
+import asyncio
+import time
+import pytest
+from src.services.game_service import CardGenerator, DrawEngine
+from src.services.jobs import JobPool, JobQueueFull, JobTimeout
+
+
+@pytest.fixture
+def pool():
+    """Single-worker pool"""
+    job_pool = JobPool(workers=1, max_pending=2, timeout=5.0)
+    yield job_pool
+    job_pool.shutdown()
+
+
+class TestJobPool:
+    """Test the process-backed job pool"""
+    
+    def test_runs_in_worker(self, pool):
+        """Test jobs return their results"""
+        cards = asyncio.run(pool.run(CardGenerator.generate_cards, "90", 3))
+        assert len(cards) == 3
+        assert len(cards[0]) == 3
+    
+    def test_audit_replay(self, pool):
+        """Test a draw replay gives the same verdict off the event loop"""
+        pool_numbers = DrawEngine.derive_pool(1, 75, "seed")
+        called = [DrawEngine.draw_number(pool_numbers) for _ in range(10)]
+        hashes = DrawEngine.build_chain("seed", called)
+        result = asyncio.run(pool.run(DrawEngine.verify_draws, "seed", 1, 75, called, hashes))
+        assert result == DrawEngine.verify_draws("seed", 1, 75, called, hashes)
+        assert result[0]
+    
+    def test_queue_bound(self, pool):
+        """Test submissions beyond max_pending fail fast"""
+        async def flood():
+            jobs = [asyncio.ensure_future(pool.run(time.sleep, 0.5)) for _ in range(3)]
+            return await asyncio.gather(*jobs, return_exceptions=True)
+        
+        results = asyncio.run(flood())
+        assert sum(isinstance(result, JobQueueFull) for result in results) == 1
+        assert pool.pending == 0
+    
+    def test_timeout(self, pool):
+        """Test slow jobs raise JobTimeout and stay pending until the worker is done"""
+        with pytest.raises(JobTimeout):
+            asyncio.run(pool.run(time.sleep, 1, timeout=0.2))
+        assert pool.pending == 1
+        
+        deadline = time.monotonic() + 10
+        while pool.pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.pending == 0
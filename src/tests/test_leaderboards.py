@@ -0,0 +1,101 @@
+"""
+Test Leaderboards
+"""
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+fakeredis = pytest.importorskip("fakeredis")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.core.redis import redis_client
+from src.models.database import Base, Player
+from src.services import leaderboards as leaderboards_module
+from src.services.leaderboards import Leaderboards
+
+WHEN = datetime(2024, 1, 31, 18, 0)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory SQLite with three players, and a fake Redis"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        for index in range(1, 4):
+            session.add(Player(id=f"p{index}", telegram_id=str(index), display_name=f"P{index}"))
+        session.commit()
+    
+    @contextmanager
+    def get_db():
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+    
+    monkeypatch.setattr(leaderboards_module, "get_db", get_db)
+    monkeypatch.setattr(redis_client, "redis", fakeredis.aioredis.FakeRedis(decode_responses=True))
+    session = factory()
+    yield session
+    session.close()
+
+
+def entries(page):
+    return [(entry["player_id"], entry["score"]) for entry in page["entries"]]
+
+
+class TestLeaderboards:
+    """Test live boards and their snapshots"""
+    
+    def test_wins_page(self, db):
+        """Test wins are ranked highest first, with names and the player's standing"""
+        boards = Leaderboards()
+        
+        async def run():
+            for player_id in ("p1", "p2", "p1"):
+                await boards.record_win(player_id, 20, WHEN)
+            return await boards.page(db, "wins", "daily", WHEN, player_id="p2")
+        
+        page = asyncio.run(run())
+        assert (page["period"], page["source"], page["total"]) == ("daily:2024-01-31", "live", 2)
+        assert entries(page) == [("p1", 2.0), ("p2", 1.0)]
+        assert page["entries"][0]["name"] == "P1"
+        assert page["player"] == {"rank": 2, "score": 1.0}
+    
+    def test_fastest_keeps_lowest(self, db):
+        """Test a slower win never raises a player's fastest bingo, and lower ranks first"""
+        boards = Leaderboards()
+        
+        async def run():
+            for player_id, draws in (("p1", 30), ("p1", 20), ("p1", 40), ("p2", 25)):
+                await boards.record_win(player_id, draws, WHEN)
+            ttl = await redis_client.redis.ttl(Leaderboards.KEY.format(board="fastest", period="weekly:2024-W05"))
+            return await boards.page(db, "fastest", "weekly", WHEN), ttl
+        
+        page, ttl = asyncio.run(run())
+        assert entries(page) == [("p1", 20.0), ("p2", 25.0)]
+        assert 0 < ttl <= Leaderboards.PERIODS["weekly"]
+    
+    def test_snapshot_fallback(self, db):
+        """Test a board whose live keys are gone is served from its snapshot"""
+        boards = Leaderboards()
+        
+        async def run():
+            await boards.record_games(["p1", "p2", "p3"], WHEN)
+            await boards.record_games(["p3"], WHEN)
+            assert await boards.snapshot(WHEN) == 3
+            await redis_client.redis.flushall()
+            return await boards.page(db, "games", "all", WHEN, offset=1, limit=1, player_id="p3")
+        
+        page = asyncio.run(run())
+        assert (page["source"], page["total"]) == ("snapshot", 3)
+        assert page["entries"][0]["rank"] == 2
+        assert page["player"] == {"rank": 1, "score": 2.0}
@@ -0,0 +1,75 @@
+"""
+Test Lobby Index
+"""
+import asyncio
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+fakeredis = pytest.importorskip("fakeredis")
+# The seat scripts run in fakeredis' Lua interpreter
+pytest.importorskip("lupa")
+
+from src.core.redis import redis_client
+from src.models.database import GameRoom
+from src.services.lobbies import LobbyIndex
+
+
+@pytest.fixture
+def lobbies(monkeypatch):
+    """Lobby index on an in-process fake Redis"""
+    monkeypatch.setattr(redis_client, "redis", fakeredis.aioredis.FakeRedis(decode_responses=True))
+    return LobbyIndex()
+
+
+def lobby(room_id: str, target_players: int = 2) -> GameRoom:
+    return GameRoom(id=room_id, variant="75", pattern={"id": "horizontal_line"}, target_players=target_players)
+
+
+class TestLobbyIndex:
+    """Test seating through the Lua scripts"""
+    
+    def test_seat_until_full(self, lobbies):
+        """Test seats run out at the target, and a seated player is told so without a second seat"""
+        async def run():
+            room = lobby("room")
+            await lobbies.add(room)
+            return [
+                await lobbies.seat(room, "p1"),
+                await lobbies.seat(room, "p1"),
+                await lobbies.seat(room, "p2"),
+                await lobbies.seat(room, "p3")
+            ]
+        
+        assert asyncio.run(run()) == [
+            LobbyIndex.SEATED, LobbyIndex.ALREADY_SEATED, LobbyIndex.SEATED, LobbyIndex.FULL
+        ]
+    
+    def test_unseat_frees_seat(self, lobbies):
+        """Test a seat given back can be taken, but only once"""
+        async def run():
+            room = lobby("room")
+            await lobbies.add(room)
+            await lobbies.seat(room, "p1")
+            await lobbies.seat(room, "p2")
+            await lobbies.unseat(room, "p2")
+            await lobbies.unseat(room, "p2")
+            return [await lobbies.seat(room, "p3"), await lobbies.seat(room, "p4")]
+        
+        assert asyncio.run(run()) == [LobbyIndex.SEATED, LobbyIndex.FULL]
+    
+    def test_pick_prefers_fullest_and_skips_seated(self, lobbies):
+        """Test pick returns the fullest lobby with room, skipping lobbies the player sits in"""
+        async def run():
+            fuller, emptier, full = lobby("fuller", 3), lobby("emptier", 3), lobby("full", 1)
+            for room in (fuller, emptier, full):
+                await lobbies.add(room)
+            await lobbies.seat(fuller, "p1")
+            await lobbies.seat(full, "p2")
+            return [
+                await lobbies.pick("75", "horizontal_line", "p3"),
+                await lobbies.pick("75", "horizontal_line", "p1"),
+                await lobbies.pick("90", "horizontal_line", "p3")
+            ]
+        
+        assert asyncio.run(run()) == ["fuller", "emptier", None]
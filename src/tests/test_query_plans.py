@@ -0,0 +1,100 @@
+"""
+Query Plan Regression Tests
+Hot queries must be served by an index, not a table scan, so their latency
+does not grow with historical volume. SQLite stands in for PostgreSQL.
+"""
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from datetime import datetime
+from sqlalchemy import create_engine, distinct, func, text
+from sqlalchemy.orm import sessionmaker
+from src.models.database import Base, GameRoom, Card, Claim, Draw, LeaderboardSnapshot
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with the model schema"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def query_plan(db, query) -> str:
+    """EXPLAIN QUERY PLAN of an ORM query, flattened to one string"""
+    statement = query.statement.compile(db.bind, compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {statement}")).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def assert_indexed(plan: str, table: str):
+    """Fail if the plan scans `table` without an index"""
+    assert f"SCAN {table}" not in plan or "USING" in plan, plan
+    assert "INDEX" in plan, plan
+
+
+class TestQueryPlans:
+    """Test the hot queries use indexes"""
+    
+    def test_room_roster_uses_index(self, db):
+        """Test get_room's card lookup by room"""
+        plan = query_plan(db, db.query(Card).filter(Card.room_id == "room"))
+        assert_indexed(plan, "cards")
+        assert "ix_cards_room_id_owner_id" in plan
+    
+    def test_player_cards_uses_index(self, db):
+        """Test card lookup by owner"""
+        plan = query_plan(db, db.query(Card).filter(Card.owner_id == "player"))
+        assert "ix_cards_owner_id" in plan
+    
+    def test_card_claims_uses_index(self, db):
+        """Test claim lookup by room and card"""
+        plan = query_plan(db, db.query(Claim).filter(Claim.room_id == "room", Claim.card_id == "card"))
+        assert "ix_claims_room_id_card_id" in plan
+    
+    def test_expired_rooms_uses_index(self, db):
+        """Test the archiver's state/age filter"""
+        query = db.query(GameRoom).filter(
+            GameRoom.state == "finished",
+            GameRoom.updated_at < datetime(2024, 1, 1)
+        )
+        plan = query_plan(db, query)
+        assert "ix_game_rooms_state_updated_at" in plan
+    
+    def test_draw_history_uses_key(self, db):
+        """Test a room's draws are an ordered range scan of the primary key"""
+        query = db.query(Draw).filter(Draw.room_id == "room").order_by(Draw.seq)
+        plan = query_plan(db, query)
+        assert "sqlite_autoindex_draws_1" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_last_draw_uses_key(self, db):
+        """Test the next-draw lookup reads the key backwards"""
+        query = db.query(Draw.seq).filter(Draw.room_id == "room").order_by(Draw.seq.desc()).limit(1)
+        plan = query_plan(db, query)
+        assert "INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_seated_count_uses_covering_index(self, db):
+        """Test counting a lobby's players never reads the card rows"""
+        query = db.query(func.count(distinct(Card.owner_id))).filter(Card.room_id == "room")
+        plan = query_plan(db, query)
+        assert "COVERING INDEX ix_cards_room_id_owner_id" in plan
+    
+    def test_room_code_lookup_uses_index(self, db):
+        """Test resolving a join code is a single index lookup"""
+        plan = query_plan(db, db.query(GameRoom.id).filter(GameRoom.code == "7KQ2M9XD"))
+        assert "ix_game_rooms_code" in plan
+    
+    def test_leaderboard_snapshot_page_uses_key(self, db):
+        """Test an expired board's page is read in rank order off the primary key"""
+        query = db.query(LeaderboardSnapshot).filter(
+            LeaderboardSnapshot.board == "wins",
+            LeaderboardSnapshot.period == "daily:2024-01-31"
+        ).order_by(LeaderboardSnapshot.rank).offset(50).limit(50)
+        plan = query_plan(db, query)
+        assert "sqlite_autoindex_leaderboard_snapshots_1" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,59 @@
+"""
+Test Rate Limiting Primitives
+"""
+import pytest
+from src.services.rate_limit import TokenBucket, KeyedTokenBuckets
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    """Test token bucket"""
+    
+    def test_burst_then_wait(self):
+        """Test a full bucket allows a burst, then reports the wait"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+        
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+        
+        clock.now = 0.5
+        assert bucket.try_acquire() == 0.0
+    
+    def test_refill_is_capped(self):
+        """Test idle time never accumulates more than capacity"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+        bucket.try_acquire()
+        bucket.try_acquire()
+        
+        clock.now = 100.0
+        assert bucket.is_full
+        assert bucket.try_acquire(2) == 0.0
+        assert bucket.try_acquire() > 0
+    
+    def test_keyed_buckets_are_independent(self):
+        """Test per-key buckets and pruning of idle keys"""
+        clock = FakeClock()
+        buckets = KeyedTokenBuckets(rate=1.0, capacity=1, clock=clock)
+        
+        assert buckets.get("a").try_acquire() == 0.0
+        assert buckets.get("a").try_acquire() > 0
+        assert buckets.get("b").try_acquire() == 0.0
+        
+        clock.now = 10.0
+        buckets.prune()
+        assert len(buckets) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,53 @@
+"""
+Test Room Codes
+"""
+import asyncio
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+fakeredis = pytest.importorskip("fakeredis")
+# delete_if_equal runs in fakeredis' Lua interpreter
+pytest.importorskip("lupa")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.core.redis import redis_client
+from src.models.database import Base
+from src.services.room_codes import RoomCodes
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Empty in-memory SQLite session, as after the room was archived, and a fake Redis"""
+    monkeypatch.setattr(redis_client, "redis", fakeredis.aioredis.FakeRedis(decode_responses=True))
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestRoomCodes:
+    """Test archived rooms stop resolving"""
+    
+    def test_forget(self, db):
+        """Test forgetting drops the cached and the Redis entry"""
+        codes = RoomCodes("secret")
+        
+        async def run():
+            await codes.remember("ABCD", "room")
+            found = await codes.resolve(db, "abcd")
+            await codes.forget("room")
+            return found, await codes.resolve(db, "ABCD")
+        
+        assert asyncio.run(run()) == ("room", None)
+    
+    def test_forget_in_other_process(self, db):
+        """Test a process that never saw the code still drops it from Redis"""
+        async def run():
+            await RoomCodes("secret").remember("ABCD", "room")
+            await RoomCodes("secret").forget("room")
+            return await RoomCodes("secret").resolve(db, "ABCD")
+        
+        assert asyncio.run(run()) is None
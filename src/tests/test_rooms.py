@@ -0,0 +1,110 @@
+"""
+Test Room Concurrency
+Two sessions on one SQLite database stand in for concurrent requests
+"""
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.models.database import Base, GameRoom, Player
+from src.services.draws import DrawConflict, DrawStore
+from src.services.rooms import RoomConflict, RoomStore
+
+
+@pytest.fixture
+def sessions():
+    """Factory of sessions sharing one in-memory database with a lobby room"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(Player(id="host", telegram_id="1", display_name="Host"))
+        db.add(GameRoom(id="room", host_id="host", pattern={"id": "horizontal_line"}, draw_pool=[7, 3, 9]))
+        db.commit()
+    yield factory
+
+
+def load(db):
+    return db.query(GameRoom).filter(GameRoom.id == "room").first()
+
+
+class TestRoomStore:
+    """Test compare-and-swap room transitions"""
+    
+    def test_transition_bumps_version(self, sessions):
+        """Test a successful transition commits and bumps the version"""
+        with sessions() as db:
+            room = RoomStore.transition(db, load(db), lambda room: {"state": "running"})
+            assert room.state == "running"
+            assert room.version == 2
+    
+    def test_stale_read_retries(self, sessions):
+        """Test a transition decided on a stale read is retried on fresh state"""
+        with sessions() as a, sessions() as b:
+            stale = load(a)
+            RoomStore.transition(b, load(b), lambda room: {"winners": room.winners + ["first"]})
+            
+            seen = []
+            
+            def add_second(room):
+                seen.append(list(room.winners))
+                return {"winners": room.winners + ["second"]}
+            
+            room = RoomStore.transition(a, stale, add_second)
+            assert seen == [[], ["first"]]
+            assert room.winners == ["first", "second"]
+            assert room.version == 3
+    
+    def test_gives_up_after_retries(self, sessions):
+        """Test a room that keeps changing raises RoomConflict"""
+        with sessions() as a, sessions() as b:
+            def contended(room):
+                RoomStore.transition(b, load(b), lambda other: {"draw_interval": other.draw_interval + 1})
+                return {"state": "running"}
+            
+            with pytest.raises(RoomConflict):
+                RoomStore.transition(a, load(a), contended, retries=2)
+            assert load(b).state == "lobby"
+    
+    def test_no_changes_skips_swap(self, sessions):
+        """Test an empty decision commits without bumping the version"""
+        with sessions() as db:
+            assert RoomStore.transition(db, load(db), lambda room: {}).version == 1
+
+
+class TestDrawGuard:
+    """Test draws respect the room state"""
+    
+    def test_draw_after_finish_conflicts(self, sessions):
+        """Test a draw decided before a claim finished the room is refused"""
+        with sessions() as a, sessions() as b:
+            RoomStore.transition(a, load(a), lambda room: {"state": "running"})
+            room = load(a)
+            assert DrawStore.append(a, room)["number"] == 7
+            
+            RoomStore.transition(b, load(b), lambda other: {"state": "finished"})
+            with pytest.raises(DrawConflict):
+                DrawStore.append(a, room)
+            assert DrawStore.called_numbers(b, "room") == [7]
+    
+    def test_same_seq_draws_once(self, sessions):
+        """Test two draws decided from the same last seq: one commits, the other conflicts"""
+        with sessions() as a, sessions() as b:
+            RoomStore.transition(a, load(a), lambda room: {"state": "running"})
+            room = load(a)
+            
+            # b draws and commits after a read the last seq, before a inserts
+            won = []
+            
+            @event.listens_for(a, "before_flush", once=True)
+            def race(session, context, instances):
+                won.append(DrawStore.append(b, load(b)))
+            
+            with pytest.raises(DrawConflict, match="already exists"):
+                DrawStore.append(a, room)
+            assert [record["seq"] for record in won] == [1]
+            assert DrawStore.called_numbers(b, "room") == [7]
+            assert DrawStore.append(a, load(a))["seq"] == 2
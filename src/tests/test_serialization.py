@@ -0,0 +1,40 @@
+"""
+Test JSON Serialization
+"""
+import json
+from datetime import datetime
+
+import pytest
+from src.benchmarks.json_encoding import join_payload
+from src.services import serialization
+from src.services.serialization import dumps, loads
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the stdlib fallback"""
+    if request.param == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestSerialization:
+    """Test both encoders produce the same JSON"""
+    
+    def test_matches_stdlib(self, encoder):
+        """Test card payloads encode exactly like compact stdlib json"""
+        payload = join_payload(3)
+        assert dumps(payload) == json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+        assert loads(dumps(payload)) == payload
+    
+    def test_extra_types(self, encoder):
+        """Test datetimes, integer keys and non-ASCII names"""
+        payload = {"at": datetime(2024, 1, 31, 18, 0, 5, 250), 7: "ሰላም"}
+        assert loads(dumps(payload)) == {"at": "2024-01-31T18:00:05.000250", "7": "ሰላም"}
+    
+    def test_unsupported_type(self, encoder):
+        """Test unknown objects are refused"""
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
@@ -0,0 +1,49 @@
+"""
+Test Short Codes
+"""
+import pytest
+from src.services.short_codes import ShortCodes
+
+
+class TestShortCodes:
+    """Test the Feistel-permuted base32 codes"""
+    
+    def test_round_trip(self):
+        """Test every code decodes to its counter"""
+        codes = ShortCodes("secret")
+        for counter in [0, 1, 2, 12345, codes.capacity - 1]:
+            assert codes.decode(codes.encode(counter)) == counter
+    
+    def test_no_collisions(self):
+        """Test a permutation: a full small domain maps onto itself"""
+        codes = ShortCodes("secret", length=2)
+        assert len({codes.encode(counter) for counter in range(codes.capacity)}) == codes.capacity == 1024
+    
+    def test_format(self):
+        """Test codes are fixed-length Crockford base32 and not sequential"""
+        codes = ShortCodes("secret")
+        first, second = codes.encode(1), codes.encode(2)
+        assert len(first) == 8
+        assert set(first + second) <= set(ShortCodes.ALPHABET)
+        assert first[:6] != second[:6]
+    
+    def test_key_changes_codes(self):
+        """Test codes depend on the key"""
+        assert ShortCodes("a").encode(7) != ShortCodes("b").encode(7)
+    
+    def test_normalize(self):
+        """Test typed codes tolerate case, dashes and read-alike letters"""
+        codes = ShortCodes("secret")
+        code = codes.encode(99)
+        typed = f"{code[:4]}-{code[4:]}".lower().replace("0", "o").replace("1", "l")
+        assert codes.decode(typed) == 99
+    
+    def test_malformed(self):
+        """Test invalid codes are rejected"""
+        codes = ShortCodes("secret")
+        with pytest.raises(ValueError):
+            codes.decode("UUUUUUUU")
+        with pytest.raises(ValueError):
+            codes.decode("ABC")
+        with pytest.raises(ValueError):
+            codes.encode(codes.capacity)
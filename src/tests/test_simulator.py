@@ -0,0 +1,71 @@
+"""
+Test Game Simulator
+"""
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.services.game_service import CardGenerator, PatternVerifier
+from src.services.simulator import GameSimulator
+
+
+def replay(grids, order, pattern, variant):
+    """First winning draw and winner count of one game, marked cell by cell"""
+    for draw, index in enumerate(order, start=1):
+        number = int(index) + 1
+        for grid in grids:
+            for row in grid:
+                for cell in row:
+                    if cell["value"] == number:
+                        cell["marked"] = True
+        winners = sum(PatternVerifier.verify_pattern(grid, pattern, variant) for grid in grids)
+        if winners:
+            return draw, winners
+
+
+class TestGameSimulator:
+    """Test the vectorized simulator against PatternVerifier"""
+    
+    @pytest.mark.parametrize("variant,pattern", [
+        ("75", "horizontal_line"),
+        ("75", "diagonal"),
+        ("75", "four_corners"),
+        ("90", "one_line"),
+        ("90", "two_lines"),
+        ("90", "full_house"),
+    ])
+    def test_matches_verifier(self, variant, pattern):
+        """Test every simulated game ends when the verifier first sees a bingo"""
+        values = GameSimulator.card_values(variant, 6, random.Random(3))
+        lines, required = GameSimulator.pattern_lines(pattern, variant)
+        numbers = GameSimulator.number_count(variant)
+        first, winners = GameSimulator._batch(values, lines, required, numbers, 20, np.random.default_rng(5))
+        
+        orders = np.random.default_rng(5).random((20, numbers)).argsort(axis=1)
+        for game, order in enumerate(orders):
+            card_rng = random.Random(3)
+            grids = [CardGenerator.generate_card(variant, card_rng) for _ in range(6)]
+            assert replay(grids, order, pattern, variant) == (first[game], winners[game])
+    
+    def test_full_house_expectation(self):
+        """Test a lone 75-ball full house lasts 24 * 76 / 25 draws on average"""
+        result = GameSimulator.simulate("75", "full_house", cards=1, games=20000, seed=1)
+        assert abs(result["mean_draws"] - 72.96) < 0.2
+        assert result["split_probability"] == 0.0
+    
+    def test_more_cards_end_sooner(self):
+        """Test games get shorter and splits likelier as cards are added"""
+        few = GameSimulator.simulate("75", "horizontal_line", cards=5, games=2000, seed=1)
+        many = GameSimulator.simulate("75", "horizontal_line", cards=500, games=2000, seed=1)
+        assert many["mean_draws"] < few["mean_draws"]
+        assert many["split_probability"] > few["split_probability"]
+    
+    def test_seeded_runs_repeat(self):
+        """Test a seed makes results reproducible (they are cached by parameters)"""
+        assert GameSimulator.simulate("90", "one_line", 20, 500, seed=7) == GameSimulator.simulate("90", "one_line", 20, 500, seed=7)
+    
+    def test_unknown_pattern(self):
+        """Test unknown patterns are rejected"""
+        with pytest.raises(ValueError):
+            GameSimulator.simulate("90", "diagonal")
@@ -0,0 +1,99 @@
+"""
+Test Spectator Streams
+"""
+import asyncio
+import json
+import pytest
+
+# src.api imports the application
+pytest.importorskip("fastapi")
+
+from src.api.spectators import SpectatorHub
+
+
+def publish(hub, room_id, seq, number):
+    hub.publish(room_id, seq, hub.encode({"type": "number_drawn", "number": number, "seq": seq}))
+
+
+def frames(chunks):
+    """Data payloads of SSE chunks"""
+    return [
+        json.loads(line[len("data: "):])
+        for chunk in chunks
+        for line in chunk.decode().split("\n")
+        if line.startswith("data: ")
+    ]
+
+
+class TestSpectatorHub:
+    """Test encoded-once spectator feeds"""
+    
+    def test_stream_replays_then_follows(self):
+        """Test a resumed stream gets missed events, then live ones, until the room closes"""
+        async def run():
+            hub = SpectatorHub()
+            for seq in (1, 2, 3):
+                publish(hub, "room", seq, 10 + seq)
+            stream = hub.stream("room", last_seq=1)
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            
+            pending = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            publish(hub, "room", 4, 14)
+            chunks.append(await pending)
+            assert hub.streams == 1
+            
+            hub.close("room", {"type": "moved", "shard": "2"})
+            chunks.extend([chunk async for chunk in stream])
+            assert hub.streams == 0
+            return chunks
+        
+        chunks = asyncio.run(run())
+        assert b"id: 2\n" in chunks[1]
+        assert [event.get("seq") for event in frames(chunks)] == [2, 3, 4, None]
+        assert frames(chunks)[-1] == {"type": "moved", "shard": "2"}
+    
+    def test_events_are_encoded_once(self):
+        """Test every reader gets the same buffered bytes"""
+        hub = SpectatorHub()
+        publish(hub, "room", 1, 7)
+        first, = hub.feed("room").after(0)
+        second, = hub.feed("room").after(0)
+        assert first[1] is second[1]
+        assert first[2] == b'id: 1\ndata: {"type":"number_drawn","number":7,"seq":1}\n\n'
+    
+    def test_evicted_events_force_resync(self):
+        """Test a spectator too far behind is told to reload the room"""
+        async def run():
+            hub = SpectatorHub(buffer_size=2)
+            for seq in (1, 2, 3):
+                publish(hub, "room", seq, seq)
+            stream = hub.stream("room", last_seq=0)
+            await stream.__anext__()
+            chunk = await stream.__anext__()
+            await stream.aclose()
+            body, cacheable = await hub.poll("room", 0, timeout=0)
+            return chunk, json.loads(body), cacheable
+        
+        chunk, polled, cacheable = asyncio.run(run())
+        assert frames([chunk]) == [{"type": "resync", "seq": 3}]
+        assert polled == {"seq": 3, "resync": True, "events": []}
+        assert not cacheable
+    
+    def test_poll_waits_for_next_event(self):
+        """Test a long-poll parks until an event arrives and may then be cached"""
+        async def run():
+            hub = SpectatorHub()
+            publish(hub, "room", 1, 5)
+            empty, _ = await hub.poll("room", 1, timeout=0.01)
+            
+            pending = asyncio.ensure_future(hub.poll("room", 1, timeout=5))
+            await asyncio.sleep(0)
+            publish(hub, "room", 2, 6)
+            body, cacheable = await pending
+            return json.loads(empty), json.loads(body), cacheable
+        
+        empty, polled, cacheable = asyncio.run(run())
+        assert empty == {"seq": 1, "events": []}
+        assert polled == {"seq": 2, "events": [{"type": "number_drawn", "number": 6, "seq": 2}]}
+        assert cacheable
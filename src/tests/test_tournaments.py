@@ -0,0 +1,182 @@
+"""
+Test Tournaments
+"""
+import asyncio
+import json
+from contextlib import contextmanager
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.models.database import Base, Card, GameRoom, Player, Tournament, TournamentEntry
+from src.services import tournaments
+from src.services.tournaments import TournamentScheduler
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Factory of sessions on one in-memory database with ten players, also behind the scheduler's get_db"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        for index in range(10):
+            session.add(Player(id=f"p{index}", telegram_id=str(index), display_name=f"P{index}"))
+        session.commit()
+    
+    @contextmanager
+    def get_db():
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+    
+    monkeypatch.setattr(tournaments, "get_db", get_db)
+    return factory
+
+
+@pytest.fixture
+def db(sessions):
+    """Session with ten players"""
+    session = sessions()
+    yield session
+    session.close()
+
+
+def schedule(db, rooms=3, players_per_room=2) -> Tournament:
+    return TournamentScheduler.create(
+        db,
+        host_id="p0",
+        name="Friday Cup",
+        rooms=rooms,
+        starts_at=datetime.utcnow() - timedelta(seconds=1),
+        players_per_room=players_per_room
+    )
+
+
+def seat(db, room: GameRoom, player_id: str):
+    db.add(Card(room_id=room.id, owner_id=player_id, variant=room.variant, grid=[]))
+    db.commit()
+
+
+def finish(db, room: GameRoom, *winners: str):
+    room.state = "finished"
+    room.winners = [{"player_id": player_id} for player_id in winners]
+    db.commit()
+
+
+class TestTournamentScheduler:
+    """Test round starts and advancement"""
+    
+    def test_stagger(self):
+        """Test rooms are spread over at most the requested slots"""
+        slots = TournamentScheduler.stagger([str(n) for n in range(7)], 3)
+        assert slots == [["0", "3", "6"], ["1", "4"], ["2", "5"]]
+        assert TournamentScheduler.stagger(["a"], 10) == [["a"]]
+    
+    def test_start_round_is_one_bulk_transition(self, db):
+        """Test one call starts every seated room, closes empty ones, and only once"""
+        tournament = schedule(db)
+        first, second, empty = TournamentScheduler.round_rooms(db, tournament.id, 1)
+        seat(db, first, "p1")
+        seat(db, second, "p2")
+        
+        assert TournamentScheduler.start_round(db, tournament.id)
+        assert not TournamentScheduler.start_round(db, tournament.id)
+        db.expire_all()
+        assert [first.state, second.state, empty.state] == ["running", "running", "finished"]
+        assert first.version == 2
+        assert tournament.state == "running"
+    
+    def test_start_round_waits_for_start_time(self, db):
+        """Test a round is not started early"""
+        tournament = schedule(db)
+        assert not TournamentScheduler.start_round(db, tournament.id, now=tournament.starts_at - timedelta(seconds=1))
+    
+    def test_advance_seats_winners(self, db):
+        """Test a finished round's winners get cards in the next round's rooms"""
+        tournament = schedule(db)
+        rooms = TournamentScheduler.round_rooms(db, tournament.id, 1)
+        for index, room in enumerate(rooms):
+            seat(db, room, f"p{2 * index + 1}")
+            seat(db, room, f"p{2 * index + 2}")
+        TournamentScheduler.start_round(db, tournament.id)
+        
+        finish(db, rooms[0], "p1")
+        assert not TournamentScheduler.advance(db, tournament.id)
+        finish(db, rooms[1], "p3")
+        finish(db, rooms[2], "p5", "p6")
+        assert TournamentScheduler.advance(db, tournament.id)
+        
+        db.expire_all()
+        assert (tournament.state, tournament.round) == ("scheduled", 2)
+        next_rooms = TournamentScheduler.round_rooms(db, tournament.id, 2)
+        assert len(next_rooms) == 2
+        owners = {card.owner_id for room in next_rooms for card in room.cards}
+        assert owners == {"p1", "p3", "p5", "p6"}
+        for room in next_rooms:
+            assert room.card_seed
+            assert sorted(card.serial for card in room.cards) == list(range(1, room.cards_issued + 1))
+            assert all(card.grid is None for card in room.cards)
+    
+    def test_single_room_decides_champions(self, db):
+        """Test the winners of a one-room round are the champions"""
+        tournament = schedule(db, rooms=1)
+        room, = TournamentScheduler.round_rooms(db, tournament.id, 1)
+        seat(db, room, "p1")
+        TournamentScheduler.start_round(db, tournament.id)
+        finish(db, room, "p1")
+        
+        assert TournamentScheduler.advance(db, tournament.id)
+        db.expire_all()
+        assert tournament.state == "finished"
+        assert tournament.champions == ["p1"]
+    
+    def test_started_round_counts_games(self, db, monkeypatch):
+        """Test the pass that starts a round records a game for each seated player"""
+        games = []
+        
+        async def record_games(player_ids):
+            games.append(sorted(player_ids))
+        
+        monkeypatch.setattr(tournaments.leaderboards, "record_games", record_games)
+        tournament = schedule(db)
+        first, second, _ = TournamentScheduler.round_rooms(db, tournament.id, 1)
+        seat(db, first, "p1")
+        seat(db, second, "p2")
+        
+        scheduler = TournamentScheduler()
+        asyncio.run(scheduler.run_once())
+        asyncio.run(scheduler.run_once())
+        assert games == [["p1", "p2"]]
+
+
+class TestTournamentRegistration:
+    """Test the registration endpoint"""
+    
+    def test_concurrent_registration_takes_one_seat(self, sessions, monkeypatch):
+        """Test a registration racing another of the same player returns the first one's seat"""
+        pytest.importorskip("fastapi")
+        from src.api import main
+        
+        with sessions() as a, sessions() as b:
+            tournament = schedule(a, players_per_room=1)
+            # b seats p1 in the second room after a found no seat, before a commits
+            taken = TournamentScheduler.round_rooms(b, tournament.id, 1)[1]
+            @event.listens_for(a, "before_flush", once=True)
+            def race(session, context, instances):
+                b.add(TournamentEntry(tournament_id=tournament.id, player_id="p1"))
+                b.add(Card(room_id=taken.id, owner_id="p1", variant="75", serial=1))
+                b.commit()
+            
+            response = asyncio.run(main.register_for_tournament(tournament.id, "p1", a))
+            rooms = {row.room_id for row in a.query(Card.room_id).filter(Card.owner_id == "p1")}
+            assert rooms == {taken.id}
+            assert json.loads(response.body)["room_id"] == taken.id